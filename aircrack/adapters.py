@@ -0,0 +1,128 @@
+"""
+Wireless adapter discovery straight from sysfs, without forking airmon-ng.
+
+    /sys/class/net/<interface>/phy80211 -> ../../ieee80211/<phy>
+    /sys/class/net/<interface>/type      803 (ARPHRD_IEEE80211_RADIOTAP) in monitor mode
+    /sys/class/net/<interface>/device/driver -> .../drivers/<driver>
+"""
+import os
+import socket
+import typing as t
+
+from .models import WifiAdapter
+
+ARPHRD_IEEE80211_RADIOTAP = 803
+NETLINK_KOBJECT_UEVENT = 15
+
+
+def _read(path: str) -> t.Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _link_name(path: str) -> t.Optional[str]:
+    try:
+        return os.path.basename(os.readlink(path))
+    except OSError:
+        return None
+
+
+def _uevent_socket() -> t.Optional[socket.socket]:
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, 1))  # kernel uevents multicast group
+    except (OSError, AttributeError):
+        return None
+    sock.setblocking(False)
+    return sock
+
+
+class AdapterDiscovery:
+    """
+    Lists the wireless adapters the way `airmon-ng` does, read from sysfs in well under a millisecond.
+    The result is cached until an interface appears, disappears or changes (a kernel uevent, or a different
+    set of entries under class/net when uevents are not available). Without sysfs it asks airmon-ng.
+    """
+    sysfs_root: t.Optional[str] = '/sys'
+
+    def __init__(self, root: t.Optional[str] = None):
+        self.root = root or self.sysfs_root
+        self._adapters: t.Optional[t.List[WifiAdapter]] = None
+        self._signature: t.Optional[t.Tuple[str, ...]] = None
+        self._uevents = _uevent_socket() if self.root == '/sys' else None
+
+    def close(self):
+        if self._uevents is not None:
+            self._uevents.close()
+            self._uevents = None
+
+    def adapters(self) -> t.List[WifiAdapter]:
+        if self.root is None or not os.path.isdir(os.path.join(self.root, 'class', 'ieee80211')):
+            from .airmon import Airmon  # only needed without sysfs, keeps it (and asyncio) off the startup path
+            return list(Airmon.get_wifi_adapters())
+        signature = self._net_signature()
+        if self._adapters is None or self._hotplugged() or signature != self._signature:
+            self._adapters, self._signature = self._scan(), signature
+        return list(self._adapters)
+
+    def invalidate(self):
+        self._adapters = None
+
+    def _net_signature(self) -> t.Tuple[str, ...]:
+        try:
+            return tuple(sorted(os.listdir(os.path.join(self.root, 'class', 'net'))))
+        except OSError:
+            return ()
+
+    def _hotplugged(self) -> bool:
+        changed = False
+        while self._uevents is not None:
+            try:
+                message = self._uevents.recv(65536)
+            except BlockingIOError:
+                break
+            changed = changed or b'SUBSYSTEM=net' in message or b'SUBSYSTEM=ieee80211' in message
+        return changed
+
+    def _scan(self) -> t.List[WifiAdapter]:
+        net = os.path.join(self.root, 'class', 'net')
+        adapters = []
+        for interface in self._net_signature():
+            path = os.path.join(net, interface)
+            phy = _read(os.path.join(path, 'phy80211', 'name')) or _link_name(os.path.join(path, 'phy80211'))
+            if phy is None:
+                continue
+            monitor = _read(os.path.join(path, 'type')) == str(ARPHRD_IEEE80211_RADIOTAP)
+            adapters.append(WifiAdapter(
+                phy=phy,
+                interface=interface,
+                driver=_link_name(os.path.join(path, 'device', 'driver')) or 'unknown',
+                chipset=self._chipset(os.path.join(path, 'device')),
+                monitor=monitor,
+            ))
+        return sorted(adapters, key=lambda adapter: (adapter.phy, adapter.interface))
+
+    @staticmethod
+    def _chipset(device: str) -> str:
+        """The USB product string, or the PCI/SDIO vendor:device ids."""
+        product = _read(os.path.join(device, '..', 'product'))
+        if product:
+            return product
+        vendor, model = _read(os.path.join(device, 'vendor')), _read(os.path.join(device, 'device'))
+        if vendor and model:
+            return f'{vendor.replace("0x", "")}:{model.replace("0x", "")}'
+        return 'unknown'
+
+
+_discovery: t.Optional[AdapterDiscovery] = None
+
+
+def get_wifi_adapters() -> t.List[WifiAdapter]:
+    """The adapters from a discovery shared by the whole process, created on first use."""
+    global _discovery
+    if _discovery is None:
+        _discovery = AdapterDiscovery()
+    return _discovery.adapters()
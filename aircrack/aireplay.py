@@ -1,23 +1,156 @@
-import os
+import asyncio
+import dataclasses
+import re
 import shlex
 import subprocess
 import typing as t
 
-from aircrack.models import WifiAdapter, Station
+from aircrack.metrics import metrics
+from aircrack.models import WifiAdapter, Station, format_mac
+
+STOP_TIMEOUT = 1
+READ_SIZE = 4096
+# `12:00:00  Sending 64 directed DeAuth (code 7). STMAC: [..] [12|57 ACKs]`, redrawn after a \r as ACKs come in
+DIRECTED_DEAUTH = re.compile(r'Sending (\d+) directed DeAuth.*\[\s*(\d+)\|\s*(\d+) ACKs\]')
+
+
+@dataclasses.dataclass(slots=True)
+class DeauthProgress:
+    """What aireplay-ng reported so far. A round is one `--deauth` count, a burst of 64 directed packets."""
+    count: int
+    rounds: int = 0  # finished
+    sent: int = 0
+    station_acks: int = 0
+    access_point_acks: int = 0
+    current: t.Optional[t.Tuple[int, int, int]] = None  # (packets, station ACKs, AP ACKs) of the running round
+    message: str = ''  # the last line that was not progress, usually why aireplay-ng gave up
+    cancelled: bool = False
+    timed_out: bool = False
+    returncode: t.Optional[int] = None
+    _line: str = dataclasses.field(default='', repr=False)  # unfinished output line
+
+    @property
+    def done(self) -> bool:
+        return self.returncode is not None
+
+    @property
+    def totals(self) -> t.Tuple[int, int, int]:
+        """(packets sent, station ACKs, AP ACKs) including the running round."""
+        packets, station_acks, access_point_acks = self.current or (0, 0, 0)
+        return self.sent + packets, self.station_acks + station_acks, self.access_point_acks + access_point_acks
+
+    def feed(self, text: str) -> bool:
+        """Parses a chunk of aireplay-ng's output, returns whether the progress changed."""
+        changed = False
+        text = self._line + text
+        lines = text.split('\n')
+        self._line = lines.pop()
+        for line in lines:
+            changed = self._parse(line) or changed
+            if self.current is not None:  # the round is over once its line is
+                self._finish_round()
+                changed = True
+        return self._parse(self._line) or changed
+
+    def _parse(self, line: str) -> bool:
+        segment = line.rstrip('\r').rsplit('\r', 1)[-1].strip()  # only the last redraw counts
+        if not segment:
+            return False
+        match = DIRECTED_DEAUTH.search(segment)
+        if match is None:
+            if segment != self.message and not segment.startswith('Sending'):
+                self.message = segment
+                return True
+            return False
+        current = int(match[1]), int(match[2]), int(match[3])
+        if current == self.current:
+            return False
+        self.current = current
+        return True
+
+    def _finish_round(self):
+        self.sent, self.station_acks, self.access_point_acks = self.totals
+        self.rounds += 1
+        self.current = None
 
 
 class Aireplay:
-    def __init__(self, wifi_adapter: WifiAdapter, station: Station, count: int):
-        self.packet_count = count
-        self.process = subprocess.Popen(shlex.split(
-            f'aireplay-ng {wifi_adapter.interface} --deauth {count} -a {station.bssid} -c {station.station_mac}'
-        ), stdout=subprocess.PIPE, creationflags=subprocess.DETACHED_PROCESS)
+    """
+    Runs `aireplay-ng --deauth` against one station in the background, reading its output as it comes
+    and calling `on_progress` on every change. `cancel` stops it, so does `timeout` (seconds).
+    """
+    executable = 'aireplay-ng'
 
-    def fetch_progress(self) -> t.Tuple[int, int]:
-        return 5, 5
+    def __init__(
+            self,
+            wifi_adapter: WifiAdapter,
+            station: Station,
+            count: int,
+            timeout: t.Optional[float] = None,
+            on_progress: t.Optional[t.Callable[[DeauthProgress], None]] = None,
+    ):
+        self.command = self._deauth_command(wifi_adapter, station, count)
+        self.progress = DeauthProgress(count=count)
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.process: t.Optional[asyncio.subprocess.Process] = None
+
+    @metrics.timed('aireplay')
+    async def run(self) -> DeauthProgress:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL
+        )
+        try:
+            if self.progress.cancelled:  # before there was a process to stop
+                self._terminate()
+            await asyncio.wait_for(self._read_progress(), self.timeout)
+        except asyncio.TimeoutError:
+            self.progress.timed_out = True
+        finally:
+            await self._stop()
+        self.progress.returncode = self.process.returncode
+        self._notify()
+        return self.progress
+
+    def cancel(self):
+        self.progress.cancelled = True
+        self._terminate()
+
+    async def _read_progress(self):
+        while True:
+            chunk = await self.process.stdout.read(READ_SIZE)
+            if not chunk:
+                return
+            if self.progress.feed(chunk.decode(errors='replace')):
+                self._notify()
+
+    async def _stop(self):
+        if not self.process.stdout.at_eof():  # cancelled or timed out
+            self._terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+    def _terminate(self):
+        if self.process is not None and self.process.returncode is None:
+            try:
+                self.process.terminate()
+            except ProcessLookupError:  # exited, not reaped yet
+                pass
+
+    def _notify(self):
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    @classmethod
+    async def send_deauth_async(cls, wifi_adapter: WifiAdapter, station: Station, count: int) -> DeauthProgress:
+        return await cls(wifi_adapter, station, count).run()
 
     @classmethod
-    def send_deauth(cls, wifi_adapter: WifiAdapter, station: Station, count: int):
-        subprocess.call(shlex.split(
-            f'aireplay-ng {wifi_adapter.interface} --deauth {count} -a {station.bssid} -c {station.station_mac}'
-        ), stdout=subprocess.PIPE)
+    def _deauth_command(cls, wifi_adapter: WifiAdapter, station: Station, count: int) -> t.List[str]:
+        return shlex.split(
+            f'{cls.executable} {wifi_adapter.interface} --deauth {count} '
+            f'-a {format_mac(station.bssid)} -c {format_mac(station.station_mac)}'
+        )
@@ -1,40 +1,53 @@
+import asyncio
 import re
 import shlex
 import subprocess
 import warnings
 import typing as t
 
+from .metrics import metrics
 from .models import WifiAdapter
 
 
 class Airmon:
+    executable = 'airmon-ng'
+
     def __init__(self):
         pass
 
     @classmethod
     def start_monitoring(cls, adapter: WifiAdapter):
-        with subprocess.Popen(
-                shlex.split(f'airmon-ng start {adapter.interface}'), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
-        ) as process:
-            output = process.stdout.read().decode()
+        cls._handle_start_output(adapter, cls._run(f'{cls.executable} start {adapter.interface}'))
+
+    @classmethod
+    async def start_monitoring_async(cls, adapter: WifiAdapter):
+        cls._handle_start_output(adapter, await cls._run_async(f'{cls.executable} start {adapter.interface}'))
+
+    @classmethod
+    def stop_monitoring(cls, adapter: WifiAdapter):
+        cls._handle_stop_output(adapter, cls._run(f'{cls.executable} stop {adapter.interface}'))
 
+    @classmethod
+    async def stop_monitoring_async(cls, adapter: WifiAdapter):
+        cls._handle_stop_output(adapter, await cls._run_async(f'{cls.executable} stop {adapter.interface}'))
+
+    @classmethod
+    def _handle_start_output(cls, adapter: WifiAdapter, output: str):
         if f'monitor mode already enabled for [{adapter.phy}]{adapter.interface}' in output:
             warnings.warn(f'Monitoring already enabled on {adapter.interface}')
+            adapter.monitor = True
             return
 
         cls._set_new_interface(adapter, output)
+        adapter.monitor = True
 
     @classmethod
-    def stop_monitoring(cls, adapter: WifiAdapter):
-        with subprocess.Popen(
-                shlex.split(f'airmon-ng stop {adapter.interface}'), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
-        ) as process:
-            output = process.stdout.read().decode()
-
+    def _handle_stop_output(cls, adapter: WifiAdapter, output: str):
         if f'monitor mode vif disabled for [{adapter.phy}]{adapter.interface}' not in output:
             warnings.warn(f'Disabling monitoring on {adapter.interface} failed with the following output:\n{output}')
 
         cls._set_new_interface(adapter, output)
+        adapter.monitor = False
 
     @classmethod
     def _set_new_interface(cls, adapter: WifiAdapter, output: str):
@@ -51,7 +64,20 @@ class Airmon:
 
     @classmethod
     def get_wifi_adapters(cls) -> t.Iterator[WifiAdapter]:
-        lines = iter(cls._get_lines('airmon-ng'))
+        return cls.parse_adapters(cls.list_adapters())
+
+    @classmethod
+    async def get_wifi_adapters_async(cls) -> t.List[WifiAdapter]:
+        return list(cls.parse_adapters(await cls._run_async(cls.executable)))
+
+    @classmethod
+    def list_adapters(cls) -> str:
+        """The adapter table as airmon-ng prints it, see `parse_adapters`."""
+        return cls._run(cls.executable)
+
+    @classmethod
+    def parse_adapters(cls, output: str) -> t.Iterator[WifiAdapter]:
+        lines = iter(cls._get_lines(output))
 
         header = next(lines)
         assert header == ['PHY', 'Interface', 'Driver', 'Chipset']
@@ -65,9 +91,23 @@ class Airmon:
             )
 
     @classmethod
-    def _get_lines(cls, command: str, line_seperator='\n', item_seperator='\t') -> t.Iterator[t.List[str]]:
+    def _get_lines(cls, output: str, line_seperator='\n', item_seperator='\t') -> t.Iterator[t.List[str]]:
+        for line in output.split(line_seperator):
+            if not line:
+                continue
+            yield [i for i in line.split(item_seperator) if i]
+
+    @classmethod
+    @metrics.timed('airmon')
+    def _run(cls, command: str) -> str:
         with subprocess.Popen(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as process:
-            for line in process.stdout.read().decode().split(line_seperator):
-                if not line:
-                    continue
-                yield [i for i in line.split(item_seperator) if i]
+            return process.stdout.read().decode()
+
+    @classmethod
+    @metrics.timed('airmon')
+    async def _run_async(cls, command: str) -> str:
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        output, _ = await process.communicate()
+        return output.decode()
@@ -1,17 +1,182 @@
 import asyncio
 import csv
-import io
+import enum
 import os
 import shlex
 import subprocess
 import typing as t
-from datetime import datetime
 
-from .models import AccessPoint, Station
+from .archive import ScanArchive
+from .capture_index import CaptureIndex
+from .frames import FrameIngestor
+from .history import DeviceHistory
+from .metrics import metrics
+from .models import AccessPoint, Station, format_mac, intern, parse_mac, parse_timestamp
+
+ACCESS_POINT_HEADER = 'BSSID'
+STATION_HEADER = 'Station MAC'
+NOT_ASSOCIATED = '(not associated)'
+MIN_REFRESH = 0.1
+MAX_REFRESH = 2
+STOP_TIMEOUT = 1
+
+
+class ParseStatus(enum.Enum):
+    UNCHANGED = 'unchanged'
+    UPDATED = 'updated'
+    INCOMPLETE = 'incomplete'  # airodump-ng is still writing the file, retry on the next tick
+
+
+class CsvIngestor:
+    """
+    Keeps the models parsed from an airodump-ng CSV alive between ticks and updates them in place.
+    The file is skipped entirely when its (inode, size, mtime) signature did not change.
+    """
+
+    def __init__(self):
+        self.access_points: t.Dict[int, AccessPoint] = {}
+        self.stations: t.Dict[int, Station] = {}
+        self.status = ParseStatus.UNCHANGED
+        self._signature: t.Optional[t.Tuple[int, int, int]] = None
+
+    def ingest(self, path: str) -> ParseStatus:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.status = ParseStatus.INCOMPLETE
+            return self.status
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            self.status = ParseStatus.UNCHANGED
+            return self.status
+
+        with open(path, 'r', newline='') as file:
+            complete = self._parse_rows(csv.reader(file, skipinitialspace=True))
+        if complete:
+            self._signature = signature
+            self.status = ParseStatus.UPDATED
+        else:
+            self.status = ParseStatus.INCOMPLETE
+        return self.status
+
+    def _parse_rows(self, rows: t.Iterator[t.List[str]]) -> bool:
+        seen_access_points: t.Set[int] = set()
+        seen_stations: t.Set[int] = set()
+        # the station lists of the shared models are only replaced once the whole file parsed
+        station_lists: t.Dict[int, t.List[Station]] = {}
+        in_stations = False
+        try:
+            for row in rows:
+                if not row:
+                    continue
+                if row[0] == ACCESS_POINT_HEADER or row[0] == STATION_HEADER:
+                    in_stations = row[0] == STATION_HEADER
+                    continue
+                if in_stations:
+                    self._update_station(row, seen_stations, station_lists)
+                else:
+                    self._update_access_point(row, seen_access_points)
+        except (ValueError, IndexError):
+            return False
+        if not in_stations:
+            return False
+
+        for bssid in self.access_points.keys() - seen_access_points:
+            del self.access_points[bssid]
+        for station_mac in self.stations.keys() - seen_stations:
+            del self.stations[station_mac]
+        for bssid, access_point in self.access_points.items():
+            access_point.stations[:] = station_lists.get(bssid, ())
+        return True
+
+    def _update_access_point(self, row: t.List[str], seen: t.Set[int]):
+        bssid = parse_mac(row[0])
+        first_seen = parse_timestamp(row[1])
+        last_seen = parse_timestamp(row[2])
+        channel, speed, power, beacons, id_length = int(row[3]), int(row[4]), int(row[8]), int(row[9]), int(row[12])
+        privacy, cipher, authentication = intern(row[5]), intern(row[6]), intern(row[7])
+        access_point = self.access_points.get(bssid)
+        if access_point is None:
+            access_point = self.access_points[bssid] = AccessPoint(
+                bssid=bssid,
+                first_seen=first_seen,
+                last_seen=last_seen,
+                channel=channel,
+                speed=speed,
+                privacy=privacy,
+                cipher=cipher,
+                authentication=authentication,
+                power=power,
+                beacons=beacons,
+                iv=row[10],
+                lan_ip=row[11],
+                id_length=id_length,
+                essid=row[13],
+                key=row[14],
+            )
+        else:
+            access_point.first_seen = first_seen
+            access_point.last_seen = last_seen
+            access_point.channel = channel
+            access_point.speed = speed
+            access_point.privacy = privacy
+            access_point.cipher = cipher
+            access_point.authentication = authentication
+            access_point.power = power
+            access_point.beacons = beacons
+            access_point.iv = row[10]
+            access_point.lan_ip = row[11]
+            access_point.id_length = id_length
+            access_point.essid = row[13]
+            access_point.key = row[14]
+        seen.add(bssid)
+
+    def _update_station(self, row: t.List[str], seen: t.Set[int], station_lists: t.Dict[int, t.List[Station]]):
+        if row[5].rstrip() == NOT_ASSOCIATED:
+            return
+        access_point = self.access_points.get(parse_mac(row[5]))
+        if access_point is None:  # the AP section did not list it (yet)
+            return
+        bssid = access_point.bssid  # shared with the AP rather than one int per station
+
+        station_mac = parse_mac(row[0])
+        first_seen = parse_timestamp(row[1])
+        last_seen = parse_timestamp(row[2])
+        power, packets = int(row[3]), int(row[4])
+        probed_essids = ','.join(row[6:])
+        station = self.stations.get(station_mac)
+        if station is None:
+            station = self.stations[station_mac] = Station(
+                station_mac=station_mac,
+                first_seen=first_seen,
+                last_seen=last_seen,
+                power=power,
+                packets=packets,
+                bssid=bssid,
+                probed_essids=probed_essids,
+            )
+        else:
+            station.first_seen = first_seen
+            station.last_seen = last_seen
+            station.power = power
+            station.packets = packets
+            station.bssid = bssid
+            station.probed_essids = probed_essids
+        station_lists.setdefault(bssid, []).append(station)
+        seen.add(station_mac)
 
 
 class Airodump:
-    def __init__(self, interface: str, access_point: AccessPoint = None):
+    executable = 'airodump-ng'
+
+    def __init__(
+            self,
+            interface: str,
+            access_point: AccessPoint = None,
+            archive: ScanArchive = None,
+            channels: t.Optional[t.Iterable[int]] = None,
+            live: bool = True,
+    ):
         if not os.path.exists('.aircrack-ng'):
             os.mkdir('.aircrack-ng')
         self.logs = open('.aircrack-ng/aircrack-ng.txt', 'w')
@@ -24,37 +189,103 @@ class Airodump:
 
         if access_point:
             self.prefix = f'{self.prefix}_{access_point.essid}'
-        command = f'airodump-ng {self.interface} --write {self.prefix}'
+        self.index = CaptureIndex(dirname, os.path.basename(self.prefix), new_only=True)
+        command = f'{self.executable} {self.interface} --write {self.prefix}'
         if access_point:
-            command = f'{command} --bssid {access_point.bssid} --channel {access_point.channel}'
-        self.process = subprocess.Popen(shlex.split(command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+            command = f'{command} --bssid {format_mac(access_point.bssid)} --channel {access_point.channel}'
+        elif channels:
+            command = f'{command} --channel {",".join(str(channel) for channel in channels)}'
+        with metrics.timer('airodump.spawn'):
+            self.process = subprocess.Popen(shlex.split(command), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        self.ingestor = CsvIngestor()
+        # the frames airodump-ng captures show up long before its next CSV rewrite
+        self.frames = FrameIngestor(self.ingestor.access_points, self.ingestor.stations) if live else None
+        self.history = DeviceHistory()
+        self.archive = archive
 
     def __del__(self):
-        self.process.terminate()
+        self.stop()
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.index.close()
         self.logs.close()
 
     def fetch(self) -> t.Optional[t.List[AccessPoint]]:
+        """
+        Returns the current access points, or None when there is nothing new
+        (no new frames and the CSV did not change, or airodump-ng has not finished writing it yet).
+        """
+        if self.poll():
+            access_points = list(self.ingestor.access_points.values())
+            if self.ingestor.status is ParseStatus.UPDATED:  # the history samples CSV snapshots, not frames
+                with metrics.timer('airodump.history'):
+                    self.history.record(access_points)
+                if self.archive:
+                    with metrics.timer('airodump.archive'):
+                        self.archive.record(access_points)
+            return access_points
+
+    def poll(self) -> bool:
+        """Ingests the latest CSV and the frames captured since the last poll, returns whether the models changed."""
         file = self.get_latest_file()
+        updated = False
         if file:
-            return self.parse_file(file)
+            with metrics.timer('airodump.parse_file'):
+                status = self.ingestor.ingest(file)
+            metrics.count(f'airodump.{status.value}')
+            updated = status is ParseStatus.UPDATED
+            if updated and self.frames is not None:
+                self.frames.restore()
+        return self.poll_frames() or updated
+
+    def poll_frames(self) -> bool:
+        capture = self.index.latest('.cap') if self.frames is not None else None
+        if not capture:
+            return False
+        frames = self.frames.frames
+        with metrics.timer('airodump.frames'):
+            changed = self.frames.ingest_file(capture)
+        metrics.count('airodump.frames', self.frames.frames - frames)
+        return changed
 
+    @metrics.timed('airodump.get_latest_file')
     def get_latest_file(self, extension: str = '.csv') -> t.Optional[str]:
-        dirname = os.path.dirname(self.prefix)
-        basenames = {
-            name.split('.', 1)[0] for name in os.listdir(dirname)
-            if name.startswith(f'{os.path.basename(self.prefix)}-')
-            and os.path.getsize(os.path.join(dirname, name))
-        }
-        if basenames:
-            return os.path.join(dirname, sorted(basenames, reverse=True)[0] + extension)
-
-    async def stream_data(self, refresh: float = 1) -> t.AsyncIterator[t.List[AccessPoint]]:
-        existing_latest = self.get_latest_file()
-        while self.process.poll() is None or True:
-            latest = self.get_latest_file()
-            if latest and latest != existing_latest:
-                yield self.parse_file(latest)
-            await asyncio.sleep(refresh)
+        self.index.refresh()
+        return self.index.latest(extension)
+
+    def wait_for_change(self, timeout: float) -> bool:
+        return self.index.wait(timeout)
+
+    async def stream_data(
+            self,
+            refresh: float = MAX_REFRESH,
+            min_refresh: float = MIN_REFRESH,
+            until_active: t.Optional[t.Callable[[], t.Awaitable[None]]] = None,
+    ) -> t.AsyncIterator[t.List[AccessPoint]]:
+        """
+        Yields the access points whenever they change. Polls every `min_refresh` seconds right after a change
+        and backs off exponentially to `refresh` while nothing changes (a file change always wakes it early).
+        Before every poll it awaits `until_active`, which lets the consumer pause polling altogether.
+        """
+        interval = min_refresh
+        while True:
+            if until_active:
+                await until_active()
+            access_points = self.fetch()
+            if access_points is not None:
+                interval = min_refresh
+                yield access_points
+                await asyncio.sleep(min_refresh)  # frames arrive continuously, updates at most every min_refresh
+            else:
+                interval = min(interval * 2, refresh)
+            await self.index.wait_async(interval)
 
     @classmethod
     def parse_file(cls, path: str) -> t.List[AccessPoint]:
@@ -66,46 +297,7 @@ class Airodump:
         Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs
         [...]
         """
-        with open(path, 'r') as file:
-            output = file.read().strip()
-            lines = output.split('\n')
-            stripped = '\n'.join(','.join(i.strip() for i in line.split(',')) for line in lines)
-            access_points, stations = stripped.split('\n\n')
-            access_points_reader = csv.DictReader(io.StringIO(access_points))
-
-            access_points: t.Dict[str, AccessPoint] = {}
-            for row in access_points_reader:
-                access_points[row['BSSID']] = AccessPoint(
-                    bssid=row['BSSID'],
-                    first_seen=datetime.fromisoformat(row['First time seen']),
-                    last_seen=datetime.fromisoformat(row['Last time seen']),
-                    channel=int(row['channel']),
-                    speed=int(row['Speed']),
-                    privacy=row['Privacy'],
-                    cipher=row['Cipher'],
-                    authentication=row['Authentication'],
-                    power=int(row['Power']),
-                    beacons=int(row['# beacons']),
-                    iv=row['# IV'],
-                    lan_ip=row['LAN IP'],
-                    id_length=int(row['ID-length']),
-                    essid=row['ESSID'],
-                    key=row['Key'],
-                )
-
-            stations_reader = csv.DictReader(io.StringIO(stations))
-            for row in stations_reader:
-                bssid = row['BSSID']
-                if bssid == '(not associated)':
-                    continue
-
-                access_points[bssid].stations.append(Station(
-                    station_mac=row['Station MAC'],
-                    first_seen=datetime.fromisoformat(row['First time seen']),
-                    last_seen=datetime.fromisoformat(row['Last time seen']),
-                    power=int(row['Power']),
-                    packets=int(row['# packets']),
-                    bssid=bssid,
-                    probed_essids=row['Probed ESSIDs'],
-                ))
-            return list(access_points.values())
+        ingestor = CsvIngestor()
+        if ingestor.ingest(path) is ParseStatus.INCOMPLETE:
+            raise ValueError(f'{path} is not fully written')
+        return list(ingestor.access_points.values())
@@ -0,0 +1,192 @@
+import contextlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+import typing as t
+
+from .models import AccessPoint
+
+DEFAULT_PATH = '.aircrack-ng/archive.sqlite3'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS access_point_sightings (
+    timestamp REAL NOT NULL,
+    bssid INTEGER NOT NULL,
+    essid TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    privacy TEXT NOT NULL,
+    cipher TEXT NOT NULL,
+    authentication TEXT NOT NULL,
+    power INTEGER NOT NULL,
+    beacons INTEGER NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS access_point_sightings_bssid ON access_point_sightings (bssid, last_seen);
+CREATE INDEX IF NOT EXISTS access_point_sightings_essid ON access_point_sightings (essid, last_seen);
+CREATE INDEX IF NOT EXISTS access_point_sightings_last_seen ON access_point_sightings (last_seen);
+
+CREATE TABLE IF NOT EXISTS station_sightings (
+    timestamp REAL NOT NULL,
+    station_mac INTEGER NOT NULL,
+    bssid INTEGER NOT NULL,
+    power INTEGER NOT NULL,
+    packets INTEGER NOT NULL,
+    probed_essids TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS station_sightings_station_mac ON station_sightings (station_mac, bssid, last_seen);
+CREATE INDEX IF NOT EXISTS station_sightings_bssid ON station_sightings (bssid, last_seen);
+CREATE INDEX IF NOT EXISTS station_sightings_last_seen ON station_sightings (last_seen);
+'''
+
+_CLOSE = object()
+
+
+class ScanArchive:
+    """
+    On-disk archive of every access point and station sighting.
+    `record` only collects the rows whose `last_seen` moved since the previous snapshot and hands them to a writer
+    thread, which coalesces everything queued into a single write-ahead-logged transaction.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._last_seen: t.Dict[t.Tuple[int, int], int] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._error: t.Optional[Exception] = None  # of the writer thread, raised by flush and close
+        self._local = threading.local()
+        self._readers: t.List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        with contextlib.closing(self._connect()) as connection:
+            connection.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._write_batches, name='scan-archive', daemon=True)
+        self._writer.start()
+
+    def record(self, access_points: t.Iterable[AccessPoint], timestamp: t.Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        access_point_rows, station_rows = [], []
+        for ap in access_points:
+            if self._seen_again(0, ap.bssid, ap.last_seen):
+                access_point_rows.append((
+                    timestamp, ap.bssid, ap.essid, ap.channel, ap.privacy, ap.cipher, ap.authentication,
+                    ap.power, ap.beacons, ap.first_seen, ap.last_seen,
+                ))
+            for station in ap.stations:
+                if self._seen_again(1, station.station_mac, station.last_seen):
+                    station_rows.append((
+                        timestamp, station.station_mac, station.bssid, station.power, station.packets,
+                        station.probed_essids, station.first_seen, station.last_seen,
+                    ))
+        if access_point_rows or station_rows:
+            self._queue.put((access_point_rows, station_rows))
+
+    def flush(self):
+        """Blocks until everything recorded so far is committed, raises what made the writer lose rows."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        with self._readers_lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+        self._raise_error()
+
+    def last_association(self, station_mac: int, bssid: int) -> t.Optional[int]:
+        """When the station was last seen associated with the AP (epoch seconds)."""
+        return self._query_one(
+            'SELECT MAX(last_seen) FROM station_sightings WHERE station_mac = ? AND bssid = ?', (station_mac, bssid)
+        )
+
+    def last_seen(self, bssid: int) -> t.Optional[int]:
+        return self._query_one('SELECT MAX(last_seen) FROM access_point_sightings WHERE bssid = ?', (bssid,))
+
+    def access_points(self, essid: str, since: int = 0) -> t.List[int]:
+        """BSSIDs seen broadcasting the ESSID."""
+        return [bssid for bssid, in self._reader().execute(
+            'SELECT DISTINCT bssid FROM access_point_sightings WHERE essid = ? AND last_seen >= ?', (essid, since)
+        )]
+
+    def stations(self, bssid: int, since: int = 0) -> t.List[t.Tuple[int, int]]:
+        """(station MAC, last seen) of every station seen associated with the AP."""
+        return self._reader().execute(
+            'SELECT station_mac, MAX(last_seen) FROM station_sightings '
+            'WHERE bssid = ? AND last_seen >= ? GROUP BY station_mac', (bssid, since)
+        ).fetchall()
+
+    def _seen_again(self, table: int, mac: int, last_seen: int) -> bool:
+        key = (table, mac)
+        if self._last_seen.get(key) == last_seen:
+            return False
+        self._last_seen[key] = last_seen
+        return True
+
+    def _query_one(self, query: str, parameters: t.Tuple) -> t.Any:
+        return self._reader().execute(query, parameters).fetchone()[0]
+
+    def _reader(self) -> sqlite3.Connection:
+        """One connection per reading thread, kept open until `close`."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect(check_same_thread=False)  # closed by `close`
+            with self._readers_lock:
+                self._readers.append(connection)
+        return connection
+
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _write_batches(self):
+        try:
+            connection = self._connect()
+        except sqlite3.Error as error:
+            connection, self._error = None, error
+        closing = False
+        while not closing:
+            batches = [self._queue.get()]
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = _CLOSE in batches
+            try:
+                if connection is not None:
+                    self._write(connection, batches)
+            except Exception as error:  # the batches are lost, the thread keeps serving the next ones
+                self._error = error
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+        if connection is not None:
+            connection.close()
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, batches: t.List[t.Any]):
+        with connection:
+            for batch in batches:
+                if batch is _CLOSE:
+                    continue
+                access_point_rows, station_rows = batch
+                connection.executemany(
+                    'INSERT INTO access_point_sightings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', access_point_rows
+                )
+                connection.executemany(
+                    'INSERT INTO station_sightings VALUES (?, ?, ?, ?, ?, ?, ?, ?)', station_rows
+                )
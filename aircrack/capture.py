@@ -0,0 +1,139 @@
+import asyncio
+import dataclasses
+import typing as t
+
+from .airodump import Airodump, MAX_REFRESH, MIN_REFRESH, ParseStatus
+from .archive import ScanArchive
+from .history import DeviceHistory
+from .metrics import metrics
+from .models import AccessPoint, Station
+
+CHANNELS_2_4_GHZ = list(range(1, 14))
+CHANNELS_5_GHZ = [
+    36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112, 116, 120, 124, 128, 132, 136, 140, 144, 149, 153, 157, 161, 165,
+]
+DEFAULT_CHANNELS = CHANNELS_2_4_GHZ + CHANNELS_5_GHZ
+
+MERGED_ACCESS_POINT_FIELDS = [
+    field.name for field in dataclasses.fields(AccessPoint) if field.name not in ('stations', 'smoothed_power')
+]
+MERGED_STATION_FIELDS = [field.name for field in dataclasses.fields(Station) if field.name != 'smoothed_power']
+UNKNOWN_POWER = -1
+
+
+def partition_channels(channels: t.Sequence[int], count: int) -> t.List[t.List[int]]:
+    """
+    Splits the channels between `count` radios. Channels are dealt round robin so every radio covers
+    both low and high channels and neighbouring (overlapping) 2.4 GHz channels land on different radios.
+    """
+    return [list(channels[i::count]) for i in range(count)]
+
+
+class CaptureCoordinator:
+    """
+    Runs one airodump-ng per interface, each hopping over its own share of the channels, and merges their
+    CSVs into a single view keyed by BSSID (and station MAC), keeping the strongest reading and the freshest
+    timestamps of every device. It can stand in for `Airodump` on the network list screen.
+    """
+
+    def __init__(
+            self,
+            interfaces: t.Sequence[str],
+            channels: t.Sequence[int] = DEFAULT_CHANNELS,
+            archive: ScanArchive = None,
+    ):
+        self.captures = [
+            Airodump(interface, channels=part)
+            for interface, part in zip(interfaces, partition_channels(channels, len(interfaces)))
+        ]
+        self.history = DeviceHistory()
+        self.archive = archive
+        self.access_points: t.Dict[int, AccessPoint] = {}
+        self.stations: t.Dict[int, Station] = {}
+
+    def stop(self):
+        for capture in self.captures:
+            capture.stop()
+
+    def fetch(self) -> t.Optional[t.List[AccessPoint]]:
+        """Returns the merged access points, or None when no capture has anything new."""
+        if not any([capture.poll() for capture in self.captures]):
+            return None
+        with metrics.timer('capture.merge'):
+            self._merge()
+        access_points = list(self.access_points.values())
+        if any(capture.ingestor.status is ParseStatus.UPDATED for capture in self.captures):
+            with metrics.timer('airodump.history'):
+                self.history.record(access_points)
+            if self.archive:
+                with metrics.timer('airodump.archive'):
+                    self.archive.record(access_points)
+        return access_points
+
+    async def stream_data(
+            self,
+            refresh: float = MAX_REFRESH,
+            min_refresh: float = MIN_REFRESH,
+            until_active: t.Optional[t.Callable[[], t.Awaitable[None]]] = None,
+    ) -> t.AsyncIterator[t.List[AccessPoint]]:
+        interval = min_refresh
+        while True:
+            if until_active:
+                await until_active()
+            access_points = self.fetch()
+            if access_points is not None:
+                interval = min_refresh
+                yield access_points
+                await asyncio.sleep(min_refresh)
+            else:
+                interval = min(interval * 2, refresh)
+            waits = [asyncio.ensure_future(capture.index.wait_async(interval)) for capture in self.captures]
+            _, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            for wait in pending:
+                wait.cancel()
+
+    def _merge(self):
+        readings: t.Dict[int, t.List[AccessPoint]] = {}
+        station_readings: t.Dict[int, t.List[Station]] = {}
+        for capture in self.captures:
+            for bssid, access_point in capture.ingestor.access_points.items():
+                readings.setdefault(bssid, []).append(access_point)
+            for station_mac, station in capture.ingestor.stations.items():
+                station_readings.setdefault(station_mac, []).append(station)
+
+        for bssid in self.access_points.keys() - readings.keys():
+            del self.access_points[bssid]
+        for station_mac in self.stations.keys() - station_readings.keys():
+            del self.stations[station_mac]
+
+        for bssid, access_points in readings.items():
+            merged = self.access_points.get(bssid)
+            if merged is None:
+                merged = self.access_points[bssid] = _copy(access_points[0], MERGED_ACCESS_POINT_FIELDS)
+            _merge_readings(merged, access_points, MERGED_ACCESS_POINT_FIELDS)
+            merged.stations.clear()
+
+        for station_mac, stations in station_readings.items():
+            merged = self.stations.get(station_mac)
+            if merged is None:
+                merged = self.stations[station_mac] = _copy(stations[0], MERGED_STATION_FIELDS)
+            _merge_readings(merged, stations, MERGED_STATION_FIELDS)
+            access_point = self.access_points.get(merged.bssid)
+            if access_point is not None:
+                access_point.stations.append(merged)
+
+
+def _copy(reading: t.Any, fields: t.List[str]) -> t.Any:
+    return type(reading)(**{name: getattr(reading, name) for name in fields})
+
+
+def _merge_readings(merged: t.Any, readings: t.List[t.Any], fields: t.List[str]):
+    """Takes the strongest reading, with the earliest first_seen and the freshest last_seen (and association)."""
+    strongest = max(readings, key=lambda reading: (reading.power != UNKNOWN_POWER, reading.power))
+    freshest = max(readings, key=lambda reading: reading.last_seen)
+    for name in fields:
+        setattr(merged, name, getattr(strongest, name))
+    merged.first_seen = min(reading.first_seen for reading in readings)
+    merged.last_seen = freshest.last_seen
+    if isinstance(merged, Station):
+        merged.bssid = freshest.bssid
@@ -0,0 +1,206 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+import typing as t
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+POLL_INTERVAL = 0.25
+
+
+def _inotify_watch(dirname: str) -> t.Optional[int]:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, os.fsencode(dirname), WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class CaptureIndex:
+    """
+    In-memory index of the `<prefix>-NN.*` files airodump-ng writes into a directory.
+    It learns about new and grown files from inotify (falling back to scandir when inotify is not available),
+    so looking up the latest capture does not touch the filesystem. With `new_only` the sessions already in
+    the directory are ignored, they were written by an earlier airodump-ng.
+    """
+
+    def __init__(self, dirname: str, prefix: str, new_only: bool = False):
+        self.dirname = dirname
+        self.prefix = f'{prefix}-'
+        self.version = 0  # bumped whenever a capture file is created, grows or disappears
+        self._stats: t.Dict[str, t.Tuple[int, int]] = {}  # name -> (size, mtime)
+        self._latest: t.Optional[t.Tuple[int, str]] = None
+        self._fd = _inotify_watch(dirname)
+        self._readable: t.Optional[asyncio.Future] = None  # shared by every coroutine waiting on the fd
+        self._dir_mtime: t.Optional[int] = None
+        self._rescan()
+        self._floor = self._latest if new_only else None
+
+    def close(self):
+        if self._readable is not None:
+            self._wake()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
+
+    def fileno(self) -> t.Optional[int]:
+        return self._fd
+
+    def latest(self, extension: str = '.csv') -> t.Optional[str]:
+        if self._latest and (self._floor is None or self._latest > self._floor):
+            return os.path.join(self.dirname, self._latest[1] + extension)
+
+    def refresh(self) -> bool:
+        """Applies pending filesystem changes, returns whether any capture file changed."""
+        version = self.version
+        if self._fd is not None:
+            names = self._read_events()
+            if names is None:  # the kernel's event queue overflowed, what happened meanwhile is unknown
+                self._rescan()
+            for name in names or ():
+                self._stat(name)
+        else:
+            self._poll()
+        return version != self.version
+
+    def wait(self, timeout: float) -> bool:
+        """Blocks until a capture file changes or the timeout passes, returns whether anything changed."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.refresh():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._fd is not None:
+                select.select([self._fd], [], [], remaining)
+            else:
+                time.sleep(min(remaining, POLL_INTERVAL))
+
+    async def wait_async(self, timeout: float) -> bool:
+        """Like `wait`, without blocking the event loop."""
+        if self.refresh():
+            return True
+        if self._fd is None:
+            await asyncio.sleep(timeout)
+            return self.refresh()
+
+        if self._readable is None:
+            loop = asyncio.get_running_loop()
+            self._readable = loop.create_future()
+            loop.add_reader(self._fd, self._wake)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._readable), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.refresh()
+
+    def _wake(self):
+        readable, self._readable = self._readable, None
+        loop = readable.get_loop()
+        if not loop.is_closed():
+            loop.remove_reader(self._fd)
+        if not readable.done():
+            readable.set_result(None)
+
+    def _read_events(self) -> t.Optional[t.Set[str]]:
+        """The names of the changed capture files, None when events were lost."""
+        names, overflowed = set(), False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return None if overflowed else names
+            position = 0
+            while position < len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+                overflowed = overflowed or bool(mask & IN_Q_OVERFLOW)
+                position += EVENT_HEADER.size
+                name = os.fsdecode(data[position:position + length].rstrip(b'\0'))
+                position += length
+                if name.startswith(self.prefix):
+                    names.add(name)
+
+    def _poll(self):
+        try:
+            mtime = os.stat(self.dirname).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._dir_mtime:
+            self._rescan()
+            return
+        for name, (size, _) in list(self._stats.items()):  # empty files and the latest session can change in place
+            if not size or self._session_key(name) == self._latest:
+                self._stat(name)
+
+    def _rescan(self):
+        try:
+            self._dir_mtime = os.stat(self.dirname).st_mtime_ns
+            entries = {
+                entry.name: self._stat_key(entry.stat()) for entry in os.scandir(self.dirname)
+                if entry.name.startswith(self.prefix)
+            }
+        except FileNotFoundError:
+            entries = {}
+        for name in self._stats.keys() - entries.keys():
+            self._set_stat(name, None)
+        for name, stat in entries.items():
+            self._set_stat(name, stat)
+
+    def _stat(self, name: str):
+        try:
+            stat = self._stat_key(os.stat(os.path.join(self.dirname, name)))
+        except FileNotFoundError:
+            stat = None
+        self._set_stat(name, stat)
+
+    def _set_stat(self, name: str, stat: t.Optional[t.Tuple[int, int]]):
+        previous = self._stats.get(name)
+        if stat == previous:
+            return
+        self.version += 1
+        if stat is None:
+            del self._stats[name]
+        else:
+            self._stats[name] = stat
+
+        key = self._session_key(name)
+        if stat and stat[0]:
+            if self._latest is None or key > self._latest:
+                self._latest = key
+        elif previous and previous[0] and self._latest == key:
+            self._latest = max(
+                (self._session_key(other) for other, (size, _) in self._stats.items() if size), default=None
+            )
+
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> t.Tuple[int, int]:
+        return stat.st_size, stat.st_mtime_ns
+
+    def _session_key(self, name: str) -> t.Tuple[int, str]:
+        basename = name.split('.', 1)[0]
+        number = basename[len(self.prefix):]
+        return (int(number) if number.isdigit() else -1), basename
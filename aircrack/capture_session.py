@@ -0,0 +1,127 @@
+import asyncio
+import typing as t
+
+from .airodump import Airodump, MAX_REFRESH, MIN_REFRESH
+from .archive import ScanArchive
+from .capture import CaptureCoordinator, DEFAULT_CHANNELS
+from .models import AccessPoint, WifiAdapter
+from .retention import RetentionPolicy
+
+Capture = t.Union[Airodump, CaptureCoordinator]
+
+
+class CaptureSession:
+    """
+    Owns the airodump-ng process(es) across screens. Screens filter the shared view in-process instead of
+    starting their own capture, the capture is only restarted when it has to be tuned to other channels,
+    and the last seen access points stay cached so a new screen has data to show right away, until the
+    restarted capture's first snapshot replaces them.
+    Old capture files are pruned by the retention policy whenever airodump-ng is (re)started. The `_async`
+    variants do that, and the wait for the old airodump-ng to exit, in a worker thread.
+    """
+
+    def __init__(self, archive: ScanArchive = None, retention: t.Optional[RetentionPolicy] = None):
+        self.archive = archive
+        self.retention = retention
+        self.adapters: t.List[WifiAdapter] = []
+        self.channels: t.Optional[t.Tuple[int, ...]] = None  # None hops over every channel
+        self.capture: t.Optional[Capture] = None
+        self.access_points: t.Dict[int, AccessPoint] = {}
+        self._restarting = asyncio.Lock()  # held while a worker thread swaps the capture
+
+    def start(self, adapters: t.List[WifiAdapter]):
+        if self.capture is not None and adapters == self.adapters:
+            return
+        previous = self.latest_captures()
+        self.stop()
+        self.adapters = list(adapters)
+        self._start_capture(previous)
+
+    def tune(self, channels: t.Optional[t.Iterable[int]] = None):
+        """Restricts the capture to the channels (or lets it hop again), restarting airodump-ng only on a change."""
+        channels = tuple(channels) if channels else None
+        if channels == self.channels and self.capture is not None:
+            return
+        self.channels = channels
+        previous = self.latest_captures()
+        self._stop_capture()
+        self._start_capture(previous)
+
+    def stop(self):
+        self._stop_capture()
+        self.adapters = []
+
+    async def start_async(self, adapters: t.List[WifiAdapter]):
+        await self._restart(self.start, adapters)
+
+    async def tune_async(self, channels: t.Optional[t.Iterable[int]] = None):
+        await self._restart(self.tune, channels)
+
+    async def ready(self):
+        """Waits for a restart in progress."""
+        async with self._restarting:
+            pass
+
+    @property
+    def captures(self) -> t.List[Airodump]:
+        if isinstance(self.capture, CaptureCoordinator):
+            return self.capture.captures
+        return [self.capture] if self.capture else []
+
+    def latest_captures(self) -> t.List[str]:
+        return list(filter(None, (capture.get_latest_file('.cap') for capture in self.captures)))
+
+    def fetch(self) -> t.Optional[t.List[AccessPoint]]:
+        access_points = self.capture.fetch()
+        if access_points is not None:
+            return self._cache(access_points)
+
+    async def stream_data(
+            self,
+            refresh: float = MAX_REFRESH,
+            min_refresh: float = MIN_REFRESH,
+            until_active: t.Optional[t.Callable[[], t.Awaitable[None]]] = None,
+    ) -> t.AsyncIterator[t.List[AccessPoint]]:
+        """Like `Airodump.stream_data`, starting with the cached access points when there are any."""
+        if self.access_points:
+            yield list(self.access_points.values())
+        await self.ready()
+        async for access_points in self.capture.stream_data(refresh, min_refresh, until_active):
+            yield self._cache(access_points)
+
+    async def wait_for_change(self, timeout: float):
+        await self.ready()
+        waits = [asyncio.ensure_future(capture.index.wait_async(timeout)) for capture in self.captures]
+        _, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        for wait in pending:
+            wait.cancel()
+
+    async def _restart(self, function: t.Callable, *args):
+        async with self._restarting:
+            restart = asyncio.get_running_loop().run_in_executor(None, function, *args)
+            try:
+                await asyncio.shield(restart)
+            except asyncio.CancelledError:  # the screen went away, the thread still has to finish before the next one
+                await restart
+                raise
+
+    def _cache(self, access_points: t.List[AccessPoint]) -> t.List[AccessPoint]:
+        self.access_points = {access_point.bssid: access_point for access_point in access_points}
+        return access_points
+
+    def _start_capture(self, previous: t.Iterable[str] = ()):
+        """`previous` are the files of the capture just stopped, the screens may still be reading them."""
+        if self.retention is not None:  # before airodump-ng opens its new files, none of ours is being written
+            self.retention.prune(active=previous)
+        interfaces = [adapter.interface for adapter in self.adapters]
+        if self.channels is not None:
+            interfaces = interfaces[:len(self.channels)]  # spare adapters would hop when left without a channel
+        if len(interfaces) > 1:
+            self.capture = CaptureCoordinator(interfaces, channels=self.channels or DEFAULT_CHANNELS, archive=self.archive)
+        else:
+            self.capture = Airodump(interfaces[0], archive=self.archive, channels=self.channels)
+
+    def _stop_capture(self):
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
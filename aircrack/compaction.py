@@ -0,0 +1,75 @@
+"""
+Compaction of a capture down to what cracking a handshake needs: the target's first beacon (for its ESSID)
+and the EAPOL frames of its 4-way handshakes.
+
+    python -m aircrack.compaction capture.cap handshake.cap 00:11:22:33:44:55
+
+The source is streamed through a `PcapReader`, so memory stays at its one chunk buffer however large the capture
+is, and the result is written next to the destination first and renamed into place once complete.
+"""
+import os
+import struct
+import sys
+import typing as t
+
+from . import dot11
+from .metrics import metrics
+from .pcap import LINKTYPE_IEEE802_11, PCAP_MAGIC, PcapReader, strip_link_header
+
+GLOBAL_HEADER = struct.Struct('=IHHiIII')
+RECORD_HEADER = struct.Struct('=IIII')
+SNAPLEN = 65535
+
+
+@metrics.timed('compaction')
+def compact(source: str, destination: str, bssid: t.Union[str, int]) -> int:
+    """Writes the target's beacon and EAPOL frames of `source` to `destination`, returns how many were kept."""
+    target = dot11.mac_to_bytes(bssid)
+    reader = PcapReader(source)
+    kept, beacon_kept = 0, False
+    with open(f'{destination}.tmp', 'wb') as file:
+        for timestamp, packet in reader.read_packets():
+            frame = strip_link_header(reader.linktype, packet)
+            if frame is None or len(frame) < dot11.MANAGEMENT_HEADER_LENGTH:
+                continue
+            if dot11.eapol_key(frame) is not None:
+                if dot11.data_addresses(frame)[0] != target:
+                    continue
+            elif beacon_kept or not _is_beacon(frame, target):
+                continue
+            else:
+                beacon_kept = True
+            if not kept:
+                file.write(GLOBAL_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, SNAPLEN, reader.linktype))
+            seconds, microseconds = divmod(round(timestamp * 1e6), 1000000)
+            file.write(RECORD_HEADER.pack(seconds, microseconds, len(packet), len(packet)))
+            file.write(packet)
+            kept += 1
+        if not kept:
+            file.write(GLOBAL_HEADER.pack(PCAP_MAGIC, 2, 4, 0, 0, SNAPLEN, reader.linktype or LINKTYPE_IEEE802_11))
+    os.replace(f'{destination}.tmp', destination)
+    metrics.count('compaction.frames', kept)
+    return kept
+
+
+def _is_beacon(frame: memoryview, bssid: bytes) -> bool:
+    kind, subtype = dot11.frame_type(frame)
+    return (
+        kind == dot11.TYPE_MANAGEMENT
+        and subtype in (dot11.SUBTYPE_BEACON, dot11.SUBTYPE_PROBE_RESPONSE)
+        and len(frame) >= dot11.MANAGEMENT_HEADER_LENGTH + dot11.BEACON_FIXED_LENGTH
+        and frame[16:22] == bssid
+        and bool(dot11.beacon(frame).essid)  # a hidden network's beacons do not name it
+    )
+
+
+def main():
+    if len(sys.argv) != 4:
+        sys.exit('usage: python -m aircrack.compaction SOURCE DESTINATION BSSID')
+    source, destination, bssid = sys.argv[1:]
+    kept = compact(source, destination, bssid)
+    print(f'{kept} frames kept, {os.path.getsize(source):,} -> {os.path.getsize(destination):,} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,29 @@
+import asyncio
 import shlex
 import subprocess
 
+from .metrics import metrics
+
+VALID_HANDSHAKE = 'Collected all necessary data to mount crack against WPA2/PSK passphrase.'
+
 
 class Cowpatty:
+    executable = 'cowpatty'
+
     @classmethod
+    @metrics.timed('cowpatty')
     def contains_valid_handshake(cls, cap_file: str) -> bool:
-        valid_str = 'Collected all necessary data to mount crack against WPA2/PSK passphrase.'
         with subprocess.Popen(shlex.split(
-            f'cowpatty -c -r {cap_file}'
+            f'{cls.executable} -c -r {cap_file}'
         ), stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.PIPE) as process:
-            return valid_str in process.stdout.read().decode()
+            return VALID_HANDSHAKE in process.stdout.read().decode()
+
+    @classmethod
+    @metrics.timed('cowpatty')
+    async def contains_valid_handshake_async(cls, cap_file: str) -> bool:
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(f'{cls.executable} -c -r {cap_file}'),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+        )
+        output, _ = await process.communicate()
+        return VALID_HANDSHAKE in output.decode()
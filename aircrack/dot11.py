@@ -0,0 +1,226 @@
+import dataclasses
+import typing as t
+
+TYPE_MANAGEMENT = 0
+TYPE_CONTROL = 1
+TYPE_DATA = 2
+
+SUBTYPE_PROBE_REQUEST = 4
+SUBTYPE_PROBE_RESPONSE = 5
+SUBTYPE_BEACON = 8
+
+FLAG_TO_DS = 0x01
+FLAG_FROM_DS = 0x02
+FLAG_PROTECTED = 0x40
+FLAG_ORDER = 0x80
+
+MANAGEMENT_HEADER_LENGTH = 24
+BEACON_FIXED_LENGTH = 12  # timestamp, interval, capabilities
+CAPABILITY_PRIVACY = 0x0010
+
+ELEMENT_SSID = 0
+ELEMENT_RATES = 1
+ELEMENT_DS_PARAMETER_SET = 3
+ELEMENT_RSN = 48
+ELEMENT_EXTENDED_RATES = 50
+ELEMENT_VENDOR = 221
+WPA_VENDOR_TYPE = b'\x00\x50\xf2\x01'
+
+# suite types (the last octet of the suite selector), named and ordered as airodump-ng prints them
+CIPHERS = {8: 'GCMP', 9: 'GCMP256', 10: 'CCMP256', 4: 'CCMP', 3: 'WRAP', 2: 'TKIP', 5: 'WEP104', 1: 'WEP'}
+AKMS = {8: 'SAE', 9: 'SAE', 2: 'PSK', 4: 'PSK', 6: 'PSK', 1: 'MGT', 3: 'MGT', 5: 'MGT', 18: 'OWE'}
+AKM_SAE = {8, 9}
+
+LLC_SNAP_EAPOL = b'\xaa\xaa\x03\x00\x00\x00\x88\x8e'
+EAPOL_KEY = 3
+EAPOL_KEY_HEADER_LENGTH = 99
+
+KEY_INFO_VERSION = 0x0007
+KEY_INFO_PAIRWISE = 0x0008
+KEY_INFO_INSTALL = 0x0040
+KEY_INFO_ACK = 0x0080
+KEY_INFO_MIC = 0x0100
+KEY_INFO_SECURE = 0x0200
+
+
+def mac_to_bytes(mac: t.Union[str, int]) -> bytes:
+    if isinstance(mac, int):
+        return mac.to_bytes(6, 'big')
+    return bytes.fromhex(mac.replace(':', '').replace('-', ''))
+
+
+def mac_to_str(mac: bytes) -> str:
+    return ':'.join(f'{octet:02X}' for octet in mac)
+
+
+def frame_type(frame: memoryview) -> t.Tuple[int, int]:
+    return (frame[0] >> 2) & 0x03, frame[0] >> 4
+
+
+def data_header_length(frame: memoryview) -> int:
+    length = 24
+    flags = frame[1]
+    if flags & FLAG_TO_DS and flags & FLAG_FROM_DS:
+        length += 6
+    if frame[0] >> 4 & 0x08:  # QoS data
+        length += 2
+        if flags & FLAG_ORDER:
+            length += 4
+    return length
+
+
+def data_addresses(frame: memoryview) -> t.Tuple[bytes, bytes]:
+    """Returns (bssid, station) of a data frame."""
+    flags = frame[1] & (FLAG_TO_DS | FLAG_FROM_DS)
+    if flags == FLAG_FROM_DS:
+        return bytes(frame[10:16]), bytes(frame[4:10])
+    if flags == FLAG_TO_DS:
+        return bytes(frame[4:10]), bytes(frame[10:16])
+    bssid, source = bytes(frame[16:22]), bytes(frame[10:16])
+    return bssid, (source if source != bssid else bytes(frame[4:10]))
+
+
+def mac_to_int(frame: memoryview, offset: int) -> int:
+    return int.from_bytes(frame[offset:offset + 6], 'big')
+
+
+def is_multicast(mac: int) -> bool:
+    return bool(mac >> 40 & 0x01)
+
+
+def data_macs(frame: memoryview) -> t.Optional[t.Tuple[int, int]]:
+    """Like `data_addresses` as ints and without copying, None for frames between two APs (WDS)."""
+    flags = frame[1] & (FLAG_TO_DS | FLAG_FROM_DS)
+    if flags == FLAG_FROM_DS:
+        return mac_to_int(frame, 10), mac_to_int(frame, 4)
+    if flags == FLAG_TO_DS:
+        return mac_to_int(frame, 4), mac_to_int(frame, 10)
+    if flags:
+        return None
+    bssid, source = mac_to_int(frame, 16), mac_to_int(frame, 10)
+    return bssid, (source if source != bssid else mac_to_int(frame, 4))
+
+
+def elements(frame: memoryview, offset: int) -> t.Iterator[t.Tuple[int, memoryview]]:
+    """The (id, body) information elements from the offset on, up to the first truncated one."""
+    end = len(frame)
+    while offset + 2 <= end:
+        element, length = frame[offset], frame[offset + 1]
+        if offset + 2 + length > end:
+            return
+        yield element, frame[offset + 2:offset + 2 + length]
+        offset += 2 + length
+
+
+def _suites(body: memoryview, offset: int) -> t.Tuple[t.Set[int], t.Set[int]]:
+    """Pairwise cipher and AKM suite types of an RSN (or WPA vendor) element body, from its version on."""
+    ciphers, akms = set(), set()
+    offset += 6  # version, group cipher
+    for suites in (ciphers, akms):
+        if offset + 2 > len(body):
+            break
+        count = body[offset] | body[offset + 1] << 8
+        offset += 2
+        for _ in range(count):
+            if offset + 4 > len(body):
+                break
+            suites.add(body[offset + 3])
+            offset += 4
+    return ciphers, akms
+
+
+@dataclasses.dataclass(slots=True)
+class Beacon:
+    """What a beacon or probe response says about its AP, in airodump-ng's terms."""
+    essid: str
+    id_length: int
+    channel: t.Optional[int]
+    speed: int
+    privacy: str
+    cipher: str
+    authentication: str
+
+
+def beacon(frame: memoryview) -> Beacon:
+    essid, id_length, channel, speed = '', 0, None, 0
+    rsn = wpa = None
+    for element, body in elements(frame, MANAGEMENT_HEADER_LENGTH + BEACON_FIXED_LENGTH):
+        if element == ELEMENT_SSID:
+            id_length = len(body)
+            if any(body):  # hidden networks send zeros, or nothing
+                essid = bytes(body).decode('utf-8', 'replace')
+        elif element == ELEMENT_DS_PARAMETER_SET and body:
+            channel = body[0]
+        elif element in (ELEMENT_RATES, ELEMENT_EXTENDED_RATES) and body:
+            speed = max(speed, max(body) & 0x7f)
+        elif element == ELEMENT_RSN:
+            rsn = _suites(body, 0)
+        elif element == ELEMENT_VENDOR and body[:4] == WPA_VENDOR_TYPE:
+            wpa = _suites(body, 4)
+
+    privacy, ciphers, akms = [], set(), set()
+    if rsn:
+        ciphers |= rsn[0]
+        akms |= rsn[1]
+        if rsn[1] & AKM_SAE:
+            privacy.append('WPA3')
+        if rsn[1] - AKM_SAE or not rsn[1]:
+            privacy.append('WPA2')
+    if wpa:
+        ciphers |= wpa[0]
+        akms |= wpa[1]
+        privacy.append('WPA')
+    capabilities = frame[MANAGEMENT_HEADER_LENGTH + 10] | frame[MANAGEMENT_HEADER_LENGTH + 11] << 8
+    if not privacy:
+        privacy.append('WEP' if capabilities & CAPABILITY_PRIVACY else 'OPN')
+        if capabilities & CAPABILITY_PRIVACY:
+            ciphers.add(1)
+    return Beacon(
+        essid=essid,
+        id_length=id_length,
+        channel=channel,
+        speed=speed // 2,
+        privacy=' '.join(privacy),
+        cipher=' '.join(name for suite, name in CIPHERS.items() if suite in ciphers),
+        authentication=' '.join(dict.fromkeys(name for suite, name in AKMS.items() if suite in akms)),
+    )
+
+
+def probed_essid(frame: memoryview) -> str:
+    """The ESSID a probe request asks for, empty for a wildcard probe."""
+    for element, body in elements(frame, MANAGEMENT_HEADER_LENGTH):
+        if element == ELEMENT_SSID:
+            return bytes(body).decode('utf-8', 'replace') if any(body) else ''
+    return ''
+
+
+def eapol_key(frame: memoryview) -> t.Optional[memoryview]:
+    """Returns the EAPOL-Key PDU carried by an unprotected data frame, or None."""
+    if len(frame) < 24 or frame_type(frame)[0] != TYPE_DATA or frame[1] & FLAG_PROTECTED:
+        return None
+    offset = data_header_length(frame)
+    if frame[offset:offset + 8] != LLC_SNAP_EAPOL:
+        return None
+    eapol = frame[offset + 8:]
+    if len(eapol) < EAPOL_KEY_HEADER_LENGTH or eapol[1] != EAPOL_KEY:
+        return None
+    eapol = eapol[:4 + (eapol[2] << 8 | eapol[3])]
+    if len(eapol) < EAPOL_KEY_HEADER_LENGTH:  # truncated, or a length field too small for the key descriptor
+        return None
+    return eapol
+
+
+def key_info(eapol: memoryview) -> int:
+    return eapol[5] << 8 | eapol[6]
+
+
+def replay_counter(eapol: memoryview) -> int:
+    return int.from_bytes(eapol[9:17], 'big')
+
+
+def nonce(eapol: memoryview) -> bytes:
+    return bytes(eapol[17:49])
+
+
+def mic(eapol: memoryview) -> bytes:
+    return bytes(eapol[81:97])
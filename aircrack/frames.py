@@ -0,0 +1,211 @@
+"""
+Live 802.11 ingestion from the growing capture airodump-ng writes (or a pcap pipe), so a new AP or station
+shows up as soon as its frames are written instead of at airodump-ng's next CSV rewrite.
+
+    tcpdump -i wlan0mon -w - | python -m aircrack.frames -
+    python -m aircrack.frames capture.cap
+
+Frames are decoded in place from the reader's reusable buffer, MACs become ints straight from the memoryview,
+so nothing is copied per frame and memory stays constant however long the capture grows. A beacon only has its
+information elements parsed when its AP is new or hidden, and on every `REPARSE`th beacon after that.
+"""
+import select
+import sys
+import time
+import typing as t
+
+from . import dot11
+from .models import AccessPoint, Station, format_mac, intern
+from .pcap import LINKTYPE_IEEE802_11_RADIOTAP, PcapReader, PcapStream, radiotap, strip_link_header
+
+REPARSE = 64
+NO_POWER = -1
+NO_LAN_IP = '0.  0.  0.  0'
+
+Reader = t.Union[PcapReader, PcapStream]
+
+
+class FrameIngestor:
+    """
+    Updates the access point and station models (shared with a `CsvIngestor`) from beacons, probes and data
+    frames. Devices found here that airodump-ng has not written to its CSV yet are kept in `discovered` and
+    put back by `restore` when a CSV snapshot, which airodump-ng wrote before it saw them, drops them again.
+    """
+
+    def __init__(
+            self,
+            access_points: t.Optional[t.Dict[int, AccessPoint]] = None,
+            stations: t.Optional[t.Dict[int, Station]] = None,
+    ):
+        self.access_points = {} if access_points is None else access_points
+        self.stations = {} if stations is None else stations
+        self.discovered_access_points: t.Dict[int, AccessPoint] = {}
+        self.discovered_stations: t.Dict[int, Station] = {}
+        self.frames = 0
+        self._reader: t.Optional[Reader] = None
+
+    def ingest_file(self, path: str) -> bool:
+        """Ingests the frames appended to the capture since the last call, returns whether a model changed."""
+        if self._reader is None or self._reader.path != path:
+            self._reader = PcapReader(path)
+        return self.ingest(self._reader)
+
+    def ingest(self, reader: Reader) -> bool:
+        changed = False
+        for timestamp, packet in reader.read_packets():
+            if reader.linktype == LINKTYPE_IEEE802_11_RADIOTAP:
+                frame, signal = radiotap(packet)
+            else:
+                frame, signal = strip_link_header(reader.linktype, packet), None
+            if frame is not None and len(frame) >= dot11.MANAGEMENT_HEADER_LENGTH:
+                changed = self.feed(int(timestamp), frame, signal) or changed
+            self.frames += 1
+        return changed
+
+    def feed(self, timestamp: int, frame: memoryview, signal: t.Optional[int] = None) -> bool:
+        kind, subtype = (frame[0] >> 2) & 0x03, frame[0] >> 4
+        if kind == dot11.TYPE_DATA:
+            return self._data(timestamp, frame, signal)
+        if kind != dot11.TYPE_MANAGEMENT:
+            return False
+        if subtype in (dot11.SUBTYPE_BEACON, dot11.SUBTYPE_PROBE_RESPONSE):
+            if len(frame) < dot11.MANAGEMENT_HEADER_LENGTH + dot11.BEACON_FIXED_LENGTH:
+                return False
+            return self._beacon(timestamp, frame, signal, subtype == dot11.SUBTYPE_BEACON)
+        if subtype == dot11.SUBTYPE_PROBE_REQUEST:
+            return self._probe(timestamp, frame, signal)
+        return False
+
+    def restore(self):
+        """Called after a CSV snapshot was ingested."""
+        for bssid, access_point in list(self.discovered_access_points.items()):
+            if bssid in self.access_points:  # airodump-ng caught up, the CSV updates it from now on
+                del self.discovered_access_points[bssid]
+            else:
+                self.access_points[bssid] = access_point
+        for station_mac, station in list(self.discovered_stations.items()):
+            access_point = self.access_points.get(station.bssid)
+            if station_mac in self.stations:
+                del self.discovered_stations[station_mac]
+            elif access_point is None:
+                del self.discovered_stations[station_mac]
+            else:
+                self.stations[station_mac] = station
+                if station not in access_point.stations:  # the CSV does not reset the lists of APs found here
+                    access_point.stations.append(station)
+
+    def _beacon(self, timestamp: int, frame: memoryview, signal: t.Optional[int], is_beacon: bool) -> bool:
+        bssid = dot11.mac_to_int(frame, 16)
+        access_point = self.access_points.get(bssid)
+        if access_point is None:
+            info = dot11.beacon(frame)
+            access_point = self.access_points[bssid] = self.discovered_access_points[bssid] = AccessPoint(
+                bssid=bssid,
+                first_seen=timestamp,
+                last_seen=timestamp,
+                channel=info.channel or 0,
+                speed=info.speed,
+                privacy=intern(info.privacy),
+                cipher=intern(info.cipher),
+                authentication=intern(info.authentication),
+                power=NO_POWER if signal is None else signal,
+                beacons=int(is_beacon),
+                iv='0',
+                lan_ip=NO_LAN_IP,
+                id_length=info.id_length,
+                essid=info.essid,
+                key='',
+            )
+            return True
+
+        access_point.last_seen = timestamp
+        if signal is not None:
+            access_point.power = signal
+        if is_beacon:
+            access_point.beacons += 1
+        if not is_beacon or not access_point.essid or access_point.beacons % REPARSE == 0:
+            info = dot11.beacon(frame)
+            if info.essid:  # a probe response reveals what the beacons of a hidden network leave out
+                access_point.essid, access_point.id_length = info.essid, info.id_length
+            if info.channel:
+                access_point.channel = info.channel
+            access_point.speed = info.speed or access_point.speed
+            access_point.privacy = intern(info.privacy)
+            access_point.cipher = intern(info.cipher)
+            access_point.authentication = intern(info.authentication)
+        return True
+
+    def _probe(self, timestamp: int, frame: memoryview, signal: t.Optional[int]) -> bool:
+        station = self.stations.get(dot11.mac_to_int(frame, 10))
+        if station is None:  # like the CSV, only stations associated with a known AP are shown
+            return False
+        self._seen(station, timestamp, signal)
+        essid = dot11.probed_essid(frame)
+        if essid and essid not in station.probed_essids.split(','):
+            station.probed_essids = f'{station.probed_essids},{essid}' if station.probed_essids else essid
+        return True
+
+    def _data(self, timestamp: int, frame: memoryview, signal: t.Optional[int]) -> bool:
+        macs = dot11.data_macs(frame)
+        if macs is None:
+            return False
+        bssid, station_mac = macs
+        access_point = self.access_points.get(bssid)
+        if access_point is None or dot11.is_multicast(station_mac):
+            return False
+        from_station = frame[1] & dot11.FLAG_TO_DS
+        station = self.stations.get(station_mac)
+        if station is None:
+            station = self.stations[station_mac] = self.discovered_stations[station_mac] = Station(
+                station_mac=station_mac,
+                first_seen=timestamp,
+                last_seen=timestamp,
+                power=signal if signal is not None and from_station else NO_POWER,
+                packets=1,
+                bssid=access_point.bssid,
+                probed_essids='',
+            )
+            access_point.stations.append(station)
+            return True
+
+        self._seen(station, timestamp, signal if from_station else None)
+        if station.bssid != access_point.bssid:  # roamed
+            previous = self.access_points.get(station.bssid)
+            if previous is not None and station in previous.stations:
+                previous.stations.remove(station)
+            station.bssid = access_point.bssid
+            access_point.stations.append(station)
+        return True
+
+    @staticmethod
+    def _seen(station: Station, timestamp: int, signal: t.Optional[int]):
+        station.last_seen = timestamp
+        station.packets += 1
+        if signal is not None:
+            station.power = signal
+
+
+def main():
+    """Ingests a capture (or `-` for a pcap on stdin) and reports the frame rate and what it found."""
+    source = sys.argv[1] if len(sys.argv) > 1 else '-'
+    ingestor = FrameIngestor()
+    start = time.perf_counter()
+    if source == '-':
+        reader = PcapStream(sys.stdin.buffer)
+        while not reader.closed:
+            select.select([reader], [], [])
+            ingestor.ingest(reader)
+    else:
+        ingestor.ingest_file(source)
+    elapsed = time.perf_counter() - start
+    stations = sum(len(access_point.stations) for access_point in ingestor.access_points.values())
+    print(f'{ingestor.frames} frames in {elapsed:.3f}s ({ingestor.frames / max(elapsed, 1e-9):,.0f} frames/s), '
+          f'{len(ingestor.access_points)} access points, {stations} stations')
+    by_power = sorted(ingestor.access_points.values(), key=lambda access_point: access_point.power, reverse=True)
+    for access_point in by_power:
+        print(f'{format_mac(access_point.bssid)} {access_point.channel:>3} {access_point.power:>4} '
+              f'{access_point.privacy:<9} {access_point.essid}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import dataclasses
+import typing as t
+
+from . import dot11
+from .metrics import metrics
+from .pcap import PcapReader
+
+ZERO_NONCE = bytes(32)
+
+
+@dataclasses.dataclass()
+class Handshake:
+    """The parts of a WPA 4-way handshake between one station and the AP, collected as frames arrive."""
+    bssid: bytes
+    station: bytes
+    anonce: t.Optional[bytes] = None
+    anonce_replay_counter: t.Optional[int] = None
+    snonce: t.Optional[bytes] = None
+    snonce_replay_counter: t.Optional[int] = None
+    mic: t.Optional[bytes] = None
+    key_version: t.Optional[int] = None
+    eapol: t.Optional[bytes] = None  # M2 with the MIC zeroed, as used for the MIC computation
+    messages: t.Set[int] = dataclasses.field(default_factory=set)
+    complete: bool = False
+
+    def update(self, eapol: memoryview):
+        info = dot11.key_info(eapol)
+        if not info & dot11.KEY_INFO_PAIRWISE:
+            return
+        counter = dot11.replay_counter(eapol)
+        if info & dot11.KEY_INFO_ACK:
+            self._update_from_authenticator(eapol, info, counter)
+        else:
+            self._update_from_supplicant(eapol, info, counter)
+
+    def _update_from_authenticator(self, eapol: memoryview, info: int, counter: int):
+        anonce = dot11.nonce(eapol)
+        if info & dot11.KEY_INFO_MIC:  # M3
+            self.messages.add(3)
+            if self.snonce_replay_counter is not None and counter == self.snonce_replay_counter + 1:
+                self.anonce, self.anonce_replay_counter = anonce, counter
+                self.complete = True
+        else:  # M1
+            self.messages.add(1)
+            if not self.complete:
+                self.anonce, self.anonce_replay_counter = anonce, counter
+
+    def _update_from_supplicant(self, eapol: memoryview, info: int, counter: int):
+        if not info & dot11.KEY_INFO_MIC:
+            return
+        snonce = dot11.nonce(eapol)
+        if snonce == ZERO_NONCE or info & dot11.KEY_INFO_SECURE:  # M4
+            self.messages.add(4)
+            return
+        self.messages.add(2)
+        if self.complete:
+            return
+        self.snonce, self.snonce_replay_counter = snonce, counter
+        self.mic = dot11.mic(eapol)
+        self.key_version = info & dot11.KEY_INFO_VERSION
+        zeroed = bytearray(eapol)
+        zeroed[81:97] = bytes(16)
+        self.eapol = bytes(zeroed)
+        if self.anonce is not None and self.anonce_replay_counter == counter:
+            self.complete = True
+
+
+class HandshakeDetector:
+    """
+    Detects a crackable WPA handshake for one BSSID (or any BSSID when none is given) without forking cowpatty.
+    Only the frames appended to a capture since the previous call are scanned.
+    """
+
+    def __init__(self, bssid: t.Union[str, int, None] = None):
+        self.bssid = None if bssid is None else dot11.mac_to_bytes(bssid)
+        self.handshakes: t.Dict[bytes, Handshake] = {}
+        self._readers: t.Dict[str, PcapReader] = {}
+
+    @property
+    def handshake(self) -> t.Optional[Handshake]:
+        return next((handshake for handshake in self.handshakes.values() if handshake.complete), None)
+
+    @metrics.timed('handshake')
+    def contains_valid_handshake(self, cap_file: str) -> bool:
+        reader = self._readers.get(cap_file)
+        if reader is None:
+            reader = self._readers[cap_file] = PcapReader(cap_file)
+        for _, frame in reader.read_frames():
+            eapol = dot11.eapol_key(frame)
+            if eapol is None:
+                continue
+            bssid, station = dot11.data_addresses(frame)
+            if self.bssid is not None and bssid != self.bssid:
+                continue
+            handshake = self.handshakes.get(bssid + station)
+            if handshake is None:
+                handshake = self.handshakes[bssid + station] = Handshake(bssid=bssid, station=station)
+            handshake.update(eapol)
+        return self.handshake is not None
@@ -0,0 +1,147 @@
+import collections
+import functools
+import math
+import time
+import typing as t
+from array import array
+
+from .models import AccessPoint
+
+UNKNOWN_POWER = -1
+MIN_ROWS = 64
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """NumPy is optional and slow to import, so it is loaded when the first statistic is computed."""
+    try:
+        import numpy
+    except ImportError:  # the statistics fall back to pure Python
+        return None
+    return numpy
+
+
+class SignalHistory:
+    """
+    The last `samples` values of a few metrics for up to `capacity` devices, kept in arrays (one ring buffer
+    row per device) that grow with the number of devices seen, so memory stays capped no matter how long
+    the session runs. When the table is full the least recently updated device is evicted.
+    Statistics are computed for the whole table at once, vectorized with NumPy when it is installed.
+    """
+
+    def __init__(self, metrics: t.Iterable[str], samples: int = 32, capacity: int = 4096):
+        self.metrics = tuple(metrics)
+        self.samples = samples
+        self.capacity = capacity
+        self._slots: t.OrderedDict[t.Hashable, int] = collections.OrderedDict()
+        self._rows = 0  # allocated so far
+        self._times = array('d')
+        self._values = {metric: array('d') for metric in self.metrics}
+        self._counts = array('q')
+        self._heads = array('q')
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        return key in self._slots
+
+    def record(self, key: t.Hashable, timestamp: float, values: t.Sequence[float]):
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+        else:
+            self._slots.move_to_end(key)
+
+        head = self._heads[slot]
+        index = slot * self.samples + head
+        self._times[index] = timestamp
+        for metric, value in zip(self.metrics, values):
+            self._values[metric][index] = value
+        self._heads[slot] = (head + 1) % self.samples
+        self._counts[slot] = min(self._counts[slot] + 1, self.samples)
+
+    def mean(self, metric: str) -> t.Dict[t.Hashable, float]:
+        """Rolling mean of the recorded samples, NaN samples (unknown values) are ignored."""
+        numpy = _numpy()
+        if numpy is not None:
+            values, _, mask = self._matrices(metric)
+            with numpy.errstate(invalid='ignore', divide='ignore'):
+                means = numpy.where(mask, values, 0).sum(axis=1) / mask.sum(axis=1)
+            return self._by_key(means)
+        return {key: _mean([v for _, v in self._samples(slot, metric)]) for key, slot in self._slots.items()}
+
+    def _allocate(self, key: t.Hashable) -> int:
+        if len(self._slots) < self.capacity:
+            slot = len(self._slots)
+            if slot == self._rows:
+                self._grow(min(self.capacity, max(MIN_ROWS, 2 * self._rows)))
+        else:
+            _, slot = self._slots.popitem(last=False)
+        self._counts[slot] = 0
+        self._heads[slot] = 0
+        self._slots[key] = slot
+        return slot
+
+    def _grow(self, rows: int):
+        added = rows - self._rows
+        self._times.frombytes(bytes(8 * self.samples * added))
+        for values in self._values.values():
+            values.frombytes(bytes(8 * self.samples * added))
+        self._counts.frombytes(bytes(8 * added))
+        self._heads.frombytes(bytes(8 * added))
+        self._rows = rows
+
+    def _samples(self, slot: int, metric: str) -> t.List[t.Tuple[float, float]]:
+        start = slot * self.samples
+        values = self._values[metric]
+        return [
+            (self._times[i], values[i]) for i in range(start, start + self._counts[slot]) if not math.isnan(values[i])
+        ]
+
+    def _matrices(self, metric: str):
+        numpy = _numpy()
+        shape = (self._rows, self.samples)
+        values = numpy.frombuffer(self._values[metric], dtype=numpy.float64).reshape(shape)
+        times = numpy.frombuffer(self._times, dtype=numpy.float64).reshape(shape)
+        counts = numpy.frombuffer(self._counts, dtype=numpy.int64)
+        mask = (numpy.arange(self.samples) < counts[:, None]) & ~numpy.isnan(values)
+        return values, times, mask
+
+    def _by_key(self, statistics) -> t.Dict[t.Hashable, float]:
+        return {key: float(statistics[slot]) for key, slot in self._slots.items()}
+
+
+def _mean(values: t.List[float]) -> float:
+    return sum(values) / len(values) if values else math.nan
+
+
+class DeviceHistory:
+    """Signal history of every access point and station, updated from each airodump-ng snapshot."""
+
+    def __init__(self, samples: int = 32, capacity: int = 4096):
+        self.access_points = SignalHistory(('power',), samples=samples, capacity=capacity)
+        self.stations = SignalHistory(('power',), samples=samples, capacity=capacity)
+
+    def record(self, access_points: t.Iterable[AccessPoint], timestamp: t.Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        access_points = list(access_points)
+        for access_point in access_points:
+            self.access_points.record(access_point.bssid, timestamp, (_power(access_point.power),))
+            for station in access_point.stations:
+                self.stations.record(station.station_mac, timestamp, (_power(station.power),))
+
+        access_point_power = self.access_points.mean('power')
+        station_power = self.stations.mean('power')
+        for access_point in access_points:
+            access_point.smoothed_power = _sortable(access_point_power.get(access_point.bssid, math.nan))
+            for station in access_point.stations:
+                station.smoothed_power = _sortable(station_power.get(station.station_mac, math.nan))
+
+
+def _power(power: int) -> float:
+    return math.nan if power == UNKNOWN_POWER else power
+
+
+def _sortable(value: float) -> float:
+    return -math.inf if math.isnan(value) else value
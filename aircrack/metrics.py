@@ -0,0 +1,145 @@
+"""
+Named timers and counters around the hot paths, off by default.
+
+    with metrics.timer('airodump.parse'):
+        ...
+
+    @metrics.timed('airmon')
+    async def ...
+
+While disabled a timer is one attribute check and a shared no-op context manager. Enabled, every timer keeps
+its last `WINDOW` durations for rolling percentiles, and every span is kept (up to `TRACE_LIMIT`) for a
+Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+"""
+import collections
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import typing as t
+
+WINDOW = 1024
+TRACE_LIMIT = 100_000
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+class Timer:
+    __slots__ = ('durations', 'count', 'total')
+
+    def __init__(self):
+        self.durations: t.Deque[int] = collections.deque(maxlen=WINDOW)  # nanoseconds
+        self.count = 0
+        self.total = 0
+
+    def add(self, duration: int):
+        self.durations.append(duration)
+        self.count += 1
+        self.total += duration
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile of the rolling window, in milliseconds."""
+        if not self.durations:
+            return 0.0
+        durations = sorted(self.durations)
+        return durations[round(q * (len(durations) - 1))] / 1e6
+
+
+class Metrics:
+    def __init__(self):
+        self.enabled = False
+        self.timers: t.Dict[str, Timer] = collections.defaultdict(Timer)
+        self.counters: t.Counter[str] = collections.Counter()
+        self.trace: t.Deque[t.Tuple[str, int, int, int]] = collections.deque(maxlen=TRACE_LIMIT)
+        self._epoch = time.perf_counter_ns()
+
+    def reset(self):
+        self.timers.clear()
+        self.counters.clear()
+        self.trace.clear()
+        self._epoch = time.perf_counter_ns()
+
+    def timer(self, name: str) -> t.ContextManager:
+        if not self.enabled:
+            return _NO_TIMER
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter_ns() - start)
+
+    def record(self, name: str, start: int, duration: int):
+        self.timers[name].add(duration)
+        self.trace.append((name, start, duration, threading.get_ident()))
+
+    def count(self, name: str, value: int = 1):
+        if self.enabled:
+            self.counters[name] += value
+
+    def timed(self, name: str):
+        """Decorator timing every call of a function or coroutine function."""
+        def decorator(function):
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await function(*args, **kwargs)
+                    with self._span(name):
+                        return await function(*args, **kwargs)
+            else:
+                @functools.wraps(function)
+                def wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return function(*args, **kwargs)
+                    with self._span(name):
+                        return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> t.Dict[str, t.Dict[str, float]]:
+        return {
+            name: {
+                'count': timer.count,
+                'total_ms': timer.total / 1e6,
+                'p50_ms': timer.percentile(0.5),
+                'p99_ms': timer.percentile(0.99),
+            }
+            for name, timer in sorted(self.timers.items())
+        }
+
+    def hud(self, names: t.Optional[t.Iterable[str]] = None) -> str:
+        """One line of `name p50/p99 ms` for the HUD."""
+        timers = self.timers if names is None else {name: self.timers[name] for name in names if name in self.timers}
+        if not timers:
+            return 'no samples yet'
+        return ' | '.join(
+            f'{name} {timer.percentile(0.5):.1f}/{timer.percentile(0.99):.1f}ms' for name, timer in sorted(timers.items())
+        )
+
+    def export_json(self, path: str):
+        with open(path, 'w') as file:
+            json.dump({'timers': self.summary(), 'counters': dict(self.counters)}, file, indent=2)
+
+    def export_chrome_trace(self, path: str):
+        pid = os.getpid()
+        events = [
+            {'name': name, 'ph': 'X', 'ts': (start - self._epoch) / 1e3, 'dur': duration / 1e3, 'pid': pid, 'tid': tid}
+            for name, start, duration, tid in self.trace
+        ]
+        events.extend(
+            {'name': name, 'ph': 'C', 'ts': (time.perf_counter_ns() - self._epoch) / 1e3, 'pid': pid,
+             'args': {name: value}}
+            for name, value in self.counters.items()
+        )
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+
+
+metrics = Metrics()
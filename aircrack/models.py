@@ -1,34 +1,62 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import math
+import sys
 from datetime import datetime
 import typing as t
 
+from . import oui
 
-@dataclasses.dataclass()
+
+@dataclasses.dataclass(slots=True)
 class WifiAdapter:
     phy: str
     interface: str
     driver: str
     chipset: str
+    monitor: t.Optional[bool] = None  # known from sysfs, guessed from the interface name otherwise
 
     def __str__(self) -> str:
         return '\t'.join(f'{field.name}: {getattr(self, field.name)}' for field in dataclasses.fields(self))
 
     @property
     def monitoring_enabled(self) -> bool:
+        if self.monitor is not None:
+            return self.monitor
         return self.interface.endswith('mon')
 
 def _db_to_percentage(power: float) -> float:
     return 100 * math.log(power)
 
 
-@dataclasses.dataclass()
+def parse_mac(mac: str) -> int:
+    return int(mac.replace(':', '').replace('-', ''), 16)
+
+
+@functools.lru_cache(maxsize=65536)
+def format_mac(mac: int) -> str:
+    """Every row is formatted again on each refresh (labels, search), the same few MACs every time."""
+    digits = f'{mac:012X}'
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp(timestamp: str) -> int:
+    """airodump-ng repeats the same few timestamps across rows, so parsing them is cached."""
+    return int(datetime.fromisoformat(timestamp).timestamp())
+
+
+def intern(value: str) -> str:
+    return sys.intern(value)
+
+
+@dataclasses.dataclass(slots=True)
 class AccessPoint:
-    bssid: str
-    first_seen: datetime
-    last_seen: datetime
+    bssid: int
+    first_seen: int
+    last_seen: int
     channel: int
     speed: int
     privacy: str
@@ -42,6 +70,15 @@ class AccessPoint:
     essid: str
     key: str
     stations: t.List[Station] = dataclasses.field(default_factory=list)
+    smoothed_power: float = -math.inf  # rolling mean kept by aircrack.history, -inf while unknown
+
+    @property
+    def bssid_human(self) -> str:
+        return format_mac(self.bssid)
+
+    @property
+    def vendor(self) -> str:
+        return oui.vendor(self.bssid)
 
     @property
     def num_stations(self) -> int:
@@ -52,16 +89,29 @@ class AccessPoint:
         return '???' if self.power == -1 else f'{100 - abs(round(self.power))}%'
 
 
-@dataclasses.dataclass()
+@dataclasses.dataclass(slots=True)
 class Station:
-    station_mac: str
-    first_seen: datetime
-    last_seen: datetime
+    station_mac: int
+    first_seen: int
+    last_seen: int
     power: int
     packets: int
     bssid: int
     probed_essids: str
+    smoothed_power: float = -math.inf
+
+    @property
+    def station_mac_human(self) -> str:
+        return format_mac(self.station_mac)
+
+    @property
+    def vendor(self) -> str:
+        return oui.vendor(self.station_mac)
+
+    @property
+    def bssid_human(self) -> str:
+        return format_mac(self.bssid)
 
     @property
     def power_human(self) -> str:
-        return '???' if self.power == '-1' else f'{100 - abs(round(self.power))}%'
+        return '???' if self.power == -1 else f'{100 - abs(round(self.power))}%'
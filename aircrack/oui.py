@@ -0,0 +1,137 @@
+"""
+MAC vendor lookup from a binary OUI index, built once from the IEEE OUI list and memory-mapped.
+
+    python -m aircrack.oui [oui.txt]
+
+Index layout (native byte order): b'OUI1', the entry count N, N sorted 24-bit prefixes (uint32),
+N + 1 offsets (uint32) into the UTF-8 vendor names that follow. Nothing is parsed at load time and only
+the pages a lookup touches are read, so opening the index costs neither startup time nor resident memory.
+"""
+import bisect
+import functools
+import mmap
+import os
+import re
+import struct
+import sys
+import typing as t
+
+SOURCES = [
+    '/usr/share/ieee-data/oui.txt',
+    '/var/lib/ieee-data/oui.txt',
+    '/usr/share/aircrack-ng/airodump-ng-oui.txt',
+    '/etc/aircrack-ng/airodump-ng-oui.txt',
+]
+INDEX_PATH = '.aircrack-ng/oui.idx'
+MAGIC = b'OUI1'
+HEADER = struct.Struct('=4sI')
+
+LOCALLY_ADMINISTERED = 0x02  # bit of the first octet set on randomized MACs
+RANDOMIZED = '(randomized)'
+UNKNOWN = ''
+
+# `00-00-0C   (hex)  Cisco Systems, Inc` in the IEEE list, `00:00:0C Cisco Systems, Inc` in aircrack-ng's copy
+ENTRY = re.compile(r'^([0-9A-Fa-f]{2})[-:]([0-9A-Fa-f]{2})[-:]([0-9A-Fa-f]{2})\s+(?:\(hex\)\s+)?(\S.*?)\s*$')
+
+
+def parse(path: str) -> t.Dict[int, str]:
+    vendors = {}
+    with open(path, encoding='utf-8', errors='replace') as file:
+        for line in file:
+            match = ENTRY.match(line)
+            if match:
+                vendors[int(''.join(match.group(1, 2, 3)), 16)] = match.group(4)
+    return vendors
+
+
+def build_index(source: str, destination: str = INDEX_PATH):
+    vendors = parse(source)
+    prefixes = sorted(vendors)
+    names = [vendors[prefix].encode() for prefix in prefixes]
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+    with open(f'{destination}.tmp', 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(prefixes)))
+        file.write(struct.pack(f'={len(prefixes)}I', *prefixes))
+        file.write(struct.pack(f'={len(offsets)}I', *offsets))
+        file.write(b''.join(names))
+    os.replace(f'{destination}.tmp', destination)
+
+
+class OuiIndex:
+    def __init__(self, path: str = INDEX_PATH):
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not an OUI index')
+        view = memoryview(self._map)
+        start = HEADER.size
+        self._prefixes = view[start:start + 4 * count].cast('I')
+        self._offsets = view[start + 4 * count:start + 8 * count + 4].cast('I')
+        self._names = start + 8 * count + 4
+        self.vendor = functools.lru_cache(maxsize=1 << 16)(self._vendor)  # memoized per MAC
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def _vendor(self, mac: int) -> str:
+        if (mac >> 40) & LOCALLY_ADMINISTERED:
+            return RANDOMIZED
+        prefix = mac >> 24
+        position = bisect.bisect_left(self._prefixes, prefix)
+        if position == len(self._prefixes) or self._prefixes[position] != prefix:
+            return UNKNOWN
+        start, end = self._offsets[position], self._offsets[position + 1]
+        return self._map[self._names + start:self._names + end].decode()
+
+
+def find_source() -> t.Optional[str]:
+    return next((path for path in SOURCES if os.path.exists(path)), None)
+
+
+def update_index() -> bool:
+    """
+    (Re)builds the index under .aircrack-ng when the system OUI list is newer, returns whether it did.
+    Takes a while, run it ahead of time (`python -m aircrack.oui`, or a worker thread), not from a render.
+    """
+    source = find_source()
+    if not source or (os.path.exists(INDEX_PATH) and os.path.getmtime(source) <= os.path.getmtime(INDEX_PATH)):
+        return False
+    try:
+        build_index(source)
+    except OSError:
+        return False
+    default_index.cache_clear()
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def default_index() -> t.Optional[OuiIndex]:
+    """The index under .aircrack-ng as `update_index` left it, None without one. Opening it only maps it."""
+    try:
+        return OuiIndex()
+    except (OSError, ValueError):
+        return None
+
+
+def vendor(mac: int) -> str:
+    """Vendor of the MAC, RANDOMIZED for locally administered (randomized) MACs, empty when unknown."""
+    index = default_index()
+    if index is None:
+        return RANDOMIZED if (mac >> 40) & LOCALLY_ADMINISTERED else UNKNOWN
+    return index.vendor(mac)
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else find_source()
+    if source is None:
+        sys.exit('No OUI list found, pass one (e.g. http://standards-oui.ieee.org/oui/oui.txt) or install ieee-data')
+    build_index(source)
+    print(f'{len(OuiIndex())} vendors from {source} indexed into {INDEX_PATH}')
+
+
+if __name__ == '__main__':
+    main()
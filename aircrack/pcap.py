@@ -0,0 +1,231 @@
+import os
+import struct
+import typing as t
+
+PCAP_MAGIC = 0xa1b2c3d4
+PCAP_MAGIC_NANOSECONDS = 0xa1b23c4d
+GLOBAL_HEADER_LENGTH = 24
+RECORD_HEADER_LENGTH = 16
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+RADIOTAP_FLAGS = 1
+RADIOTAP_DBM_ANTENNA_SIGNAL = 5
+RADIOTAP_FLAG_FCS = 0x10
+# (alignment, size) of the radiotap fields up to the antenna signal: TSFT, flags, rate, channel, FHSS, dBm signal
+RADIOTAP_FIELDS = ((8, 8), (1, 1), (1, 1), (2, 4), (1, 2), (1, 1))
+
+CHUNK_SIZE = 1 << 20
+
+
+def strip_link_header(linktype: int, packet: memoryview) -> t.Optional[memoryview]:
+    if linktype == LINKTYPE_IEEE802_11:
+        return packet
+    if linktype == LINKTYPE_IEEE802_11_RADIOTAP and len(packet) >= 4:
+        return packet[packet[2] | packet[3] << 8:]
+    return None
+
+
+def radiotap(packet: memoryview) -> t.Tuple[t.Optional[memoryview], t.Optional[int]]:
+    """Splits a radiotap packet into the 802.11 frame (without its FCS) and the antenna signal in dBm."""
+    if len(packet) < 8:
+        return None, None
+    length = packet[2] | packet[3] << 8
+    offset = 8
+    while packet[offset - 1] & 0x80 and offset + 4 <= length:  # extended presence bitmaps
+        offset += 4
+    presence = int.from_bytes(packet[4:offset], 'little')
+    layout = _radiotap_layouts.get(presence)
+    if layout is None:
+        layout = _radiotap_layouts[presence] = _radiotap_layout(int.from_bytes(packet[4:8], 'little'), offset, length)
+    flags_offset, signal_offset = layout
+    frame = packet[length:]
+    if flags_offset is not None and flags_offset < length and packet[flags_offset] & RADIOTAP_FLAG_FCS:
+        frame = frame[:-4]
+    if signal_offset is None or signal_offset >= length:
+        return frame, None
+    signal = packet[signal_offset]
+    return frame, signal - 256 if signal & 0x80 else signal
+
+
+# a driver always writes the same fields, so the offsets are only worked out once per set of presence bitmaps
+_radiotap_layouts: t.Dict[int, t.Tuple[t.Optional[int], t.Optional[int]]] = {}
+
+
+def _radiotap_layout(present: int, offset: int, length: int) -> t.Tuple[t.Optional[int], t.Optional[int]]:
+    """Offsets of the flags and antenna signal fields, given the first presence bitmap and where the fields start."""
+    flags = signal = None
+    for bit, (alignment, size) in enumerate(RADIOTAP_FIELDS):
+        if not present & (1 << bit):
+            continue
+        offset = (offset + alignment - 1) & -alignment
+        if offset + size > length:
+            break
+        if bit == RADIOTAP_FLAGS:
+            flags = offset
+        elif bit == RADIOTAP_DBM_ANTENNA_SIGNAL:
+            signal = offset
+        offset += size
+    return flags, signal
+
+
+def _global_header(header: bytes, name: str) -> t.Tuple[int, struct.Struct, float]:
+    """(linktype, record header, timestamp fraction divisor) of a pcap global header."""
+    for endian in '<>':
+        magic, = struct.unpack_from(f'{endian}I', header)
+        if magic in (PCAP_MAGIC, PCAP_MAGIC_NANOSECONDS):
+            break
+    else:
+        raise ValueError(f'{name} is not a pcap file')
+    linktype, = struct.unpack_from(f'{endian}I', header, 20)
+    return linktype, struct.Struct(f'{endian}IIII'), 1e9 if magic == PCAP_MAGIC_NANOSECONDS else 1e6
+
+
+class PcapReader:
+    """
+    Reads a growing pcap file incrementally. The byte offset of the first unread record is kept between calls,
+    so every call only touches the frames appended since the previous one.
+
+    Yielded frames are memoryviews over a reusable buffer, they are only valid until the next frame is read.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.offset = 0
+        self.linktype: t.Optional[int] = None
+        self._record_header: t.Optional[struct.Struct] = None
+        self._divisor = 1e6
+        self._inode: t.Optional[int] = None
+        self._buffer = bytearray(chunk_size)
+
+    def reset(self):
+        self.offset = 0
+        self.linktype = None
+        self._record_header = None
+
+    def read_frames(self) -> t.Iterator[t.Tuple[float, memoryview]]:
+        """Yields (timestamp, 802.11 frame) for every complete record appended since the last call."""
+        for timestamp, packet in self.read_packets():
+            frame = strip_link_header(self.linktype, packet)
+            if frame is not None:
+                yield timestamp, frame
+
+    def read_packets(self) -> t.Iterator[t.Tuple[float, memoryview]]:
+        """Like `read_frames`, with the link-layer header (`linktype`) left in place."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._inode or stat.st_size < self.offset:  # rotated or truncated
+            self._inode = stat.st_ino
+            self.reset()
+        if stat.st_size == self.offset:
+            return
+
+        with open(self.path, 'rb') as file:
+            if self.linktype is None and not self._read_global_header(file):
+                return
+            file.seek(self.offset)
+            yield from self._read_records(file)
+
+    def _read_global_header(self, file: t.BinaryIO) -> bool:
+        header = file.read(GLOBAL_HEADER_LENGTH)
+        if len(header) < GLOBAL_HEADER_LENGTH:
+            return False
+        self.linktype, self._record_header, self._divisor = _global_header(header, self.path)
+        self.offset = GLOBAL_HEADER_LENGTH
+        return True
+
+    def _read_records(self, file: t.BinaryIO) -> t.Iterator[t.Tuple[float, memoryview]]:
+        record_header = self._record_header
+        filled = 0
+        while True:
+            view = memoryview(self._buffer)
+            read = file.readinto(view[filled:])
+            if not read:
+                return
+            filled += read
+            position = 0
+            while filled - position >= RECORD_HEADER_LENGTH:
+                seconds, fraction, length, _ = record_header.unpack_from(view, position)
+                end = position + RECORD_HEADER_LENGTH + length
+                if end > filled:
+                    break
+                yield seconds + fraction / self._divisor, view[position + RECORD_HEADER_LENGTH:end]
+                position = end
+                self.offset += RECORD_HEADER_LENGTH + length
+
+            remaining = filled - position
+            view[:remaining] = view[position:filled]
+            filled = remaining
+            if filled >= RECORD_HEADER_LENGTH:
+                needed = RECORD_HEADER_LENGTH + record_header.unpack_from(view, 0)[2]
+                if needed > len(self._buffer):  # a single record larger than the buffer
+                    buffer = bytearray(needed)
+                    buffer[:filled] = view[:filled]
+                    self._buffer = buffer
+
+
+class PcapStream:
+    """
+    Reads pcap records from a pipe or FIFO (`tcpdump -i wlan0mon -w -`) without blocking: every call yields
+    the records that arrived since the previous one, a partial record stays in the buffer until the rest does.
+    Like `PcapReader`, yielded packets are only valid until the next one is read.
+    """
+
+    def __init__(self, file: t.BinaryIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.path = getattr(file, 'name', '<pipe>')
+        self.linktype: t.Optional[int] = None
+        self.closed = False
+        self._record_header: t.Optional[struct.Struct] = None
+        self._divisor = 1e6
+        self._buffer = bytearray(chunk_size)
+        self._filled = 0
+        os.set_blocking(file.fileno(), False)
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def read_packets(self) -> t.Iterator[t.Tuple[float, memoryview]]:
+        while not self.closed:
+            view = memoryview(self._buffer)
+            try:
+                read = os.readv(self.file.fileno(), [view[self._filled:]])
+            except BlockingIOError:
+                return
+            if not read:
+                self.closed = True
+                return
+            self._filled += read
+            position = 0
+            if self.linktype is None:
+                if self._filled < GLOBAL_HEADER_LENGTH:
+                    continue
+                header = bytes(view[:GLOBAL_HEADER_LENGTH])
+                self.linktype, self._record_header, self._divisor = _global_header(header, self.path)
+                position = GLOBAL_HEADER_LENGTH
+            while self._filled - position >= RECORD_HEADER_LENGTH:
+                seconds, fraction, length, _ = self._record_header.unpack_from(view, position)
+                end = position + RECORD_HEADER_LENGTH + length
+                if end > self._filled:
+                    break
+                yield seconds + fraction / self._divisor, view[position + RECORD_HEADER_LENGTH:end]
+                position = end
+
+            remaining = self._filled - position
+            view[:remaining] = view[position:self._filled]
+            self._filled = remaining
+            if remaining >= RECORD_HEADER_LENGTH:
+                needed = RECORD_HEADER_LENGTH + self._record_header.unpack_from(view, 0)[2]
+                if needed > len(self._buffer):
+                    buffer = bytearray(needed)
+                    buffer[:remaining] = view[:remaining]
+                    self._buffer = buffer
+
+    def read_frames(self) -> t.Iterator[t.Tuple[float, memoryview]]:
+        for timestamp, packet in self.read_packets():
+            frame = strip_link_header(self.linktype, packet)
+            if frame is not None:
+                yield timestamp, frame
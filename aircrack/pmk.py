@@ -0,0 +1,286 @@
+"""
+WPA-PSK passphrase checks against a captured 4-way handshake, with the PMKs derived on every core and cached per ESSID.
+
+    python -m aircrack.pmk crack capture.cap wordlist.txt [--bssid MAC] [--essid ESSID] [--processes N]
+    python -m aircrack.pmk precompute ESSID wordlist.txt [--processes N]
+
+A PMK is PBKDF2-HMAC-SHA1(passphrase, ESSID, 4096 iterations), the expensive part of every attempt. The wordlist is
+streamed in chunks to a process pool and every PMK is appended to `.aircrack-ng/pmk/<hex ESSID>.pmk`, so a later
+handshake of a network with the same ESSID only costs the PTK/MIC check (two HMACs) per cached passphrase.
+
+Cache layout: b'PMK1', the ESSID length and the ESSID padded to 32 bytes, then one record per passphrase: its length
+(uint8), the passphrase and the 32 byte PMK. Records are only ever appended, an incomplete last one (an interrupted
+write) is cut off when the cache is opened again.
+"""
+import argparse
+import collections
+import concurrent.futures
+import hashlib
+import hmac
+import itertools
+import mmap
+import os
+import struct
+import sys
+import time
+import typing as t
+
+from . import dot11
+from .handshake import Handshake, HandshakeDetector
+from .metrics import metrics
+from .pcap import PcapReader
+
+CACHE_DIR = '.aircrack-ng/pmk'
+MAGIC = b'PMK1'
+HEADER = struct.Struct('=4sB32s')
+PMK_LENGTH = 32
+ITERATIONS = 4096
+MIN_PASSPHRASE = 8
+MAX_PASSPHRASE = 63
+CHUNK_SIZE = 256  # passphrases per task, a few hundred ms of PBKDF2
+PAIRWISE_KEY_EXPANSION = b'Pairwise key expansion\x00'
+KEY_VERSION_HMAC_MD5 = 1
+KEY_VERSION_HMAC_SHA1 = 2
+
+
+def derive(passphrase: bytes, essid: bytes) -> bytes:
+    return hashlib.pbkdf2_hmac('sha1', passphrase, essid, ITERATIONS, PMK_LENGTH)
+
+
+def derive_chunk(essid: bytes, passphrases: t.Sequence[bytes]) -> bytes:
+    """Runs in the pool workers, the PMKs come back concatenated to keep the pickling cheap."""
+    return b''.join(derive(passphrase, essid) for passphrase in passphrases)
+
+
+def read_wordlist(path: str) -> t.Iterator[bytes]:
+    """Streams the valid WPA passphrases (8 to 63 bytes) of a wordlist, `-` reads stdin."""
+    file = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    with file:
+        for line in file:
+            passphrase = line.rstrip(b'\r\n')
+            if MIN_PASSPHRASE <= len(passphrase) <= MAX_PASSPHRASE:
+                yield passphrase
+
+
+class HandshakeCheck:
+    """Checks a PMK against a complete handshake: derives the KCK part of the PTK and compares the MIC of M2."""
+
+    def __init__(self, handshake: Handshake):
+        if not handshake.complete:
+            raise ValueError('the handshake is not complete')
+        if handshake.key_version == KEY_VERSION_HMAC_MD5:
+            self.digest = 'md5'
+        elif handshake.key_version == KEY_VERSION_HMAC_SHA1:
+            self.digest = 'sha1'
+        else:  # AES-CMAC with a SHA-256 KDF (802.11w), neither is in hashlib
+            raise ValueError(f'key descriptor version {handshake.key_version} is not supported')
+        self.data = (
+            PAIRWISE_KEY_EXPANSION
+            + min(handshake.bssid, handshake.station) + max(handshake.bssid, handshake.station)
+            + min(handshake.anonce, handshake.snonce) + max(handshake.anonce, handshake.snonce)
+            + b'\x00'  # PRF-512 counter, the first 20 bytes of the PTK hold the 16 byte KCK
+        )
+        self.eapol = handshake.eapol
+        self.mic = handshake.mic
+
+    def __call__(self, pmk: bytes) -> bool:
+        kck = hmac.digest(pmk, self.data, 'sha1')[:16]
+        return hmac.digest(kck, self.eapol, self.digest)[:16] == self.mic
+
+
+class PmkCache:
+    """The PMKs derived so far for one ESSID, memory-mapped for reading and appended to as new ones come in."""
+
+    def __init__(self, essid: bytes, directory: str = CACHE_DIR):
+        self.essid = essid
+        self.path = os.path.join(directory, f'{essid.hex()}.pmk')
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a+b')
+        self._file.seek(0)
+        header = self._file.read(HEADER.size)
+        if not header:
+            self._file.write(HEADER.pack(MAGIC, len(essid), essid))
+            self._file.flush()
+        elif len(header) < HEADER.size or HEADER.unpack(header) != (MAGIC, len(essid), essid.ljust(32, b'\x00')):
+            raise ValueError(f'{self.path} is not a PMK cache for {essid!r}')
+        self._map: t.Optional[mmap.mmap] = None
+        self._mapped = 0
+        self._passphrases: t.Optional[t.Set[bytes]] = None
+        self._file.truncate(self._end())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> 'PmkCache':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self) -> t.Iterator[t.Tuple[bytes, bytes]]:
+        """Yields (passphrase, PMK) for every complete record, including the ones added through this instance."""
+        self._file.flush()
+        size = os.fstat(self._file.fileno()).st_size
+        if size != self._mapped:  # an iteration still running keeps the previous map alive
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped = size
+        data = self._map
+        offset, end = HEADER.size, self._mapped
+        while offset < end:
+            length = data[offset]
+            start = offset + 1
+            offset = start + length + PMK_LENGTH
+            if offset > end:
+                return
+            yield data[start:start + length], data[start + length:offset]
+
+    def __contains__(self, passphrase: bytes) -> bool:
+        if self._passphrases is None:
+            self._passphrases = {passphrase for passphrase, _ in self}
+        return passphrase in self._passphrases
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def add(self, passphrase: bytes, pmk: bytes):
+        self._file.write(bytes([len(passphrase)]) + passphrase + pmk)
+        if self._passphrases is not None:
+            self._passphrases.add(passphrase)
+
+    def _end(self) -> int:
+        """Where the complete records end."""
+        end = HEADER.size
+        for passphrase, _ in self:
+            end += 1 + len(passphrase) + PMK_LENGTH
+        return end
+
+
+class PmkEngine:
+    """Derives PMKs on `processes` cores (all of them by default), in-process when there is only one."""
+
+    def __init__(self, processes: t.Optional[int] = None, chunk_size: int = CHUNK_SIZE):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def derive(self, essid: bytes, passphrases: t.Iterable[bytes]) -> t.Iterator[t.Tuple[bytes, bytes]]:
+        """
+        Yields (passphrase, PMK) in wordlist order. At most two chunks per process are in flight, so a wordlist
+        of any size is streamed, and closing the iterator early cancels the chunks not started yet.
+        """
+        passphrases = iter(passphrases)
+        chunks = iter(lambda: list(itertools.islice(passphrases, self.chunk_size)), [])
+        if self.processes == 1:
+            for chunk in chunks:
+                yield from self._pmks(chunk, derive_chunk(essid, chunk))
+            return
+        pool = concurrent.futures.ProcessPoolExecutor(self.processes)
+        pending: t.Deque[t.Tuple[t.List[bytes], concurrent.futures.Future]] = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append((chunk, pool.submit(derive_chunk, essid, chunk)))
+                if len(pending) >= 2 * self.processes:
+                    chunk, future = pending.popleft()
+                    yield from self._pmks(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                yield from self._pmks(chunk, future.result())
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def _pmks(chunk: t.List[bytes], pmks: bytes) -> t.Iterator[t.Tuple[bytes, bytes]]:
+        metrics.count('pmk.derived', len(chunk))
+        for i, passphrase in enumerate(chunk):
+            yield passphrase, pmks[i * PMK_LENGTH:(i + 1) * PMK_LENGTH]
+
+    def precompute(self, cache: PmkCache, passphrases: t.Iterable[bytes]) -> int:
+        """Adds the PMKs of the passphrases not cached yet, returns how many were derived."""
+        derived = 0
+        for passphrase, pmk in self.derive(cache.essid, (p for p in passphrases if p not in cache)):
+            cache.add(passphrase, pmk)
+            derived += 1
+        return derived
+
+    @metrics.timed('pmk.crack')
+    def crack(self, handshake: Handshake, cache: PmkCache, passphrases: t.Iterable[bytes]) -> t.Optional[bytes]:
+        """
+        Returns the passphrase of the handshake, or None. The cached PMKs are checked first, then the passphrases
+        that are not cached yet are derived, cached and checked as they come in.
+        """
+        check = HandshakeCheck(handshake)
+        for passphrase, pmk in cache:
+            if check(pmk):
+                return passphrase
+        fresh = self.derive(cache.essid, (passphrase for passphrase in passphrases if passphrase not in cache))
+        try:
+            for passphrase, pmk in fresh:
+                cache.add(passphrase, pmk)
+                if check(pmk):
+                    return passphrase
+        finally:
+            fresh.close()
+        return None
+
+
+def capture_essid(cap_file: str, bssid: bytes) -> t.Optional[bytes]:
+    """The ESSID in the first beacon or probe response of the BSSID that carries one."""
+    bssid = int.from_bytes(bssid, 'big')
+    for _, frame in PcapReader(cap_file).read_frames():
+        kind, subtype = dot11.frame_type(frame)
+        if (
+                kind == dot11.TYPE_MANAGEMENT
+                and subtype in (dot11.SUBTYPE_BEACON, dot11.SUBTYPE_PROBE_RESPONSE)
+                and len(frame) >= dot11.MANAGEMENT_HEADER_LENGTH + dot11.BEACON_FIXED_LENGTH
+                and dot11.mac_to_int(frame, 16) == bssid
+        ):
+            essid = dot11.beacon(frame).essid
+            if essid:
+                return essid.encode()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+    crack = commands.add_parser('crack', help='find the passphrase of a handshake in a capture')
+    crack.add_argument('capture')
+    crack.add_argument('wordlist', help='one passphrase per line, - for stdin')
+    crack.add_argument('--bssid', help='the AP, the first complete handshake by default')
+    crack.add_argument('--essid', help='read from the beacons of the capture by default')
+    precompute = commands.add_parser('precompute', help='fill the PMK cache of an ESSID')
+    precompute.add_argument('essid')
+    precompute.add_argument('wordlist', help='one passphrase per line, - for stdin')
+    for command in (crack, precompute):
+        command.add_argument('--processes', type=int, help='all cores by default')
+    args = parser.parse_args()
+
+    engine = PmkEngine(args.processes)
+    start = time.perf_counter()
+    if args.command == 'precompute':
+        with PmkCache(args.essid.encode()) as cache:
+            derived = engine.precompute(cache, read_wordlist(args.wordlist))
+        elapsed = time.perf_counter() - start
+        print(f'{derived} PMKs in {elapsed:.1f}s ({derived / max(elapsed, 1e-9):,.0f}/s on {engine.processes} '
+              f'processes) cached in {cache.path}')
+        return
+
+    detector = HandshakeDetector(args.bssid)
+    if not detector.contains_valid_handshake(args.capture):
+        sys.exit(f'No complete handshake in {args.capture}')
+    handshake = detector.handshake
+    essid = args.essid.encode() if args.essid else capture_essid(args.capture, handshake.bssid)
+    if essid is None:
+        sys.exit(f'No ESSID of {handshake.bssid.hex(":")} in {args.capture}, pass --essid')
+    with PmkCache(essid) as cache:
+        passphrase = engine.crack(handshake, cache, read_wordlist(args.wordlist))
+    elapsed = time.perf_counter() - start
+    if passphrase is None:
+        sys.exit(f'Passphrase of {essid.decode(errors="replace")} not in the wordlist ({elapsed:.1f}s)')
+    print(f'{essid.decode(errors="replace")}: {passphrase.decode(errors="replace")} ({elapsed:.1f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""
+Records airodump-ng sessions and plays them back in place of the aircrack-ng binaries.
+
+    python -m aircrack.replay record SESSION -i wlan0mon [--duration 600]
+
+A session directory holds every CSV snapshot airodump-ng wrote, the final capture and a session.json
+manifest with the time of each snapshot and how far the capture had grown by then. After `use_session`
+the wrappers run this module instead of airodump-ng, airmon-ng, aireplay-ng and cowpatty, so the whole
+application runs from the recording at 1x, 10x or as fast as possible (--speed 0) without a radio.
+"""
+import argparse
+import json
+import os
+import re
+import shlex
+import shutil
+import signal
+import sys
+import time
+import typing as t
+
+from .adapters import AdapterDiscovery
+from .aireplay import Aireplay
+from .airmon import Airmon
+from .airodump import Airodump, ACCESS_POINT_HEADER, STATION_HEADER
+from .cowpatty import Cowpatty, VALID_HANDSHAKE
+from .handshake import HandshakeDetector
+
+MANIFEST = 'session.json'
+CAPTURE = 'capture.cap'
+INCOMPLETE_HANDSHAKE = 'End of pcap capture file, incomplete four-way handshake exchange.'
+DEAUTH_PACKETS = 64  # aireplay-ng sends 64 directed deauthentication packets per --deauth count
+
+
+class SessionRecorder:
+    """Snapshots the CSV and capture of a running Airodump whenever airodump-ng updates them."""
+
+    def __init__(self, session_dir: str, airodump: Airodump):
+        self.session_dir = session_dir
+        self.airodump = airodump
+        self.events: t.List[t.Dict[str, t.Any]] = []
+        self.airmon = Airmon.list_adapters()
+        self._started = time.monotonic()
+        self._csv_signature: t.Optional[t.Tuple[int, int]] = None
+        self._cap_size = 0
+        os.makedirs(os.path.join(session_dir, 'csv'), exist_ok=True)
+
+    def record(self, duration: t.Optional[float] = None, refresh: float = 1):
+        deadline = duration and self._started + duration
+        try:
+            while not deadline or time.monotonic() < deadline:
+                self.airodump.wait_for_change(refresh)
+                self.snapshot()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def snapshot(self) -> bool:
+        """Records the files airodump-ng changed since the previous snapshot, returns whether there were any."""
+        event = {'t': round(time.monotonic() - self._started, 3), 'csv': None, 'cap_size': self._cap_size}
+        csv_file = self.airodump.get_latest_file('.csv')
+        if csv_file and os.path.exists(csv_file):
+            stat = os.stat(csv_file)
+            if (stat.st_size, stat.st_mtime_ns) != self._csv_signature:
+                with open(csv_file, 'rb') as file:
+                    data = file.read()
+                if STATION_HEADER.encode() in data and data.endswith(b'\n'):  # skip half written files
+                    self._csv_signature = stat.st_size, stat.st_mtime_ns
+                    event['csv'] = os.path.join('csv', f'{len(self.events):06}.csv')
+                    with open(os.path.join(self.session_dir, event['csv']), 'wb') as file:
+                        file.write(data)
+        cap_file = self.airodump.get_latest_file('.cap')
+        if cap_file and os.path.exists(cap_file):
+            event['cap_size'] = max(self._cap_size, os.path.getsize(cap_file))  # airodump-ng only appends to it
+        if event['csv'] is None and event['cap_size'] == self._cap_size:
+            return False
+        self._cap_size = event['cap_size']
+        self.events.append(event)
+        return True
+
+    def close(self):
+        cap_file = self.airodump.get_latest_file('.cap')
+        self.airodump.stop()
+        capture_size = 0
+        if cap_file and os.path.exists(cap_file):
+            shutil.copyfile(cap_file, os.path.join(self.session_dir, CAPTURE))
+            capture_size = os.path.getsize(cap_file)
+        for event in self.events:
+            event['cap_size'] = min(event['cap_size'], capture_size)
+        with open(os.path.join(self.session_dir, MANIFEST), 'w') as file:
+            json.dump({
+                'interface': self.airodump.interface,
+                'airmon': self.airmon,
+                'events': self.events,
+            }, file, indent=1)
+
+
+class Session:
+    def __init__(self, session_dir: str):
+        self.session_dir = session_dir
+        with open(os.path.join(session_dir, MANIFEST)) as file:
+            manifest = json.load(file)
+        self.interface: str = manifest['interface']
+        self.airmon: str = manifest['airmon']
+        self.events: t.List[t.Dict[str, t.Any]] = manifest['events']
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.session_dir, name)
+
+    def phy(self, interface: str) -> str:
+        """The phy of the interface, or of its monitor vif when the recording only listed that."""
+        names = {interface, re.sub(r'mon$', '', interface), f'{interface}mon'}
+        for adapter in Airmon.parse_adapters(self.airmon):
+            if adapter.interface in names:
+                return adapter.phy
+        return 'phy0'
+
+
+def use_session(session_dir: str, speed: float = 1):
+    """Makes the wrappers run the recorded session instead of the aircrack-ng binaries."""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    os.environ['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, os.environ.get('PYTHONPATH')]))
+    command = f'{shlex.quote(sys.executable)} -m aircrack.replay'
+    session = shlex.quote(os.path.abspath(session_dir))
+    Airodump.executable = f'{command} airodump {session} --speed {speed}'
+    Airmon.executable = f'{command} airmon {session}'
+    Aireplay.executable = f'{command} aireplay {session} --speed {speed}'
+    Cowpatty.executable = f'{command} cowpatty'
+    AdapterDiscovery.sysfs_root = None  # list the recorded adapters, not the local ones
+
+
+def filter_csv(data: str, bssid: t.Optional[str], channels: t.Optional[t.Set[str]]) -> str:
+    """Keeps the rows airodump-ng would have written with --bssid / --channel."""
+    if not bssid and not channels:
+        return data
+    lines, stations, kept = [], False, set()
+    for line in data.splitlines(keepends=True):
+        fields = [field.strip() for field in line.split(',')]
+        if not line.strip() or line.startswith(ACCESS_POINT_HEADER) or line.startswith(STATION_HEADER):
+            stations = stations or line.startswith(STATION_HEADER)
+            lines.append(line)
+        elif not stations:
+            if (not bssid or fields[0].upper() == bssid) and (not channels or fields[3] in channels):
+                kept.add(fields[0].upper())
+                lines.append(line)
+        elif len(fields) > 5 and fields[5].upper() in kept:
+            lines.append(line)
+    return ''.join(lines)
+
+
+def next_prefix(prefix: str) -> str:
+    """Numbers the output files like airodump-ng does, after the ones already in the directory."""
+    dirname, basename = os.path.split(prefix)
+    pattern = re.compile(rf'{re.escape(basename)}-(\d+)\.')
+    numbers = [int(match.group(1)) for match in map(pattern.match, os.listdir(dirname or '.')) if match]
+    return f'{prefix}-{max(numbers, default=0) + 1:02}'
+
+
+def write_atomic(path: str, data: str):
+    dirname, basename = os.path.split(path)
+    temporary = os.path.join(dirname, f'.{basename}.tmp')  # outside of the capture index' prefix
+    with open(temporary, 'w') as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+
+def replay_airodump(session: Session, args: argparse.Namespace):
+    prefix = next_prefix(args.write)
+    bssid = args.bssid and args.bssid.upper()
+    channels = args.channel and set(args.channel.split(','))
+    started = time.monotonic()
+    with open(session.path(CAPTURE), 'rb') as capture, open(f'{prefix}.cap', 'wb') as output:
+        for event in session.events:
+            if args.speed:
+                time.sleep(max(0.0, started + event['t'] / args.speed - time.monotonic()))
+            if event['cap_size'] > output.tell():
+                output.write(capture.read(event['cap_size'] - output.tell()))
+                output.flush()
+            if event['csv']:
+                with open(session.path(event['csv'])) as file:
+                    write_atomic(f'{prefix}.csv', filter_csv(file.read(), bssid, channels))
+    signal.pause()  # airodump-ng keeps running until it is terminated
+
+
+def replay_airmon(session: Session, args: argparse.Namespace):
+    if args.command == 'start':
+        phy = session.phy(args.interface)
+        print(f'(mac80211 monitor mode vif enabled for [{phy}]{args.interface} on [{phy}]{args.interface}mon)')
+    elif args.command == 'stop':
+        phy, interface = session.phy(args.interface), re.sub(r'mon$', '', args.interface)
+        print(f'(mac80211 station mode vif enabled on [{phy}]{interface})')
+        print(f'(mac80211 monitor mode vif disabled for [{phy}]{args.interface})')
+    else:
+        print(session.airmon)
+
+
+def replay_aireplay(session: Session, args: argparse.Namespace):
+    """Prints a round per --deauth count the way aireplay-ng does, ACK counts redrawn after a \\r while it runs."""
+    print(f'{time.strftime("%H:%M:%S")}  Waiting for beacon frame (BSSID: {args.a}) on channel 6', flush=True)
+    for _ in range(args.deauth):
+        line = f'{time.strftime("%H:%M:%S")}  Sending {DEAUTH_PACKETS} directed DeAuth (code 7). STMAC: [{args.c}]'
+        for acks in range(0, DEAUTH_PACKETS + 1, 16):
+            if args.speed:
+                time.sleep(0.25 / args.speed)
+            print(f'\r{line} [{acks // 2:2d}|{acks:2d} ACKs]', end='', flush=True)
+        print(flush=True)
+
+
+def replay_cowpatty(args: argparse.Namespace):
+    detector = HandshakeDetector()
+    print(VALID_HANDSHAKE if detector.contains_valid_handshake(args.r) else INCOMPLETE_HANDSHAKE)
+
+
+def record(args: argparse.Namespace):
+    SessionRecorder(args.session, Airodump(args.interface, live=False)).record(args.duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='tool', required=True)
+
+    recorder = commands.add_parser('record', help='record a session from a live airodump-ng')
+    recorder.add_argument('session')
+    recorder.add_argument('-i', '--interface', required=True, help='interface in monitor mode')
+    recorder.add_argument('--duration', type=float, help='seconds to record, until interrupted by default')
+
+    airodump = commands.add_parser('airodump')
+    airodump.add_argument('session')
+    airodump.add_argument('interface')
+    airodump.add_argument('--write', required=True)
+    airodump.add_argument('--bssid')
+    airodump.add_argument('--channel')
+    airodump.add_argument('--speed', type=float, default=1, help='playback speed, 0 plays as fast as possible')
+
+    airmon = commands.add_parser('airmon')
+    airmon.add_argument('session')
+    airmon.add_argument('command', nargs='?', choices=['start', 'stop'])
+    airmon.add_argument('interface', nargs='?')
+
+    aireplay = commands.add_parser('aireplay')
+    aireplay.add_argument('session')
+    aireplay.add_argument('interface')
+    aireplay.add_argument('--deauth', type=int, required=True)
+    aireplay.add_argument('-a')
+    aireplay.add_argument('-c')
+    aireplay.add_argument('--speed', type=float, default=1)
+
+    cowpatty = commands.add_parser('cowpatty')
+    cowpatty.add_argument('-c', action='store_true')
+    cowpatty.add_argument('-r', required=True)
+
+    args = parser.parse_args()
+    if args.tool == 'record':
+        record(args)
+    elif args.tool == 'cowpatty':
+        replay_cowpatty(args)
+    else:
+        replay = {'airodump': replay_airodump, 'airmon': replay_airmon, 'aireplay': replay_aireplay}[args.tool]
+        replay(Session(args.session), args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Bounded disk use of `.aircrack-ng`: every airodump-ng start writes a new `<prefix>-NN` set of .cap/.csv/.netxml
+files and nothing else removes them.
+
+    python -m aircrack.retention [--keep-mb 2048] [--keep-days 7] [--dry-run]
+
+Sessions older than `max_age` are removed, then the oldest ones until the rest fits into `max_bytes`.
+The active sessions, and any session written to during the last `ACTIVE_WINDOW` seconds (another instance
+may be capturing into it), are never touched. The archive, indexes and caches next to them are left alone.
+"""
+import argparse
+import dataclasses
+import os
+import re
+import time
+import typing as t
+
+from .metrics import metrics
+
+DIRECTORY = '.aircrack-ng'
+DEFAULT_MAX_BYTES = 2 << 30
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+ACTIVE_WINDOW = 60
+# `wlan0mon-01.cap`, `wlan0mon_essid-03.kismet.netxml`, ... as airodump-ng names them after its --write prefix
+SESSION_FILE = re.compile(r'^(.+-\d{2,})\.(?:cap|csv|kismet\.csv|kismet\.netxml|log\.csv|gps|ivs)$')
+
+
+@dataclasses.dataclass(slots=True)
+class Session:
+    stem: str
+    paths: t.List[str] = dataclasses.field(default_factory=list)
+    size: int = 0
+    mtime: float = 0
+
+
+def session_stem(path: str) -> t.Optional[str]:
+    match = SESSION_FILE.match(os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def sessions(directory: str = DIRECTORY) -> t.List[Session]:
+    """The capture sessions in the directory, oldest (by their last write) first."""
+    found: t.Dict[str, Session] = {}
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        stem = session_stem(entry.name)
+        if stem is None or not entry.is_file(follow_symlinks=False):
+            continue
+        try:
+            stat = entry.stat(follow_symlinks=False)
+        except FileNotFoundError:
+            continue
+        session = found.get(stem)
+        if session is None:
+            session = found[stem] = Session(stem)
+        session.paths.append(entry.path)
+        session.size += stat.st_size
+        session.mtime = max(session.mtime, stat.st_mtime)
+    return sorted(found.values(), key=lambda session: session.mtime)
+
+
+@dataclasses.dataclass(slots=True)
+class RetentionPolicy:
+    max_bytes: t.Optional[int] = DEFAULT_MAX_BYTES  # None for no size cap
+    max_age: t.Optional[float] = DEFAULT_MAX_AGE  # seconds, None for no age cap
+    directory: str = DIRECTORY
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> 'RetentionPolicy':
+        return cls(max_bytes=int(args.keep_mb * 2 ** 20) or None, max_age=args.keep_days * 86400 or None)
+
+    @metrics.timed('retention.prune')
+    def prune(
+            self, active: t.Iterable[str] = (), now: t.Optional[float] = None, dry_run: bool = False
+    ) -> t.List[Session]:
+        """Removes what the policy does not keep, `active` are files of sessions in use. Returns what was removed."""
+        now = time.time() if now is None else now
+        active_stems = {session_stem(path) for path in active}
+        candidates = sessions(self.directory)
+        total = sum(session.size for session in candidates)
+        removed = []
+        for session in candidates:  # oldest first
+            if session.stem in active_stems or now - session.mtime < ACTIVE_WINDOW:
+                continue
+            too_old = self.max_age is not None and now - session.mtime > self.max_age
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not too_old and not too_big:
+                continue
+            if not dry_run:
+                for path in session.paths:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            total -= session.size
+            removed.append(session)
+        metrics.count('retention.removed', len(removed))
+        return removed
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        '--keep-mb', type=float, default=DEFAULT_MAX_BYTES / 2 ** 20,
+        help='MiB of old capture files kept in .aircrack-ng, 0 for no size cap',
+    )
+    parser.add_argument(
+        '--keep-days', type=float, default=DEFAULT_MAX_AGE / 86400,
+        help='days old capture files are kept in .aircrack-ng, 0 for no age cap',
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument('--dry-run', action='store_true', help='only list what would be removed')
+    args = parser.parse_args()
+    policy = RetentionPolicy.from_args(args)
+    removed = policy.prune(dry_run=args.dry_run)
+    for session in removed:
+        print(f'{session.stem}: {session.size / 2 ** 20:.1f} MiB, last written {time.ctime(session.mtime)}')
+    freed = sum(session.size for session in removed)
+    left = sum(session.size for session in sessions(policy.directory)) - (freed if args.dry_run else 0)
+    print(f'{len(removed)} sessions {"to remove" if args.dry_run else "removed"}, {freed / 2 ** 20:.1f} MiB freed, '
+          f'{left / 2 ** 20:.1f} MiB of sessions left')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Starts the TUI against a fake sysfs and exits as soon as the first frame is drawn.
+
+    python -m benchmarks.first_frame SYSFS_ROOT
+
+benchmarks.run times the whole process, so the result includes the interpreter start and every import.
+"""
+import os
+import sys
+
+import urwid
+
+from aircrack.adapters import AdapterDiscovery
+
+
+class FirstFrameScreen(urwid.BaseScreen):
+    def get_cols_rows(self):
+        return 200, 60
+
+    def draw_screen(self, size, canvas):
+        for row in canvas.content():
+            for _ in row:
+                pass
+        sys.stdout.flush()
+        os._exit(0)
+
+
+def main():
+    AdapterDiscovery.sysfs_root = sys.argv[1]
+    import wifi_snitch
+    wifi_snitch.Application(screen=FirstFrameScreen())
+    sys.exit('no frame was drawn')
+
+
+if __name__ == '__main__':
+    main()
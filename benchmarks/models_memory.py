@@ -0,0 +1,139 @@
+"""
+Compares the memory taken by a snapshot of airodump-ng models before and after the slotted, int based representation.
+
+    python -m benchmarks.models_memory [--stations 50000]
+"""
+import argparse
+import dataclasses
+import gc
+import random
+import tracemalloc
+import typing as t
+from datetime import datetime
+
+from aircrack.models import AccessPoint, Station, intern, parse_mac, parse_timestamp
+
+PRIVACY = ['WPA2', 'WPA2 WPA', 'WEP', 'OPN']
+CIPHER = ['CCMP', 'CCMP TKIP', 'WEP', '']
+AUTHENTICATION = ['PSK', 'MGT', 'SAE', '']
+
+
+@dataclasses.dataclass()
+class LegacyAccessPoint:
+    bssid: str
+    first_seen: datetime
+    last_seen: datetime
+    channel: int
+    speed: int
+    privacy: str
+    cipher: str
+    authentication: str
+    power: int
+    beacons: int
+    iv: str
+    lan_ip: str
+    id_length: int
+    essid: str
+    key: str
+    stations: t.List['LegacyStation'] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass()
+class LegacyStation:
+    station_mac: str
+    first_seen: datetime
+    last_seen: datetime
+    power: int
+    packets: int
+    bssid: str
+    probed_essids: str
+
+
+def random_mac(rng: random.Random) -> str:
+    return ':'.join(f'{rng.randrange(256):02X}' for _ in range(6))
+
+
+def random_timestamp(rng: random.Random) -> str:
+    return f'2024-05-01 12:{rng.randrange(60):02d}:{rng.randrange(60):02d}'
+
+
+def generate_rows(stations: int, seed: int = 0) -> t.Tuple[t.List[t.List[str]], t.List[t.List[str]]]:
+    """Rows as csv.reader yields them (fresh strings for every cell, like a real parse)."""
+    rng = random.Random(seed)
+    access_points = [
+        [
+            random_mac(rng), random_timestamp(rng), random_timestamp(rng), str(rng.randrange(1, 14)), '54',
+            rng.choice(PRIVACY), rng.choice(CIPHER), rng.choice(AUTHENTICATION), str(-rng.randrange(20, 95)),
+            str(rng.randrange(10000)), '0', '0.  0.  0.  0', '8', f'network-{i}', '',
+        ]
+        for i in range(max(1, stations // 10))
+    ]
+    station_rows = [
+        [
+            random_mac(rng), random_timestamp(rng), random_timestamp(rng), str(-rng.randrange(20, 95)),
+            str(rng.randrange(10000)), rng.choice(access_points)[0], '',
+        ]
+        for _ in range(stations)
+    ]
+    return access_points, station_rows
+
+
+def build_legacy(access_point_rows, station_rows) -> t.List[LegacyAccessPoint]:
+    access_points = {}
+    for row in access_point_rows:
+        access_points[row[0]] = LegacyAccessPoint(
+            row[0], datetime.fromisoformat(row[1]), datetime.fromisoformat(row[2]), int(row[3]), int(row[4]),
+            row[5], row[6], row[7], int(row[8]), int(row[9]), row[10], row[11],
+            int(row[12]), row[13], row[14],
+        )
+    for row in station_rows:
+        access_points[row[5]].stations.append(LegacyStation(
+            row[0], datetime.fromisoformat(row[1]), datetime.fromisoformat(row[2]), int(row[3]), int(row[4]),
+            row[5], row[6],
+        ))
+    return list(access_points.values())
+
+
+def build_compact(access_point_rows, station_rows) -> t.List[AccessPoint]:
+    access_points = {}
+    for row in access_point_rows:
+        bssid = parse_mac(row[0])
+        access_points[bssid] = AccessPoint(
+            bssid, parse_timestamp(row[1]), parse_timestamp(row[2]), int(row[3]), int(row[4]),
+            intern(row[5]), intern(row[6]), intern(row[7]), int(row[8]), int(row[9]), row[10], row[11],
+            int(row[12]), row[13], row[14],
+        )
+    for row in station_rows:
+        access_point = access_points[parse_mac(row[5])]
+        access_point.stations.append(Station(
+            parse_mac(row[0]), parse_timestamp(row[1]), parse_timestamp(row[2]), int(row[3]), int(row[4]),
+            access_point.bssid, row[6],
+        ))
+    return list(access_points.values())
+
+
+def measure(build: t.Callable, *rows) -> int:
+    gc.collect()
+    tracemalloc.start()
+    snapshot = build(*rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del snapshot
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stations', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rows = generate_rows(args.stations)
+    legacy = measure(build_legacy, *rows)
+    compact = measure(build_compact, *rows)
+    print(f'{args.stations} stations, {len(rows[0])} access points')
+    print(f'legacy dataclasses: {legacy / 2 ** 20:8.2f} MiB')
+    print(f'compact models:     {compact / 2 ** 20:8.2f} MiB ({compact / legacy:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,451 @@
+"""
+Offline benchmarks of the hot paths against synthetic airodump-ng output.
+
+    python -m benchmarks.run [--sizes 10 100 1000 10000 50000] [--output results.json] [--compare baseline.json]
+
+Every benchmark reports the best wall time of a few runs, the throughput (items per second) and the peak
+memory allocated during one run. With --compare the results are checked against a previous run and the
+command fails when a benchmark got slower than --threshold times its baseline.
+"""
+import argparse
+import json
+import operator
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+import typing as t
+
+from aircrack.adapters import AdapterDiscovery
+from aircrack.airodump import Airodump, CsvIngestor
+from aircrack.capture_index import CaptureIndex
+from aircrack.cowpatty import Cowpatty
+from aircrack.frames import FrameIngestor
+from aircrack.handshake import HandshakeDetector
+from aircrack.metrics import Metrics
+from aircrack.oui import OuiIndex, build_index
+from aircrack.pmk import PmkCache, PmkEngine, derive, read_wordlist
+from benchmarks import synthetic
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 50000]
+SCREEN_SIZE = (200, 60)
+TARGET_BSSID = '00:11:22:33:44:55'
+
+Benchmark = t.Callable[[int, str], t.Tuple[t.Callable[[], t.Any], int]]
+BENCHMARKS: t.Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str):
+    """Registers a setup function returning (function to time, number of items it processes)."""
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Skip(Exception):
+    pass
+
+
+@benchmark('parse_file')
+def parse_file(size: int, workdir: str):
+    path = os.path.join(workdir, 'parse-01.csv')
+    synthetic.write_csv(path, size, size)
+    return lambda: Airodump.parse_file(path), 2 * size
+
+
+@benchmark('parse_file.unchanged')
+def parse_file_unchanged(size: int, workdir: str):
+    path = os.path.join(workdir, 'unchanged-01.csv')
+    synthetic.write_csv(path, size, size)
+    ingestor = CsvIngestor()
+    ingestor.ingest(path)
+    return lambda: ingestor.ingest(path), 2 * size
+
+
+@benchmark('parse_file.incremental')
+def parse_file_incremental(size: int, workdir: str):
+    """Re-ingesting a rewritten CSV, updating the existing models in place."""
+    paths = [os.path.join(workdir, f'incremental-{tick:02d}.csv') for tick in range(2)]
+    for tick, path in enumerate(paths):
+        synthetic.write_csv(path, size, size, tick=tick)
+    ingestor = CsvIngestor()
+    ingestor.ingest(paths[0])
+    state = {'turn': 0}
+
+    def ingest():
+        state['turn'] ^= 1
+        return ingestor.ingest(paths[state['turn']])
+    return ingest, 2 * size
+
+
+@benchmark('get_latest_file')
+def get_latest_file(size: int, workdir: str):
+    directory = os.path.join(workdir, 'captures')
+    os.mkdir(directory)
+    sessions = min(size, 5000)
+    for session in range(1, sessions + 1):
+        for extension in ('.csv', '.cap'):
+            with open(os.path.join(directory, f'wlan0mon-{session:02d}{extension}'), 'w') as file:
+                file.write('x')
+    airodump = types.SimpleNamespace(index=CaptureIndex(directory, 'wlan0mon'))  # without starting airodump-ng
+    return lambda: Airodump.get_latest_file(airodump, '.cap'), 1
+
+
+@benchmark('adapters.sysfs')
+def adapters_sysfs(size: int, workdir: str):
+    """Adapter discovery at startup, against a fake sysfs with up to 16 adapters."""
+    root = os.path.join(workdir, 'sys')
+    adapters = min(size, 16)
+    synthetic.write_sysfs(root, adapters)
+    return lambda: AdapterDiscovery(root).adapters(), adapters
+
+
+@benchmark('oui.build')
+def oui_build(size: int, workdir: str):
+    """Indexing an IEEE OUI list (the real one has ~35000 vendors), done once per OUI list update."""
+    source = os.path.join(workdir, 'oui.txt')
+    synthetic.write_oui(source, size)
+    return lambda: build_index(source, os.path.join(workdir, 'oui.idx')), size
+
+
+@benchmark('oui.lookup')
+def oui_lookup(size: int, workdir: str):
+    """Vendors of `size` distinct MACs against a 35000 vendor index, uncached (memoization cleared each run)."""
+    source, path = os.path.join(workdir, 'oui.txt'), os.path.join(workdir, 'oui.idx')
+    prefixes = synthetic.write_oui(source, 35000)
+    build_index(source, path)
+    index = OuiIndex(path)
+    macs = [prefixes[i % len(prefixes)] << 24 | i for i in range(size)]
+
+    def lookup():
+        index.vendor.cache_clear()
+        for mac in macs:
+            index.vendor(mac)
+    return lookup, size
+
+
+@benchmark('startup.import')
+def startup_import(size: int, workdir: str):
+    """A fresh interpreter importing the TUI module (independent of the size)."""
+    command = [sys.executable, '-c', 'import wifi_snitch']
+    return lambda: subprocess.run(command, check=True, cwd=workdir, env=_python_path()), 1
+
+
+@benchmark('startup.first_frame')
+def startup_first_frame(size: int, workdir: str):
+    """From launching the TUI until the adapter screen is drawn, with 4 adapters in a fake sysfs."""
+    root = os.path.join(workdir, 'sys')
+    synthetic.write_sysfs(root, 4)
+    command = [sys.executable, '-m', 'benchmarks.first_frame', root]
+    return lambda: subprocess.run(command, check=True, cwd=workdir, env=_python_path()), 1
+
+
+@benchmark('sort.power_human')
+def sort_power_human(size: int, workdir: str):
+    access_points = _access_points(size, workdir)
+    return lambda: sorted(access_points, key=operator.attrgetter('power_human'), reverse=True), size
+
+
+@benchmark('update_list_widget')
+def update_list_widget(size: int, workdir: str):
+    """A refresh tick: 10% of the APs changed power, the list is updated and drawn on a fake screen."""
+    try:
+        import urwid
+        from wifi_snitch import SelectableListView
+    except ImportError as e:
+        raise Skip(f'urwid is not installed ({e})')
+
+    class FakeScreen(urwid.BaseScreen):
+        def draw_screen(self, size, canvas):
+            for row in canvas.content():
+                for _ in row:
+                    pass
+
+    access_points = _access_points(size, workdir)
+    view = SelectableListView(
+        None,
+        elements=access_points,
+        title='Benchmark',
+        columns=['BSSID', 'ESSID', 'Channel', 'Stations', 'Power', 'Privacy'],
+        fields=['bssid_human', 'essid', 'channel', 'num_stations', 'power_human', 'privacy'],
+        key='bssid',
+        sort_by='power',
+    )
+    screen = FakeScreen()
+    state = {'tick': 0}
+
+    def tick():
+        state['tick'] += 1
+        for access_point in access_points[state['tick'] % 10::10]:
+            access_point.power = -20 - (access_point.power + state['tick']) % 75
+        view.update_list_widget()
+        screen.draw_screen(SCREEN_SIZE, view.render(SCREEN_SIZE, focus=True))
+    return tick, size
+
+
+@benchmark('search.keystroke')
+def search_keystroke(size: int, workdir: str):
+    """Typing `wpa2 ch:1..6 net` into the filter bar of the network list, one query per keystroke."""
+    walker, _ = _searchable_walker(size, workdir)
+    text = 'wpa2 ch:1..6 net'
+    queries = [walker.search.parse(text[:end]) for end in range(1, len(text) + 1)]
+
+    def type_query():
+        for query in queries:
+            walker.set_query(query)
+        walker.set_query(())
+    return type_query, len(queries)
+
+
+@benchmark('search.tick')
+def search_tick(size: int, workdir: str):
+    """A refresh tick with a filter on: 10% of the APs changed power, the rest is unchanged."""
+    walker, access_points = _searchable_walker(size, workdir)
+    walker.set_query(walker.search.parse('power:40.. net'))
+    state = {'tick': 0}
+
+    def tick():
+        state['tick'] += 1
+        for access_point in access_points[state['tick'] % 10::10]:
+            access_point.power = -20 - (access_point.power + state['tick']) % 75
+        walker.update(access_points)
+    return tick, size
+
+
+def _searchable_walker(size: int, workdir: str):
+    try:
+        from wifi_snitch import access_point_search
+        from urwid_components.keyed_list import KeyedListWalker
+    except ImportError as e:
+        raise Skip(f'urwid is not installed ({e})')
+    access_points = _access_points(size, workdir)
+    walker = KeyedListWalker(
+        ['BSSID', 'ESSID'], ['bssid_human', 'essid'], key='bssid', on_select=lambda *args: None, sort_by='power',
+        search=access_point_search(),
+    )
+    walker.update(access_points)
+    return walker, access_points
+
+
+@benchmark('metrics.disabled')
+def metrics_disabled(size: int, workdir: str):
+    """The cost instrumentation adds to a hot path while the HUD is off."""
+    return _timer_spans(Metrics(), size), size
+
+
+@benchmark('metrics.enabled')
+def metrics_enabled(size: int, workdir: str):
+    metrics = Metrics()
+    metrics.enabled = True
+    return _timer_spans(metrics, size), size
+
+
+def _timer_spans(metrics: Metrics, count: int) -> t.Callable[[], None]:
+    def spans():
+        for _ in range(count):
+            with metrics.timer('benchmark'):
+                pass
+    return spans
+
+
+@benchmark('handshake.cold')
+def handshake_cold(size: int, workdir: str):
+    path = os.path.join(workdir, 'cold-01.cap')
+    synthetic.write_cap(path, size, TARGET_BSSID, handshake=True)
+    return lambda: HandshakeDetector(TARGET_BSSID).contains_valid_handshake(path), size
+
+
+@benchmark('handshake.incremental')
+def handshake_incremental(size: int, workdir: str):
+    """A tick on a growing capture: 100 new frames appended to `size` already scanned ones."""
+    path = os.path.join(workdir, 'incremental-01.cap')
+    synthetic.write_cap(path, size, TARGET_BSSID)
+    detector = HandshakeDetector(TARGET_BSSID)
+    detector.contains_valid_handshake(path)
+    records = b''.join(synthetic.pcap_record(frame) for frame in synthetic.capture_frames(100, TARGET_BSSID))
+
+    def tick():
+        with open(path, 'ab') as file:
+            file.write(records)
+        return detector.contains_valid_handshake(path)
+    return tick, 100
+
+
+@benchmark('frames.ingest')
+def frames_ingest(size: int, workdir: str):
+    """Frames per second of the live parser over a radiotap capture of beacons and data frames."""
+    path = os.path.join(workdir, 'frames-01.cap')
+    synthetic.write_cap(path, size, TARGET_BSSID, radiotap=True)
+    return lambda: FrameIngestor().ingest_file(path), size
+
+
+@benchmark('frames.tick')
+def frames_tick(size: int, workdir: str):
+    """A poll on a growing capture: 100 new frames appended to `size` already ingested ones."""
+    path = os.path.join(workdir, 'frames-tick-01.cap')
+    synthetic.write_cap(path, size, TARGET_BSSID, radiotap=True)
+    ingestor = FrameIngestor()
+    ingestor.ingest_file(path)
+    records = b''.join(
+        synthetic.pcap_record(synthetic.radiotap_header(-50) + frame)
+        for frame in synthetic.capture_frames(100, TARGET_BSSID)
+    )
+
+    def tick():
+        with open(path, 'ab') as file:
+            file.write(records)
+        return ingestor.ingest_file(path)
+    return tick, 100
+
+
+@benchmark('pmk.derive')
+def pmk_derive(size: int, workdir: str):
+    """Passphrases per second on one core, a PBKDF2 is milliseconds so only a hundredth of the size is derived."""
+    path = os.path.join(workdir, 'wordlist.txt')
+    synthetic.write_wordlist(path, max(size // 100, 8))
+    engine = PmkEngine(processes=1)
+    return _derive_all(engine, path), max(size // 100, 8)
+
+
+@benchmark('pmk.derive.pool')
+def pmk_derive_pool(size: int, workdir: str):
+    """Like pmk.derive on every core, the throughput is per core: it stays flat as long as the pool scales."""
+    path = os.path.join(workdir, 'wordlist.txt')
+    passphrases = max(size // 100, 8) * (os.cpu_count() or 1)
+    synthetic.write_wordlist(path, passphrases)
+    engine = PmkEngine(chunk_size=max(passphrases // (os.cpu_count() or 1) // 4, 1))
+    return _derive_all(engine, path), passphrases / engine.processes
+
+
+def _derive_all(engine: PmkEngine, wordlist: str) -> t.Callable[[], int]:
+    return lambda: sum(1 for _ in engine.derive(b'target', read_wordlist(wordlist)))
+
+
+@benchmark('pmk.cached')
+def pmk_cached(size: int, workdir: str):
+    """A handshake checked against `size` cached PMKs of its ESSID, the passphrase being the last one."""
+    capture = os.path.join(workdir, 'pmk-01.cap')
+    synthetic.write_cap(capture, 100, TARGET_BSSID, handshake=True, essid='target', passphrase='correct horse')
+    detector = HandshakeDetector(TARGET_BSSID)
+    detector.contains_valid_handshake(capture)
+    with PmkCache(b'target', os.path.join(workdir, 'pmk')) as cache:
+        for i, passphrase in enumerate(synthetic.write_wordlist(os.path.join(workdir, 'wordlist.txt'), size - 1)):
+            cache.add(passphrase, i.to_bytes(32, 'big'))
+        cache.add(b'correct horse', derive(b'correct horse', b'target'))
+    engine = PmkEngine(processes=1)
+
+    def crack():
+        with PmkCache(b'target', os.path.join(workdir, 'pmk')) as cache:
+            assert engine.crack(detector.handshake, cache, []) == b'correct horse'
+    return crack, size
+
+
+@benchmark('cowpatty.contains_valid_handshake')
+def cowpatty(size: int, workdir: str):
+    if shutil.which('cowpatty') is None:
+        raise Skip('cowpatty is not installed')
+    path = os.path.join(workdir, 'cowpatty-01.cap')
+    synthetic.write_cap(path, size, TARGET_BSSID, handshake=True)
+    return lambda: Cowpatty.contains_valid_handshake(path), size
+
+
+def _python_path() -> t.Dict[str, str]:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')]))}
+
+
+def _access_points(size: int, workdir: str):
+    path = os.path.join(workdir, f'models-{size}.csv')
+    synthetic.write_csv(path, size, size)
+    return Airodump.parse_file(path)
+
+
+def measure(function: t.Callable[[], t.Any], repeat: int) -> t.Tuple[float, int]:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(names: t.Iterable[str], sizes: t.Iterable[int], repeat: int) -> t.List[t.Dict[str, t.Any]]:
+    results = []
+    for name in names:
+        for size in sizes:
+            with tempfile.TemporaryDirectory(prefix='snitch-bench-') as workdir:
+                try:
+                    function, items = BENCHMARKS[name](size, workdir)
+                except Skip as e:
+                    print(f'{name:36} {size:>7}  skipped: {e}', file=sys.stderr)
+                    break
+                seconds, peak = measure(function, repeat)
+            result = {
+                'name': name,
+                'size': size,
+                'seconds': seconds,
+                'throughput': items / seconds if seconds else None,
+                'peak_bytes': peak,
+            }
+            results.append(result)
+            print(
+                f'{name:36} {size:>7}  {seconds * 1000:10.3f} ms  {result["throughput"] or 0:14,.0f} items/s  '
+                f'{peak / 2 ** 20:8.2f} MiB peak',
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(results: t.List[t.Dict[str, t.Any]], baseline_path: str, threshold: float) -> bool:
+    with open(baseline_path) as file:
+        baseline = {(result['name'], result['size']): result for result in json.load(file)['results']}
+    ok = True
+    for result in results:
+        previous = baseline.get((result['name'], result['size']))
+        if previous is None:
+            continue
+        ratio = result['seconds'] / previous['seconds'] if previous['seconds'] else 1
+        if ratio > threshold:
+            ok = False
+            print(f'REGRESSION {result["name"]} [{result["size"]}]: {ratio:.2f}x slower', file=sys.stderr)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--compare', help='results of a previous run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run(args.only, args.sizes, args.repeat)
+    report = {
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Synthetic airodump-ng output: CSVs with any number of APs/stations and pcap captures with or without a handshake,
+a fake sysfs tree with wireless adapters and an IEEE OUI list.
+"""
+import hashlib
+import hmac
+import os
+import random
+import struct
+import typing as t
+
+PRIVACY = [('WPA2', 'CCMP', 'PSK'), ('WPA2 WPA', 'CCMP TKIP', 'PSK'), ('WPA2', 'CCMP', 'MGT'), ('OPN', '', '')]
+ACCESS_POINT_HEADER = (
+    'BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, '
+    'LAN IP, ID-length, ESSID, Key'
+)
+STATION_HEADER = 'Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs'
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+LLC_SNAP_EAPOL = b'\xaa\xaa\x03\x00\x00\x00\x88\x8e'
+
+
+def mac(rng: random.Random) -> str:
+    return ':'.join(f'{rng.randrange(256):02X}' for _ in range(6))
+
+
+def timestamp(rng: random.Random) -> str:
+    return f'2024-05-01 12:{rng.randrange(60):02d}:{rng.randrange(60):02d}'
+
+
+def access_point_rows(count: int, seed: int = 0) -> t.List[t.List[str]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        privacy, cipher, authentication = rng.choice(PRIVACY)
+        essid = f'network-{i}'
+        rows.append([
+            mac(rng), timestamp(rng), timestamp(rng), f'{rng.randrange(1, 14):2d}', ' 54', privacy, cipher,
+            authentication, f'{-rng.randrange(20, 95):3d}', f'{rng.randrange(10000):8d}', f'{0:8d}',
+            '  0.  0.  0.  0', f'{len(essid):3d}', essid, '',
+        ])
+    return rows
+
+
+def station_rows(count: int, bssids: t.Sequence[str], seed: int = 0) -> t.List[t.List[str]]:
+    rng = random.Random(seed + 1)
+    return [
+        [
+            mac(rng), timestamp(rng), timestamp(rng), f'{-rng.randrange(20, 95):3d}', f'{rng.randrange(10000):8d}',
+            rng.choice(bssids) if rng.random() < 0.8 else '(not associated) ', rng.choice(['', 'home', 'work,cafe']),
+        ]
+        for _ in range(count)
+    ]
+
+
+def write_csv(path: str, access_points: int, stations: int, seed: int = 0, tick: int = 0):
+    """
+    Writes an airodump-ng style CSV (CRLF lines, ', ' separated, trailing separators).
+    The same seed always produces the same devices, `tick` only moves their power readings.
+    """
+    aps = access_point_rows(access_points, seed)
+    stas = station_rows(stations, [row[0] for row in aps] or ['(not associated) '], seed)
+    if tick:
+        for rows, column in ((aps, 8), (stas, 3)):
+            for i, row in enumerate(rows):
+                row[column] = f'{-20 - (int(row[column]) + i * tick) % 75:3d}'
+    with open(path, 'w', newline='') as file:
+        file.write('\r\n' + ACCESS_POINT_HEADER + '\r\n')
+        for row in aps:
+            file.write(', '.join(row) + ', \r\n')
+        file.write('\r\n' + STATION_HEADER + '\r\n')
+        for row in stas:
+            file.write(', '.join(row) + '\r\n')
+        file.write('\r\n')
+
+
+def mac_bytes(address: str) -> bytes:
+    return bytes.fromhex(address.replace(':', ''))
+
+
+def beacon(bssid: bytes, essid: str, channel: int) -> bytes:
+    header = b'\x80\x00\x00\x00' + b'\xff' * 6 + bssid + bssid + b'\x00\x00'
+    fixed = bytes(8) + struct.pack('<HH', 100, 0x0411)
+    ssid = essid.encode()
+    return header + fixed + bytes([0, len(ssid)]) + ssid + bytes([3, 1, channel])
+
+
+def probe_response(bssid: bytes, station: bytes, essid: str, channel: int) -> bytes:
+    return b'\x50\x00\x00\x00' + station + beacon(bssid, essid, channel)[10:]
+
+
+def probe_request(station: bytes, essid: str) -> bytes:
+    ssid = essid.encode()
+    return b'\x40\x00\x00\x00' + b'\xff' * 6 + station + b'\xff' * 6 + b'\x00\x00' + bytes([0, len(ssid)]) + ssid
+
+
+def data(bssid: bytes, station: bytes, payload: bytes, from_ap: bool, protected: bool = True) -> bytes:
+    flags = (0x02 if from_ap else 0x01) | (0x40 if protected else 0)
+    addresses = station + bssid + bssid if from_ap else bssid + station + bssid
+    return bytes([0x08, flags, 0, 0]) + addresses + b'\x00\x00' + payload
+
+
+def eapol_key(key_info: int, replay_counter: int, nonce: bytes, mic: bytes = bytes(16)) -> bytes:
+    body = struct.pack('>BHHQ', 2, key_info, 16, replay_counter) + nonce + bytes(32) + mic + struct.pack('>H', 0)
+    return struct.pack('>BBH', 1, 3, len(body)) + body
+
+
+def handshake_frames(bssid: bytes, station: bytes, seed: int = 0, pmk: t.Optional[bytes] = None) -> t.List[bytes]:
+    """
+    M1-M4 of a WPA2 4-way handshake. The MICs are random, good enough for detection, unless the PMK is given:
+    then M2's MIC is the real one and the handshake can be cracked.
+    """
+    rng = random.Random(seed)
+    anonce, snonce = rng.randbytes(32), rng.randbytes(32)
+    mic = rng.randbytes(16)
+    if pmk is not None:
+        addresses = min(bssid, station) + max(bssid, station) + min(anonce, snonce) + max(anonce, snonce)
+        kck = hmac.digest(pmk, b'Pairwise key expansion\x00' + addresses + b'\x00', 'sha1')[:16]
+        mic = hmac.digest(kck, eapol_key(0x010a, 1, snonce), 'sha1')[:16]
+    return [
+        data(bssid, station, LLC_SNAP_EAPOL + eapol_key(0x008a, 1, anonce), True, False),
+        data(bssid, station, LLC_SNAP_EAPOL + eapol_key(0x010a, 1, snonce, mic), False, False),
+        data(bssid, station, LLC_SNAP_EAPOL + eapol_key(0x13ca, 2, anonce, rng.randbytes(16)), True, False),
+        data(bssid, station, LLC_SNAP_EAPOL + eapol_key(0x030a, 2, bytes(32), rng.randbytes(16)), False, False),
+    ]
+
+
+def pcap_header(linktype: int = LINKTYPE_IEEE802_11) -> bytes:
+    return struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, linktype)
+
+
+def pcap_record(frame: bytes, seconds: int = 0, microseconds: int = 0) -> bytes:
+    return struct.pack('<IIII', seconds, microseconds, len(frame), len(frame)) + frame
+
+
+def capture_frames(
+        frames: int,
+        bssid: str,
+        essid: str = 'target',
+        channel: int = 6,
+        handshake: bool = False,
+        seed: int = 0,
+        passphrase: t.Optional[str] = None,
+) -> t.Iterator[bytes]:
+    """
+    Beacons and encrypted data frames for the BSSID, with a handshake in the middle when asked for
+    (a crackable one when the passphrase is given).
+    """
+    rng = random.Random(seed)
+    bssid_bytes = mac_bytes(bssid)
+    stations = [rng.randbytes(6) for _ in range(8)]
+    handshake_at = frames // 2 if handshake else -1
+    pmk = None if passphrase is None else hashlib.pbkdf2_hmac('sha1', passphrase.encode(), essid.encode(), 4096, 32)
+    for i in range(frames):
+        if i == handshake_at:
+            yield from handshake_frames(bssid_bytes, stations[0], seed, pmk)
+        if i % 10 == 0:
+            yield beacon(bssid_bytes, essid, channel)
+        else:
+            yield data(bssid_bytes, rng.choice(stations), rng.randbytes(rng.randrange(40, 1400)), rng.random() < 0.5)
+
+
+def radiotap_header(signal: int) -> bytes:
+    """Radiotap with the flags, rate, channel and dBm antenna signal fields, as monitor mode drivers write it."""
+    fields = struct.pack('<BBHHb', 0, 2, 2437, 0x00a0, signal)  # flags, rate, channel (2437 MHz, 2.4 GHz OFDM), signal
+    present = 1 << 1 | 1 << 2 | 1 << 3 | 1 << 5
+    return struct.pack('<BBHI', 0, 0, 8 + len(fields), present) + fields
+
+
+def write_cap(
+        path: str, frames: int, bssid: str, handshake: bool = False, seed: int = 0, radiotap: bool = False, **kwargs
+):
+    rng = random.Random(seed)
+    with open(path, 'wb') as file:
+        file.write(pcap_header(LINKTYPE_IEEE802_11_RADIOTAP if radiotap else LINKTYPE_IEEE802_11))
+        for i, frame in enumerate(capture_frames(frames, bssid, handshake=handshake, seed=seed, **kwargs)):
+            if radiotap:
+                frame = radiotap_header(-rng.randrange(30, 90)) + frame
+            file.write(pcap_record(frame, 1714564800 + i // 1000, i % 1000 * 1000))
+
+
+def write_sysfs(root: str, adapters: int, monitor: bool = True):
+    """USB adapters as the kernel lays them out under /sys: class/net and class/ieee80211 link into devices."""
+    os.makedirs(os.path.join(root, 'class', 'net'))
+    os.makedirs(os.path.join(root, 'bus', 'usb', 'drivers', 'ath9k_htc'))
+    for number in range(adapters):
+        phy = f'phy{number}'
+        os.makedirs(os.path.join(root, 'class', 'ieee80211', phy))
+        with open(os.path.join(root, 'class', 'ieee80211', phy, 'name'), 'w') as file:
+            file.write(f'{phy}\n')
+        usb = os.path.join(root, 'devices', 'usb1', f'1-{number}')
+        device = os.path.join(usb, f'1-{number}:1.0')
+        os.makedirs(device)
+        with open(os.path.join(usb, 'product'), 'w') as file:
+            file.write('Atheros AR9271\n')
+        os.symlink(os.path.relpath(os.path.join(root, 'bus', 'usb', 'drivers', 'ath9k_htc'), device), os.path.join(device, 'driver'))
+        add_sysfs_interface(root, number, f'wlan{number}mon' if monitor else f'wlan{number}', monitor)
+
+
+def add_sysfs_interface(root: str, adapter: int, interface: str, monitor: bool = True):
+    """Another interface of an adapter written by `write_sysfs`, like the monitor vif `airmon-ng start` adds."""
+    phy = f'phy{adapter}'
+    device = os.path.join(root, 'devices', 'usb1', f'1-{adapter}', f'1-{adapter}:1.0')
+    net = os.path.join(device, 'net', interface)
+    os.makedirs(net)
+    with open(os.path.join(net, 'type'), 'w') as file:
+        file.write('803\n' if monitor else '1\n')
+    os.symlink('../..', os.path.join(net, 'device'))
+    os.symlink(os.path.relpath(os.path.join(root, 'class', 'ieee80211', phy), net), os.path.join(net, 'phy80211'))
+    os.symlink(os.path.relpath(net, os.path.join(root, 'class', 'net')), os.path.join(root, 'class', 'net', interface))
+
+
+def write_oui(path: str, vendors: int, seed: int = 0) -> t.List[int]:
+    """An IEEE oui.txt with `vendors` distinct, globally administered prefixes."""
+    rng = random.Random(seed)
+    # 6 bits of the first octet, its low two (the locally administered and multicast bits) left clear
+    prefixes = [number >> 16 << 18 | number & 0xffff for number in rng.sample(range(1 << 22), vendors)]
+    with open(path, 'w') as file:
+        file.write('OUI/MA-L                                                    Organization\n')
+        for prefix in prefixes:
+            file.write(f'{prefix >> 16:02X}-{prefix >> 8 & 0xff:02X}-{prefix & 0xff:02X}   (hex)\t\tVendor {prefix:06X}, Inc.\n')
+            file.write(f'{prefix:06X}     (base 16)\t\tVendor {prefix:06X}, Inc.\n\n')
+    return prefixes
+
+
+def write_wordlist(path: str, passphrases: int, seed: int = 0) -> t.List[bytes]:
+    """Random WPA passphrases (8 to 20 characters), one per line."""
+    rng = random.Random(seed)
+    alphabet = 'abcdefghijklmnopqrstuvwxyz0123456789'
+    words = [''.join(rng.choices(alphabet, k=rng.randrange(8, 21))).encode() for _ in range(passphrases)]
+    with open(path, 'wb') as file:
+        file.write(b'\n'.join(words) + b'\n')
+    return words
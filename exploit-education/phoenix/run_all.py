@@ -0,0 +1,193 @@
+#!/bin/python3
+"""
+Runs every level solver (`stack0.py`, ...) against its binary and reports which levels are solved.
+
+    ./run_all.py [--timeout 10] [--jobs N] [--json results.json] [--junit results.xml] [stack0 stack3 ...]
+
+The binaries are rebuilt with `make` first, only the ones older than their source. The solvers run concurrently
+in a process pool, each in its own process group with its output captured, and a solver still running after
+`--timeout` seconds is killed together with the binary it started. A level is solved when the binary printed one
+of its success banners or, for a binary without any (stack5 only spawns a shell), what its solver makes it print.
+Levels with neither are skipped.
+"""
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+import typing as t
+import xml.etree.ElementTree as ElementTree
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SUCCESS = re.compile(r'Well done|Congratulations')
+# levels whose binary prints no banner, solved when the output matches what their solver has it print instead
+CHECKS: t.Dict[str, t.Pattern[str]] = {
+    'stack5': re.compile(r'^stack5 shell$', re.MULTILINE),  # echoed by the shell the payload spawns
+}
+DEFAULT_TIMEOUT = 10
+KILL_TIMEOUT = 1
+
+
+@dataclasses.dataclass(slots=True)
+class LevelResult:
+    level: str
+    status: str  # 'solved', 'failed', 'timeout' or 'skipped'
+    seconds: float = 0
+    returncode: t.Optional[int] = None
+    output: str = ''
+    message: str = ''
+
+    @property
+    def solved(self) -> bool:
+        return self.status == 'solved'
+
+
+def levels() -> t.List[str]:
+    return sorted(name[:-2] for name in os.listdir(DIRECTORY) if name.endswith('.c'))
+
+
+def stale(names: t.Iterable[str]) -> t.List[str]:
+    """The levels whose binary is missing or older than its source."""
+    result = []
+    for name in names:
+        binary = os.path.join(DIRECTORY, name)
+        if not os.path.exists(binary) or os.path.getmtime(binary) < os.path.getmtime(f'{binary}.c'):
+            result.append(name)
+    return result
+
+
+def build(names: t.Iterable[str]) -> t.Optional[str]:
+    """Rebuilds the stale binaries, returns make's output when it failed."""
+    targets = stale(names)
+    if not targets:
+        return None
+    process = subprocess.run(
+        ['make', *targets], cwd=DIRECTORY, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    return process.stdout if process.returncode else None
+
+
+def success_check(level: str) -> t.Optional[t.Pattern[str]]:
+    """What the output of the solved level matches, None when its binary has no success banner to look for."""
+    if level in CHECKS:
+        return CHECKS[level]
+    with open(os.path.join(DIRECTORY, f'{level}.c')) as file:
+        return SUCCESS if SUCCESS.search(file.read()) else None
+
+
+def run_level(level: str, timeout: float, success: t.Pattern[str] = SUCCESS) -> LevelResult:
+    """Runs in the pool: the solver, and the binary it starts, in a new process group killed on timeout."""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, f'{level}.py'],
+        cwd=DIRECTORY,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        start_new_session=True,
+    )
+    try:
+        output, _ = process.communicate(timeout=timeout)
+        status = 'solved' if success.search(output.decode(errors='replace')) else 'failed'
+        message = '' if status == 'solved' else f'no match for {success.pattern!r}'
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        try:
+            output, _ = process.communicate(timeout=KILL_TIMEOUT)
+        except subprocess.TimeoutExpired:  # a grandchild outside the group still holds the pipe
+            output = b''
+        status, message = 'timeout', f'still running after {timeout}s'
+    return LevelResult(
+        level=level,
+        status=status,
+        seconds=time.perf_counter() - start,
+        returncode=process.returncode,
+        output=output.decode(errors='replace'),
+        message=message,
+    )
+
+
+def run(names: t.Sequence[str], timeout: float, jobs: t.Optional[int] = None) -> t.List[LevelResult]:
+    results, checks = {}, {}
+    for name in names:
+        if not os.path.exists(os.path.join(DIRECTORY, f'{name}.py')):
+            results[name] = LevelResult(name, 'skipped', message='no solver')
+            continue
+        check = success_check(name)
+        if check is None:
+            results[name] = LevelResult(name, 'skipped', message='no success check')
+        else:
+            checks[name] = check
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(run_level, name, timeout, check): name for name, check in checks.items()}
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            results[result.level] = result
+            print(f'{result.level:8} {result.status:8} {result.seconds:6.2f}s  {result.message}', file=sys.stderr)
+    return [results[name] for name in names]
+
+
+def write_json(results: t.List[LevelResult], path: str):
+    with open(path, 'w') as file:
+        json.dump({'timestamp': time.time(), 'results': [dataclasses.asdict(result) for result in results]}, file, indent=2)
+
+
+def write_junit(results: t.List[LevelResult], path: str):
+    suite = ElementTree.Element(
+        'testsuite',
+        name='phoenix',
+        tests=str(len(results)),
+        failures=str(sum(result.status == 'failed' for result in results)),
+        errors=str(sum(result.status == 'timeout' for result in results)),
+        skipped=str(sum(result.status == 'skipped' for result in results)),
+        time=f'{sum(result.seconds for result in results):.3f}',
+    )
+    for result in results:
+        case = ElementTree.SubElement(suite, 'testcase', classname='phoenix', name=result.level, time=f'{result.seconds:.3f}')
+        if result.status == 'failed':
+            ElementTree.SubElement(case, 'failure', message=result.message)
+        elif result.status == 'timeout':
+            ElementTree.SubElement(case, 'error', message=result.message)
+        elif result.status == 'skipped':
+            ElementTree.SubElement(case, 'skipped', message=result.message)
+        if result.output:
+            ElementTree.SubElement(case, 'system-out').text = result.output
+    ElementTree.ElementTree(suite).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('levels', nargs='*', help='all of them by default')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds per level')
+    parser.add_argument('--jobs', type=int, help='solvers run at once, one per core by default')
+    parser.add_argument('--json', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--junit', metavar='PATH', help='write the results as a JUnit XML report')
+    args = parser.parse_args()
+
+    names = args.levels or levels()
+    unknown = set(names) - set(levels())
+    if unknown:
+        sys.exit(f'Unknown levels: {", ".join(sorted(unknown))}')
+    error = build(names)
+    if error is not None:
+        sys.exit(f'make failed:\n{error}')
+
+    start = time.perf_counter()
+    results = run(names, args.timeout, args.jobs)
+    solved = sum(result.solved for result in results)
+    print(f'{solved}/{len(results)} levels solved in {time.perf_counter() - start:.2f}s', file=sys.stderr)
+    if args.json:
+        write_json(results, args.json)
+    if args.junit:
+        write_junit(results, args.junit)
+    if any(result.status in ('failed', 'timeout') for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
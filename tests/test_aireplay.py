@@ -0,0 +1,75 @@
+import asyncio
+import sys
+
+from aircrack.aireplay import Aireplay
+from aircrack.models import Station, WifiAdapter, parse_mac
+
+ADAPTER = WifiAdapter('phy0', 'wlan0mon', 'ath9k_htc', 'Atheros AR9271', monitor=True)
+STATION = Station(parse_mac('66:77:88:99:AA:BB'), 0, 0, -40, 10, parse_mac('00:11:22:33:44:55'), '')
+# one round per --deauth count, the ACK counts redrawn after a \r like aireplay-ng does
+FAKE_AIREPLAY = f'''#!{sys.executable}
+import os, sys, time
+for _ in range(int(sys.argv[3])):
+    print('12:00:00  Sending 64 directed DeAuth (code 7). STMAC: [66:77:88:99:AA:BB] [ 0| 0 ACKs]', end='', flush=True)
+    time.sleep(float(os.environ.get('FAKE_DELAY', 0)))
+    print('\\r12:00:00  Sending 64 directed DeAuth (code 7). STMAC: [66:77:88:99:AA:BB] [12|57 ACKs]', flush=True)
+'''
+
+
+def run(aireplay: Aireplay, cancel_after=None):
+    async def main():
+        task = asyncio.ensure_future(aireplay.run())
+        if cancel_after is not None:
+            await asyncio.sleep(cancel_after)
+            aireplay.cancel()
+        return await task
+    return asyncio.run(main())
+
+
+def test_progress(fake_tool):
+    fake_tool('aireplay-ng', FAKE_AIREPLAY)
+    updates = []
+    aireplay = Aireplay(ADAPTER, STATION, 3, on_progress=lambda progress: updates.append(progress.totals))
+
+    progress = run(aireplay)
+
+    assert progress.returncode == 0 and not progress.cancelled and not progress.timed_out
+    assert progress.rounds == 3
+    assert progress.totals == (192, 36, 171)
+    assert updates[0] == (64, 0, 0)  # the running round, before its ACKs came in
+    assert updates == sorted(updates) and updates[-1] == (192, 36, 171)
+
+
+def test_cancel_while_running(fake_tool, monkeypatch):
+    fake_tool('aireplay-ng', FAKE_AIREPLAY)
+    monkeypatch.setenv('FAKE_DELAY', '5')
+    aireplay = Aireplay(ADAPTER, STATION, 3)
+
+    progress = run(aireplay, cancel_after=0.5)
+
+    assert progress.cancelled and progress.done
+    assert progress.rounds == 0
+    assert aireplay.process.returncode is not None
+
+
+def test_cancel_before_run(fake_tool, monkeypatch):
+    fake_tool('aireplay-ng', FAKE_AIREPLAY)
+    monkeypatch.setenv('FAKE_DELAY', '5')
+    aireplay = Aireplay(ADAPTER, STATION, 3)
+    aireplay.cancel()
+
+    progress = asyncio.run(asyncio.wait_for(aireplay.run(), 3))
+
+    assert progress.cancelled and progress.done
+    assert progress.rounds == 0
+
+
+def test_timeout(fake_tool, monkeypatch):
+    fake_tool('aireplay-ng', FAKE_AIREPLAY)
+    monkeypatch.setenv('FAKE_DELAY', '5')
+    aireplay = Aireplay(ADAPTER, STATION, 3, timeout=0.5)
+
+    progress = run(aireplay)
+
+    assert progress.timed_out and progress.done and not progress.cancelled
+    assert progress.totals == (64, 0, 0)
@@ -0,0 +1,34 @@
+from aircrack.airodump import CsvIngestor, ParseStatus
+from benchmarks import synthetic
+
+
+def test_ingest_links_stations_to_their_access_points(tmp_path):
+    path = tmp_path / 'capture-01.csv'
+    synthetic.write_csv(path, 20, 40)
+    ingestor = CsvIngestor()
+
+    assert ingestor.ingest(str(path)) is ParseStatus.UPDATED
+    assert len(ingestor.access_points) == 20
+    for access_point in ingestor.access_points.values():
+        assert all(station.bssid == access_point.bssid for station in access_point.stations)
+    linked = sum(len(access_point.stations) for access_point in ingestor.access_points.values())
+    assert linked == len(ingestor.stations) > 0
+
+
+def test_incomplete_rewrite_leaves_the_station_lists_alone(tmp_path):
+    path = tmp_path / 'capture-01.csv'
+    synthetic.write_csv(path, 20, 40)
+    ingestor = CsvIngestor()
+    ingestor.ingest(str(path))
+    before = {bssid: list(access_point.stations) for bssid, access_point in ingestor.access_points.items()}
+
+    # airodump-ng is halfway through rewriting the file: the 20th station row is cut in its first timestamp
+    text = path.read_bytes()
+    stations = text.index(b'Station MAC')
+    row = stations
+    for _ in range(21):
+        row = text.index(b'\r\n', row) + 2
+    path.write_bytes(text[:row + len('00:00:00:00:00:00, 2024-')])
+
+    assert ingestor.ingest(str(path)) is ParseStatus.INCOMPLETE
+    assert {bssid: list(access_point.stations) for bssid, access_point in ingestor.access_points.items()} == before
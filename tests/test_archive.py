@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from aircrack.airodump import CsvIngestor
+from aircrack.archive import ScanArchive
+from benchmarks import synthetic
+
+
+@pytest.fixture
+def access_points(tmp_path):
+    path = tmp_path / 'archive-01.csv'
+    synthetic.write_csv(path, 10, 20)
+    ingestor = CsvIngestor()
+    ingestor.ingest(str(path))
+    return list(ingestor.access_points.values())
+
+
+def test_recorded_sightings_can_be_queried(tmp_path, access_points):
+    archive = ScanArchive(str(tmp_path / 'archive.sqlite3'))
+    archive.record(access_points, timestamp=1)
+    archive.flush()
+
+    for access_point in access_points:
+        assert archive.last_seen(access_point.bssid) == access_point.last_seen
+        assert archive.access_points(access_point.essid) == [access_point.bssid]
+        assert sorted(archive.stations(access_point.bssid)) == sorted(
+            (station.station_mac, station.last_seen) for station in access_point.stations
+        )
+    archive.close()
+
+
+def test_one_read_connection_per_thread(tmp_path, access_points):
+    archive = ScanArchive(str(tmp_path / 'archive.sqlite3'))
+    archive.record(access_points, timestamp=1)
+    archive.flush()
+
+    for _ in range(100):
+        archive.last_seen(access_points[0].bssid)
+    thread = threading.Thread(target=lambda: archive.last_seen(access_points[0].bssid))
+    thread.start()
+    thread.join()
+    assert len(archive._readers) == 2
+
+    archive.close()
+    assert archive._readers == []
+
+
+def test_writer_errors_are_raised_by_flush(tmp_path, access_points):
+    archive = ScanArchive(str(tmp_path / 'archive.sqlite3'))
+    broken = access_points[0]
+    bssid, broken.bssid = broken.bssid, 1 << 70  # does not fit an SQLite INTEGER
+    archive.record([broken], timestamp=1)
+    with pytest.raises(OverflowError):
+        archive.flush()
+
+    broken.bssid = bssid
+    archive.record(access_points, timestamp=2)
+    archive.flush()  # the writer survived
+    assert archive.last_seen(bssid) == broken.last_seen
+    archive.close()
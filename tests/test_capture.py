@@ -0,0 +1,79 @@
+import time
+
+from aircrack.capture import CaptureCoordinator, partition_channels
+from aircrack.models import parse_mac
+
+FAKE_AIRODUMP = '''#!/bin/sh
+interface=$1
+shift
+while [ $# -gt 0 ]; do
+    case $1 in
+        --write) prefix=$2; shift ;;
+        --channel) channels=$2; shift ;;
+    esac
+    shift
+done
+echo "$channels" > "$prefix.channels"
+cp "$FAKE_CSV_DIR/$interface.csv" "$prefix-01.csv"
+exec sleep 60
+'''
+ACCESS_POINT_HEADER = (
+    'BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, '
+    'LAN IP, ID-length, ESSID, Key'
+)
+STATION_HEADER = 'Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs'
+
+
+def csv(access_points, stations):
+    lines = ['', ACCESS_POINT_HEADER]
+    for bssid, last_seen, channel, power, essid in access_points:
+        lines.append(
+            f'{bssid}, 2024-05-01 12:00:00, 2024-05-01 {last_seen}, {channel:2d},  54, WPA2, CCMP, PSK, {power:3d}, '
+            f'      10,        0,   0.  0.  0.  0, {len(essid):3d}, {essid}, '
+        )
+    lines += ['', STATION_HEADER]
+    for station_mac, last_seen, power, bssid in stations:
+        lines.append(f'{station_mac}, 2024-05-01 12:00:00, 2024-05-01 {last_seen}, {power:3d},       20, {bssid}, ')
+    return '\r\n'.join(lines + ['', ''])
+
+
+def test_views_of_every_adapter_are_merged(tmp_path, monkeypatch, fake_tool):
+    monkeypatch.chdir(tmp_path)
+    fake_tool('airodump-ng', FAKE_AIRODUMP)
+    monkeypatch.setenv('FAKE_CSV_DIR', str(tmp_path))
+    # both radios see the shared AP, wlan1 weaker but more recently
+    (tmp_path / 'wlan0mon.csv').write_text(csv(
+        [('00:11:22:33:44:55', '12:05:00', 1, -40, 'shared'), ('AA:00:00:00:00:01', '12:01:00', 1, -70, 'low')],
+        [('10:00:00:00:00:01', '12:05:00', -50, '00:11:22:33:44:55')],
+    ))
+    (tmp_path / 'wlan1mon.csv').write_text(csv(
+        [('00:11:22:33:44:55', '12:09:00', 6, -80, 'shared'), ('BB:00:00:00:00:02', '12:02:00', 11, -60, 'high')],
+        [('10:00:00:00:00:01', '12:09:00', -75, '00:11:22:33:44:55')],
+    ))
+
+    coordinator = CaptureCoordinator(['wlan0mon', 'wlan1mon'], channels=[1, 6, 11])
+    try:
+        deadline = time.monotonic() + 10
+        access_points = None
+        while time.monotonic() < deadline:
+            access_points = coordinator.fetch() or access_points
+            if access_points and len(access_points) == 3:
+                break
+            time.sleep(0.05)
+    finally:
+        coordinator.stop()
+
+    merged = {access_point.bssid: access_point for access_point in access_points}
+    assert set(merged) == {parse_mac('00:11:22:33:44:55'), parse_mac('AA:00:00:00:00:01'), parse_mac('BB:00:00:00:00:02')}
+    shared = merged[parse_mac('00:11:22:33:44:55')]
+    assert shared.power == -40  # the strongest reading
+    assert shared.channel == 1
+    assert time.strftime('%H:%M:%S', time.localtime(shared.last_seen)) == '12:09:00'  # the freshest one
+    station, = shared.stations
+    assert station.power == -50
+    assert (tmp_path / '.aircrack-ng' / 'wlan0mon.channels').read_text().strip() == '1,11'
+    assert (tmp_path / '.aircrack-ng' / 'wlan1mon.channels').read_text().strip() == '6'
+
+
+def test_channels_are_dealt_round_robin():
+    assert partition_channels([1, 2, 3, 4, 5, 6, 7], 3) == [[1, 4, 7], [2, 5], [3, 6]]
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from aircrack import capture_index
+from aircrack.capture_index import CaptureIndex
+
+
+@pytest.fixture(params=['inotify', 'scandir'])
+def index(request, tmp_path, monkeypatch):
+    if request.param == 'scandir':
+        monkeypatch.setattr(capture_index, '_inotify_watch', lambda dirname: None)
+    index = CaptureIndex(str(tmp_path), 'wlan0mon')
+    if request.param == 'inotify' and index.fileno() is None:
+        pytest.skip('inotify is not available')
+    yield index
+    index.close()
+
+
+def write(path, data=b'data', mode='wb'):
+    time.sleep(0.01)  # directory mtimes are as coarse as the kernel's clock tick, the scandir fallback relies on them
+    with open(path, mode) as file:
+        file.write(data)
+
+
+def test_latest_session(index, tmp_path):
+    assert index.latest() is None
+    write(tmp_path / 'wlan0mon-01.csv')
+    write(tmp_path / 'wlan0mon-01.cap')
+    assert index.refresh()
+    assert index.latest('.cap') == os.path.join(str(tmp_path), 'wlan0mon-01.cap')
+
+    write(tmp_path / 'wlan0mon-02.csv', b'')  # airodump-ng just created it
+    index.refresh()
+    assert index.latest() == os.path.join(str(tmp_path), 'wlan0mon-01.csv')
+    write(tmp_path / 'wlan0mon-02.csv')
+    assert index.refresh()
+    assert index.latest() == os.path.join(str(tmp_path), 'wlan0mon-02.csv')
+
+    time.sleep(0.01)
+    os.remove(tmp_path / 'wlan0mon-02.csv')
+    assert index.refresh()
+    assert index.latest() == os.path.join(str(tmp_path), 'wlan0mon-01.csv')
+
+
+def test_growth_of_the_latest_file_is_a_change(index, tmp_path):
+    write(tmp_path / 'wlan0mon-01.cap')
+    index.refresh()
+    write(tmp_path / 'wlan0mon-01.cap', b'more', mode='ab')
+    assert index.refresh()
+    assert not index.refresh()
+
+
+def test_other_files_are_ignored(index, tmp_path):
+    write(tmp_path / 'wlan1mon-01.csv')
+    write(tmp_path / 'archive.sqlite')
+    assert not index.refresh()
+    assert index.latest() is None
+
+
+def test_wait(index, tmp_path):
+    assert not index.wait(0.1)
+    writer = threading.Timer(0.1, write, [tmp_path / 'wlan0mon-01.csv'])
+    writer.start()
+    try:
+        assert index.wait(5)
+    finally:
+        writer.join()
+
+
+def test_wait_async(index, tmp_path):
+    async def main():
+        assert not await index.wait_async(0.1)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.1, write, tmp_path / 'wlan0mon-01.csv')
+        return await index.wait_async(0.5)  # the scandir fallback sleeps through all of it
+
+    assert asyncio.run(main())
+    assert index.latest() is not None
+
+
+def test_queue_overflow_rescans(tmp_path):
+    index = CaptureIndex(str(tmp_path), 'wlan0mon')
+    if index.fileno() is None:
+        pytest.skip('inotify is not available')
+    try:
+        with open('/proc/sys/fs/inotify/max_queued_events') as file:
+            limit = int(file.read())
+        with open(tmp_path / 'a', 'wb') as a, open(tmp_path / 'b', 'wb') as b:
+            for _ in range(limit // 2 + 1):  # alternating, so the kernel cannot merge them
+                a.write(b'x')
+                a.flush()
+                b.write(b'x')
+                b.flush()
+        (tmp_path / 'wlan0mon-01.csv').write_bytes(b'data')  # its events are lost
+
+        assert index.refresh()
+        assert index.latest() == os.path.join(str(tmp_path), 'wlan0mon-01.csv')
+    finally:
+        index.close()
+
+
+def test_new_only_ignores_earlier_sessions(tmp_path):
+    write(tmp_path / 'wlan0mon-01.csv')
+    index = CaptureIndex(str(tmp_path), 'wlan0mon', new_only=True)
+    try:
+        assert index.latest() is None
+        write(tmp_path / 'wlan0mon-02.csv')
+        index.refresh()
+        assert index.latest() == os.path.join(str(tmp_path), 'wlan0mon-02.csv')
+    finally:
+        index.close()
@@ -0,0 +1,82 @@
+import asyncio
+
+from aircrack.capture_session import CaptureSession
+from aircrack.models import WifiAdapter
+from benchmarks import synthetic
+
+ADAPTER = WifiAdapter('phy0', 'wlan0mon', 'ath9k_htc', 'Atheros AR9271', monitor=True)
+# writes the CSV of the channels it was tuned to, or of every channel while hopping
+FAKE_AIRODUMP = '''#!/bin/sh
+prefix=$3
+channels=${5:-all}
+number=1
+while [ -e "$(printf '%s-%02d.csv' "$prefix" $number)" ]; do number=$((number + 1)); done
+sleep 0.2
+cp "$FAKE_DIR/$channels.csv" "$(printf '%s-%02d.csv' "$prefix" $number)"
+exec sleep 60
+'''
+
+
+def test_restarted_capture_replaces_the_cached_view(tmp_path, monkeypatch, fake_tool):
+    monkeypatch.chdir(tmp_path)
+    fake_tool('airodump-ng', FAKE_AIRODUMP)
+    monkeypatch.setenv('FAKE_DIR', str(tmp_path))
+    synthetic.write_csv(str(tmp_path / 'all.csv'), 5, 3)
+    synthetic.write_csv(str(tmp_path / '6.csv'), 1, 1, seed=1)
+
+    async def first_snapshots(count):
+        views = []
+        async for access_points in session.stream_data(refresh=0.1, min_refresh=0.05):
+            views.append({access_point.bssid for access_point in access_points})
+            if len(views) == count:
+                return views
+
+    session = CaptureSession()
+    session.start([ADAPTER])
+    try:
+        hopping, = asyncio.run(asyncio.wait_for(first_snapshots(1), 10))
+        assert len(hopping) == 5
+
+        session.tune([6])
+        cached, tuned = asyncio.run(asyncio.wait_for(first_snapshots(2), 10))
+    finally:
+        session.stop()
+
+    assert cached == hopping  # shown right away, until the restarted capture has a snapshot
+    assert len(tuned) == 1 and not tuned & hopping
+    assert set(session.access_points) == tuned
+
+
+def test_restarts_do_not_block_the_event_loop(tmp_path, monkeypatch, fake_tool):
+    monkeypatch.chdir(tmp_path)
+    fake_tool('airodump-ng', "#!/bin/sh\ntrap '' TERM\ntouch ignoring\nexec sleep 60\n")  # killed after STOP_TIMEOUT
+
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        await session.start_async([ADAPTER])
+        while not (tmp_path / 'ignoring').exists():
+            await asyncio.sleep(0.01)
+        start = asyncio.get_running_loop().time()
+        tune = asyncio.ensure_future(session.tune_async([6]))
+        await asyncio.sleep(0)
+        await session.ready()  # waits for the restart
+        assert tune.done()
+        ticker.cancel()
+        return ticks, asyncio.get_running_loop().time() - start
+
+    session = CaptureSession()
+    try:
+        ticks, elapsed = asyncio.run(main())
+    finally:
+        session.stop()
+    assert elapsed >= 1  # the old airodump-ng ignored SIGTERM
+    assert ticks >= elapsed / 0.05 / 2
+    assert session.channels == (6,)
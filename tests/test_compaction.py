@@ -0,0 +1,35 @@
+import os
+
+from aircrack import pmk
+from aircrack.compaction import compact
+from aircrack.handshake import HandshakeDetector
+from aircrack.pcap import PcapReader
+from benchmarks import synthetic
+
+BSSID = '00:11:22:33:44:55'
+
+
+def test_compacted_capture_keeps_a_crackable_handshake(tmp_path):
+    source, destination = str(tmp_path / 'target-01.cap'), str(tmp_path / 'target-01.handshake.cap')
+    synthetic.write_cap(source, 2000, BSSID, handshake=True, radiotap=True, essid='target', passphrase='correct horse')
+
+    kept = compact(source, destination, BSSID)
+
+    assert kept == 5  # a beacon and the 4 EAPOL frames
+    assert len(list(PcapReader(destination).read_packets())) == kept
+    assert os.path.getsize(destination) < os.path.getsize(source) / 10
+    assert not os.path.exists(f'{destination}.tmp')
+    detector = HandshakeDetector(BSSID)
+    assert detector.contains_valid_handshake(destination)
+    assert detector.handshake.messages == {1, 2, 3, 4}
+    assert pmk.capture_essid(destination, synthetic.mac_bytes(BSSID)) == b'target'
+    assert pmk.HandshakeCheck(detector.handshake)(pmk.derive(b'correct horse', b'target'))
+
+
+def test_nothing_of_the_target(tmp_path):
+    source, destination = str(tmp_path / 'other-01.cap'), str(tmp_path / 'other-01.handshake.cap')
+    synthetic.write_cap(source, 200, BSSID, handshake=True)
+
+    assert compact(source, destination, 'AA:BB:CC:DD:EE:FF') == 0
+    assert list(PcapReader(destination).read_packets()) == []
+    assert not HandshakeDetector('AA:BB:CC:DD:EE:FF').contains_valid_handshake(destination)
@@ -0,0 +1,189 @@
+import os
+
+from aircrack.airodump import CsvIngestor, ParseStatus
+from aircrack.frames import NO_POWER, FrameIngestor
+from aircrack.models import format_mac, parse_mac
+from benchmarks import synthetic
+
+BSSID = '00:11:22:33:44:55'
+OTHER_BSSID = '00:11:22:33:44:66'
+STATION = '66:77:88:99:AA:BB'
+
+
+def append(path, *frames: bytes, signal=None):
+    """Appends the frames to the capture, with a radiotap header when a signal is given."""
+    if not os.path.exists(path):
+        with open(path, 'wb') as file:
+            file.write(synthetic.pcap_header(
+                synthetic.LINKTYPE_IEEE802_11 if signal is None else synthetic.LINKTYPE_IEEE802_11_RADIOTAP
+            ))
+    with open(path, 'ab') as file:
+        for frame in frames:
+            if signal is not None:
+                frame = synthetic.radiotap_header(signal) + frame
+            file.write(synthetic.pcap_record(frame, 1714564800))
+
+
+def test_capture(tmp_path):
+    path = str(tmp_path / 'capture.cap')
+    synthetic.write_cap(path, 200, BSSID, radiotap=True)
+    ingestor = FrameIngestor()
+    assert ingestor.ingest_file(path)
+
+    assert ingestor.frames == 200
+    access_point, = ingestor.access_points.values()
+    assert (access_point.bssid, access_point.essid, access_point.channel) == (parse_mac(BSSID), 'target', 6)
+    assert access_point.beacons == 20
+    assert -90 < access_point.power <= -30
+    assert 0 < len(access_point.stations) <= 8
+    assert {station.bssid for station in access_point.stations} == {access_point.bssid}
+    assert ingestor.stations.keys() == {station.station_mac for station in access_point.stations}
+
+    assert not ingestor.ingest_file(path)  # nothing appended
+
+
+def test_beacon_creates_and_updates_access_point(tmp_path):
+    path = str(tmp_path / 'capture.cap')
+    bssid = synthetic.mac_bytes(BSSID)
+    ingestor = FrameIngestor()
+    append(path, synthetic.beacon(bssid, 'home', 1), signal=-70)
+    assert ingestor.ingest_file(path)
+    access_point = ingestor.access_points[parse_mac(BSSID)]
+    assert (access_point.essid, access_point.channel, access_point.power, access_point.beacons) == ('home', 1, -70, 1)
+    assert ingestor.discovered_access_points == {access_point.bssid: access_point}
+
+    append(path, synthetic.beacon(bssid, 'home', 1), signal=-50)
+    assert ingestor.ingest_file(path)
+    assert ingestor.access_points[access_point.bssid] is access_point
+    assert (access_point.power, access_point.beacons) == (-50, 2)
+
+    # a probe response is always parsed
+    append(path, synthetic.probe_response(bssid, synthetic.mac_bytes(STATION), 'renamed', 11), signal=-60)
+    assert ingestor.ingest_file(path)
+    assert (access_point.essid, access_point.channel, access_point.power, access_point.beacons) == (
+        'renamed', 11, -60, 2
+    )
+
+
+def test_hidden_essid_is_revealed(tmp_path):
+    path = str(tmp_path / 'capture.cap')
+    bssid = synthetic.mac_bytes(BSSID)
+    ingestor = FrameIngestor()
+    append(path, synthetic.beacon(bssid, '\0' * 6, 6))
+    ingestor.ingest_file(path)
+    access_point = ingestor.access_points[parse_mac(BSSID)]
+    assert (access_point.essid, access_point.id_length, access_point.power) == ('', 6, NO_POWER)
+
+    append(path, synthetic.probe_response(bssid, synthetic.mac_bytes(STATION), 'secret', 6))
+    ingestor.ingest_file(path)
+    assert (access_point.essid, access_point.id_length) == ('secret', 6)
+
+    append(path, synthetic.beacon(bssid, '\0' * 6, 6))
+    ingestor.ingest_file(path)
+    assert access_point.essid == 'secret'
+
+
+def test_data_frames_create_and_move_station(tmp_path):
+    path = str(tmp_path / 'capture.cap')
+    bssid, other_bssid = synthetic.mac_bytes(BSSID), synthetic.mac_bytes(OTHER_BSSID)
+    station_mac = synthetic.mac_bytes(STATION)
+    ingestor = FrameIngestor()
+    append(
+        path,
+        synthetic.data(bssid, station_mac, b'unknown access point', from_ap=False),
+        synthetic.beacon(bssid, 'home', 1),
+        synthetic.beacon(other_bssid, 'home', 6),
+        synthetic.data(bssid, station_mac, b'from the access point', from_ap=True),
+        signal=-40,
+    )
+    ingestor.ingest_file(path)
+    access_point, other = ingestor.access_points[parse_mac(BSSID)], ingestor.access_points[parse_mac(OTHER_BSSID)]
+    station = ingestor.stations[parse_mac(STATION)]
+    assert (station.bssid, station.power, station.packets) == (access_point.bssid, NO_POWER, 1)
+    assert access_point.stations == [station]
+    assert ingestor.discovered_stations == {station.station_mac: station}
+
+    append(path, synthetic.data(bssid, station_mac, b'from the station', from_ap=False), signal=-45)
+    ingestor.ingest_file(path)
+    assert (station.power, station.packets) == (-45, 2)
+
+    append(path, synthetic.data(other_bssid, station_mac, b'roamed', from_ap=False), signal=-55)
+    ingestor.ingest_file(path)
+    assert (station.bssid, station.power, station.packets) == (other.bssid, -55, 3)
+    assert (access_point.stations, other.stations) == ([], [station])
+
+
+def test_probe_request_appends_probed_essid(tmp_path):
+    path = str(tmp_path / 'capture.cap')
+    bssid, station_mac = synthetic.mac_bytes(BSSID), synthetic.mac_bytes(STATION)
+    ingestor = FrameIngestor()
+    append(path, synthetic.probe_request(station_mac, 'home'))
+    assert not ingestor.ingest_file(path)  # only stations of a known AP are shown
+    assert not ingestor.stations
+
+    append(
+        path,
+        synthetic.beacon(bssid, 'home', 1),
+        synthetic.data(bssid, station_mac, b'payload', from_ap=False),
+        synthetic.probe_request(station_mac, 'home'),
+        synthetic.probe_request(station_mac, ''),  # wildcard
+        synthetic.probe_request(station_mac, 'work'),
+        synthetic.probe_request(station_mac, 'home'),
+    )
+    ingestor.ingest_file(path)
+    station = ingestor.stations[parse_mac(STATION)]
+    assert station.probed_essids == 'home,work'
+    assert station.packets == 5
+
+
+def test_restore(tmp_path):
+    csv_path, path = str(tmp_path / 'capture.csv'), str(tmp_path / 'capture.cap')
+    synthetic.write_csv(str(tmp_path / 'later.csv'), 4, 8, seed=1)
+    later = CsvIngestor()
+    later.ingest(str(tmp_path / 'later.csv'))
+    new_bssid = parse_mac(synthetic.access_point_rows(4, seed=1)[3][0])  # not in the 3 AP snapshots
+    # in none of the snapshots without stations, one of the new AP and one of a known AP (the seed has both)
+    unicast = [station for station in later.stations.values() if not station.station_mac >> 40 & 1]
+    stations = [
+        next(station for station in unicast if station.bssid == new_bssid),
+        next(station for station in unicast if station.bssid != new_bssid),
+    ]
+
+    csv = CsvIngestor()
+    ingestor = FrameIngestor(csv.access_points, csv.stations)
+    synthetic.write_csv(csv_path, 3, 0, seed=1)
+    assert csv.ingest(csv_path) == ParseStatus.UPDATED
+    ingestor.restore()
+    append(path, synthetic.beacon(synthetic.mac_bytes(format_mac(new_bssid)), 'network-3', 6), *(
+        synthetic.data(
+            synthetic.mac_bytes(station.bssid_human), synthetic.mac_bytes(station.station_mac_human), b'payload', False
+        )
+        for station in stations
+    ))
+    ingestor.ingest_file(path)
+    assert len(csv.access_points) == 4
+    assert csv.stations.keys() == {station.station_mac for station in stations}
+
+    # a snapshot written before airodump-ng saw them drops them, restore puts them back
+    synthetic.write_csv(csv_path, 3, 0, seed=1, tick=1)
+    assert csv.ingest(csv_path) == ParseStatus.UPDATED
+    assert len(csv.access_points) == 3
+    assert not csv.stations
+    ingestor.restore()
+    assert len(csv.access_points) == 4
+    assert ingestor.discovered_access_points[new_bssid] is csv.access_points[new_bssid]
+    for station in stations:
+        restored = csv.stations[station.station_mac]
+        assert csv.access_points[station.bssid].stations == [restored]
+
+    # once the CSV has them, it updates them
+    synthetic.write_csv(csv_path, 4, 8, seed=1)
+    assert csv.ingest(csv_path) == ParseStatus.UPDATED
+    ingestor.restore()
+    assert not ingestor.discovered_access_points
+    assert not ingestor.discovered_stations
+    assert csv.access_points.keys() == later.access_points.keys()
+    assert csv.stations.keys() == later.stations.keys()
+    for bssid, access_point in csv.access_points.items():
+        expected = [csv.stations[station.station_mac] for station in later.access_points[bssid].stations]
+        assert access_point.stations == expected
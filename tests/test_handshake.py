@@ -0,0 +1,76 @@
+from aircrack.handshake import HandshakeDetector
+from benchmarks import synthetic
+
+BSSID = '00:11:22:33:44:55'
+STATION = bytes.fromhex('0a1b2c3d4e5f')
+
+
+def write_frames(path, frames, mode='wb'):
+    with open(path, mode) as file:
+        if mode == 'wb':
+            file.write(synthetic.pcap_header())
+        for frame in frames:
+            file.write(synthetic.pcap_record(frame))
+
+
+def handshake():
+    return synthetic.handshake_frames(synthetic.mac_bytes(BSSID), STATION)
+
+
+def test_complete_handshake(tmp_path):
+    path = tmp_path / 'complete-01.cap'
+    synthetic.write_cap(path, 200, BSSID, handshake=True)
+    detector = HandshakeDetector(BSSID)
+
+    assert detector.contains_valid_handshake(str(path))
+    assert detector.handshake.messages == {1, 2, 3, 4}
+    assert detector.handshake.bssid == synthetic.mac_bytes(BSSID)
+
+
+def test_other_bssid_is_ignored(tmp_path):
+    path = tmp_path / 'other-01.cap'
+    synthetic.write_cap(path, 200, BSSID, handshake=True)
+
+    assert not HandshakeDetector('66:77:88:99:aa:bb').contains_valid_handshake(str(path))
+
+
+def test_partial_handshake(tmp_path):
+    path = tmp_path / 'partial-01.cap'
+    m1, m2, m3, m4 = handshake()
+    write_frames(path, [m1, m3, m4])  # M2 carries the SNonce and the MIC
+    detector = HandshakeDetector(BSSID)
+
+    assert not detector.contains_valid_handshake(str(path))
+    assert detector.handshakes[synthetic.mac_bytes(BSSID) + STATION].messages == {1, 3, 4}
+
+
+def test_handshake_completed_by_appended_frames(tmp_path):
+    path = tmp_path / 'growing-01.cap'
+    m1, m2, m3, m4 = handshake()
+    write_frames(path, [m1])
+    detector = HandshakeDetector(BSSID)
+    assert not detector.contains_valid_handshake(str(path))
+
+    record = synthetic.pcap_record(m2)
+    with open(path, 'ab') as file:
+        file.write(record[:len(record) // 2])  # airodump-ng is still writing it
+    assert not detector.contains_valid_handshake(str(path))
+
+    with open(path, 'ab') as file:
+        file.write(record[len(record) // 2:])
+    assert detector.contains_valid_handshake(str(path))
+
+
+def test_truncated_eapol_key_frame(tmp_path):
+    path = tmp_path / 'truncated-01.cap'
+    m1, m2, m3, m4 = handshake()
+    eapol = len(m2) - len(synthetic.eapol_key(0, 0, bytes(32)))
+    truncated = bytearray(m2)
+    truncated[eapol + 2:eapol + 4] = (2).to_bytes(2, 'big')  # a body length too small to hold the key info
+    write_frames(path, [m1, bytes(truncated), m2[:60]])
+    detector = HandshakeDetector(BSSID)
+
+    assert not detector.contains_valid_handshake(str(path))
+
+    write_frames(path, [m2], mode='ab')
+    assert detector.contains_valid_handshake(str(path))
@@ -0,0 +1,41 @@
+import json
+import socket
+import time
+
+from wifi_snitch_headless import MAX_BACKLOG, Output
+
+
+def connect(path):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(str(path))
+    return client
+
+
+def test_stalled_client_is_dropped_without_blocking(tmp_path):
+    path = tmp_path / 'snitch.sock'
+    output = Output(str(path))
+    stalled, reader = connect(path), connect(path)
+    reader.settimeout(5)
+    record = {'type': 'access_point', 'event': 'new', 'essid': 'x' * 1000}
+    received = bytearray()
+
+    start = time.monotonic()
+    for _ in range(4 * MAX_BACKLOG // 1000):
+        output.write([record])
+        while True:  # the reader keeps up
+            reader.setblocking(False)
+            try:
+                chunk = reader.recv(1 << 16)
+            except BlockingIOError:
+                break
+            received += chunk
+    assert time.monotonic() - start < 10
+
+    assert len(output.clients) == 1  # the stalled one is gone
+    reader.setblocking(True)
+    output.flush()
+    while received.count(b'\n') < 4 * MAX_BACKLOG // 1000:
+        received += reader.recv(1 << 16)
+    assert json.loads(received.split(b'\n')[0]) == record
+    stalled.close()
+    reader.close()
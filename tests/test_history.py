@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from aircrack import history
+from aircrack.history import DeviceHistory, SignalHistory
+from aircrack.models import AccessPoint, Station
+
+
+@pytest.fixture(params=['numpy', 'python'], autouse=True)
+def statistics(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(history, '_numpy', lambda: None)
+
+
+def test_ring_buffer_wraps_around():
+    signal = SignalHistory(('power',), samples=4)
+    for i, power in enumerate([-90, -80, -70, -60, -50, -40]):
+        signal.record('ap', i, (power,))
+
+    assert signal.mean('power') == {'ap': -55}  # the last 4 samples
+
+
+def test_unknown_values_are_ignored():
+    signal = SignalHistory(('power',), samples=4)
+    signal.record('ap', 0, (math.nan,))
+    assert math.isnan(signal.mean('power')['ap'])
+    signal.record('ap', 1, (-60,))
+    signal.record('ap', 2, (math.nan,))
+    assert signal.mean('power') == {'ap': -60}
+
+
+def test_least_recently_updated_device_is_evicted():
+    signal = SignalHistory(('power',), samples=4, capacity=2)
+    signal.record('a', 0, (-10,))
+    signal.record('b', 1, (-20,))
+    signal.record('a', 2, (-30,))
+    signal.record('c', 3, (-40,))  # takes over the slot of b, which was updated last the longest ago
+
+    assert len(signal) == 2 and 'b' not in signal
+    assert signal.mean('power') == {'a': -20, 'c': -40}
+
+
+def test_arrays_grow_with_the_devices_seen():
+    signal = SignalHistory(('power',), samples=2, capacity=200)
+    assert len(signal._times) == 0
+    for key in range(100):
+        signal.record(key, 0, (-key,))
+    assert len(signal._times) == 2 * 128
+    for key in range(100, 300):
+        signal.record(key, 0, (-key,))
+    assert len(signal._times) == 2 * 200  # capped at the capacity
+
+    means = signal.mean('power')
+    assert len(means) == 200
+    assert means == {key: -key for key in range(100, 300)}
+
+
+def access_point(bssid, power, stations=()):
+    return AccessPoint(bssid, 0, 0, 1, 54, 'WPA2', 'CCMP', 'PSK', power, 10, '0', '', 4, 'test', '', list(stations))
+
+
+def test_smoothed_power():
+    devices = DeviceHistory(samples=3)
+    for timestamp, power in enumerate([-40, -50, -60, -70]):
+        station = Station(2, 0, 0, power - 10, 5, 1, '')
+        snapshot = [access_point(1, power, [station]), access_point(3, -1)]
+        devices.record(snapshot, timestamp)
+
+    assert snapshot[0].smoothed_power == -60
+    assert snapshot[0].stations[0].smoothed_power == -70
+    assert snapshot[1].smoothed_power == -math.inf  # its power was never known
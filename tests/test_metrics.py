@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import pytest
+
+from aircrack.metrics import Metrics, Timer, WINDOW
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    metrics.enabled = True
+    return metrics
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+
+    @metrics.timed('call')
+    def call():
+        return 'result'
+
+    with metrics.timer('block'):
+        pass
+    metrics.count('things')
+
+    assert call() == 'result'
+    assert not metrics.timers and not metrics.counters and not metrics.trace
+
+
+def test_timer_and_counter(metrics):
+    with metrics.timer('block'):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timer('block'):
+            raise ValueError  # still timed
+    metrics.count('things')
+    metrics.count('things', 2)
+
+    assert metrics.timers['block'].count == 2
+    assert len(metrics.trace) == 2
+    assert metrics.counters == {'things': 3}
+
+
+def test_timed_functions_and_coroutines(metrics):
+    @metrics.timed('call')
+    def call(value):
+        return value * 2
+
+    @metrics.timed('coroutine')
+    async def coroutine(value):
+        await asyncio.sleep(0.01)
+        return value * 3
+
+    assert call.__name__ == 'call'
+    assert call(2) == 4
+    assert asyncio.run(coroutine(2)) == 6
+    assert metrics.timers['call'].count == 1
+    assert metrics.timers['coroutine'].percentile(0.5) >= 10  # ms, the await is part of it
+
+
+def test_percentiles_of_the_rolling_window():
+    timer = Timer()
+    assert timer.percentile(0.5) == 0
+    for milliseconds in range(1, 101):
+        timer.add(milliseconds * 1_000_000)
+    assert timer.percentile(0.5) == 51
+    assert timer.percentile(0.99) == 99
+    assert timer.percentile(1) == 100
+
+    for _ in range(WINDOW):
+        timer.add(1_000_000)
+    assert timer.percentile(0.99) == 1  # the old samples left the window
+    assert timer.count == 100 + WINDOW
+
+
+def test_summary_and_hud(metrics):
+    metrics.record('parse', 0, 2_000_000)
+    metrics.record('parse', 0, 4_000_000)
+
+    assert metrics.summary() == {'parse': {'count': 2, 'total_ms': 6.0, 'p50_ms': 2.0, 'p99_ms': 4.0}}
+    assert metrics.hud() == 'parse 2.0/4.0ms'
+    assert metrics.hud(['other']) == 'no samples yet'
+
+
+def test_exports(metrics, tmp_path):
+    with metrics.timer('block'):
+        pass
+    metrics.count('things', 5)
+
+    metrics.export_json(str(tmp_path / 'metrics.json'))
+    exported = json.loads((tmp_path / 'metrics.json').read_text())
+    assert exported['counters'] == {'things': 5}
+    assert exported['timers']['block']['count'] == 1
+
+    metrics.export_chrome_trace(str(tmp_path / 'trace.json'))
+    trace = json.loads((tmp_path / 'trace.json').read_text())
+    span, counter = trace['traceEvents']
+    assert span['name'] == 'block' and span['ph'] == 'X' and span['ts'] >= 0 and span['dur'] >= 0
+    assert counter['ph'] == 'C' and counter['args'] == {'things': 5}
+
+    metrics.reset()
+    assert not metrics.timers and not metrics.counters and not metrics.trace
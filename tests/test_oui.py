@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from aircrack import oui
+from aircrack.oui import OuiIndex, build_index
+from benchmarks import synthetic
+
+
+@pytest.fixture(autouse=True)
+def no_default_index(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(oui, 'SOURCES', [str(tmp_path / 'oui.txt')])
+    oui.default_index.cache_clear()
+    yield
+    oui.default_index.cache_clear()
+
+
+def test_lookup(tmp_path):
+    prefixes = synthetic.write_oui(str(tmp_path / 'oui.txt'), 500)
+    build_index(str(tmp_path / 'oui.txt'), str(tmp_path / 'oui.idx'))
+    index = OuiIndex(str(tmp_path / 'oui.idx'))
+
+    assert len(index) == 500
+    for prefix in prefixes[:50]:
+        assert index.vendor(prefix << 24 | 0x123456) == f'Vendor {prefix:06X}, Inc.'
+    unknown = next(prefix for prefix in range(1 << 16) if prefix not in set(prefixes))
+    assert index.vendor(unknown << 24) == oui.UNKNOWN
+    assert index.vendor(0xFCFFFF << 24) == oui.UNKNOWN  # past the last prefix
+    assert index.vendor((prefixes[0] | 0x020000) << 24) == oui.RANDOMIZED  # locally administered bit
+
+
+def test_aircrack_ng_format(tmp_path):
+    (tmp_path / 'airodump-ng-oui.txt').write_text('00:00:0C Cisco Systems, Inc\n00:13:10 Cisco-Linksys, LLC  \n')
+    build_index(str(tmp_path / 'airodump-ng-oui.txt'), str(tmp_path / 'oui.idx'))
+    index = OuiIndex(str(tmp_path / 'oui.idx'))
+
+    assert index.vendor(0x00000C000001) == 'Cisco Systems, Inc'
+    assert index.vendor(0x001310ABCDEF) == 'Cisco-Linksys, LLC'
+
+
+def test_not_an_index(tmp_path):
+    (tmp_path / 'oui.idx').write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        OuiIndex(str(tmp_path / 'oui.idx'))
+
+
+def test_index_is_built_ahead_of_the_lookups(tmp_path):
+    prefix, = synthetic.write_oui(str(tmp_path / 'oui.txt'), 1)
+    mac = prefix << 24 | 1
+
+    assert oui.vendor(mac) == oui.UNKNOWN  # nothing built yet, and the lookup does not build it
+    assert oui.vendor(0x020000000001) == oui.RANDOMIZED
+    assert not os.path.exists(oui.INDEX_PATH)
+
+    assert oui.update_index()
+    assert oui.vendor(mac) == f'Vendor {prefix:06X}, Inc.'
+    assert not oui.update_index()  # up to date
+
+    later = os.path.getmtime(oui.INDEX_PATH) + 10
+    os.utime(tmp_path / 'oui.txt', (later, later))
+    assert oui.update_index()
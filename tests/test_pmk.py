@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from aircrack import pmk
+from aircrack.handshake import HandshakeDetector
+from aircrack.pmk import PmkCache, PmkEngine
+from benchmarks import synthetic
+
+BSSID = '00:11:22:33:44:55'
+PASSPHRASE = b'correct horse'
+WORDLIST = [f'wrong guess {i}'.encode() for i in range(12)] + [PASSPHRASE] + [b'never reached']
+
+
+@pytest.fixture
+def handshake(tmp_path):
+    path = tmp_path / 'target-01.cap'
+    synthetic.write_cap(str(path), 100, BSSID, handshake=True, essid='target', passphrase=PASSPHRASE.decode())
+    detector = HandshakeDetector(BSSID)
+    assert detector.contains_valid_handshake(str(path))
+    assert pmk.capture_essid(str(path), synthetic.mac_bytes(BSSID)) == b'target'
+    return detector.handshake
+
+
+def test_cold_cache(handshake, tmp_path):
+    with PmkCache(b'target', str(tmp_path / 'pmk')) as cache:
+        assert PmkEngine(processes=1, chunk_size=4).crack(handshake, cache, WORDLIST) == PASSPHRASE
+        assert PASSPHRASE in cache
+        assert dict(cache)[PASSPHRASE] == pmk.derive(PASSPHRASE, b'target')
+
+
+def test_warm_cache_derives_nothing(handshake, tmp_path, monkeypatch):
+    with PmkCache(b'target', str(tmp_path / 'pmk')) as cache:
+        assert PmkEngine(processes=1).precompute(cache, WORDLIST) == len(WORDLIST)
+
+    def derive_chunk(essid, passphrases):
+        raise AssertionError(f'derived {passphrases} again')
+    monkeypatch.setattr(pmk, 'derive_chunk', derive_chunk)
+    with PmkCache(b'target', str(tmp_path / 'pmk')) as cache:
+        assert len(cache) == len(WORDLIST)
+        assert PmkEngine(processes=1).crack(handshake, cache, WORDLIST) == PASSPHRASE
+
+
+def test_passphrase_not_in_wordlist(handshake, tmp_path):
+    with PmkCache(b'target', str(tmp_path / 'pmk')) as cache:
+        assert PmkEngine(processes=1).crack(handshake, cache, WORDLIST[:3]) is None
+        assert len(cache) == 3
+
+
+def test_truncated_tail_is_dropped(tmp_path):
+    directory = str(tmp_path / 'pmk')
+    with PmkCache(b'target', directory) as cache:
+        PmkEngine(processes=1).precompute(cache, WORDLIST[:2])
+        path = cache.path
+    size = os.path.getsize(path)
+    with open(path, 'ab') as file:  # a record cut short by a crash
+        file.write(bytes([len(PASSPHRASE)]) + PASSPHRASE + b'\x00' * 5)
+
+    with PmkCache(b'target', directory) as cache:
+        assert os.path.getsize(path) == size
+        assert [passphrase for passphrase, _ in cache] == WORDLIST[:2]
+        cache.add(PASSPHRASE, pmk.derive(PASSPHRASE, b'target'))
+        assert len(cache) == 3
+
+
+def test_other_essid_is_rejected(tmp_path):
+    PmkCache(b'target', str(tmp_path)).close()
+    os.rename(tmp_path / f'{b"target".hex()}.pmk', tmp_path / f'{b"other".hex()}.pmk')
+    with pytest.raises(ValueError):
+        PmkCache(b'other', str(tmp_path))
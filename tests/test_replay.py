@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import time
+
+from aircrack import replay
+from aircrack.adapters import AdapterDiscovery
+from aircrack.aireplay import Aireplay
+from aircrack.airmon import Airmon
+from aircrack.airodump import Airodump
+from aircrack.cowpatty import Cowpatty
+from aircrack.models import Station, WifiAdapter, parse_mac
+from benchmarks import synthetic
+
+BSSID = '00:11:22:33:44:55'
+AIRMON_TABLE = 'PHY\tInterface\tDriver\t\tChipset\n\nphy1\twlan0mon\tath9k_htc\tAtheros AR9271\n'
+# two CSV rewrites, the capture growing in between, then runs until terminated
+FAKE_AIRODUMP = '''#!/bin/sh
+prefix=$3
+head -c "$FAKE_CAP_HALF" "$FAKE_DIR/full.cap" > "$prefix-01.cap"
+cp "$FAKE_DIR/first.csv" "$prefix-01.csv"
+sleep 0.5
+cat "$FAKE_DIR/full.cap" > "$prefix-01.cap"
+cp "$FAKE_DIR/second.csv" "$prefix-01.csv"
+exec sleep 60
+'''
+FAKE_AIRMON = f'''#!/bin/sh
+printf '{AIRMON_TABLE}'
+'''
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def record(tmp_path, monkeypatch, fake_tool):
+    fixtures = tmp_path / 'fixtures'
+    fixtures.mkdir()
+    synthetic.write_csv(str(fixtures / 'first.csv'), 3, 2)
+    synthetic.write_csv(str(fixtures / 'second.csv'), 5, 4, tick=1)
+    synthetic.write_cap(str(fixtures / 'full.cap'), 200, BSSID, handshake=True)
+    monkeypatch.setenv('FAKE_DIR', str(fixtures))
+    monkeypatch.setenv('FAKE_CAP_HALF', str(os.path.getsize(fixtures / 'full.cap') // 2))
+    fake_tool('airodump-ng', FAKE_AIRODUMP)
+    fake_tool('airmon-ng', FAKE_AIRMON)
+
+    live = tmp_path / 'live'
+    live.mkdir()
+    monkeypatch.chdir(live)
+    session = str(tmp_path / 'session')
+    replay.SessionRecorder(session, Airodump('wlan0mon', live=False)).record(duration=1.5, refresh=0.1)
+    return session, fixtures
+
+
+def test_recording(tmp_path, monkeypatch, fake_tool):
+    session, fixtures = record(tmp_path, monkeypatch, fake_tool)
+
+    with open(os.path.join(session, replay.MANIFEST)) as file:
+        manifest = json.load(file)
+    assert manifest['interface'] == 'wlan0mon'
+    assert manifest['airmon'] == AIRMON_TABLE
+    snapshots = [event['csv'] for event in manifest['events'] if event['csv']]
+    assert len(snapshots) == 2
+    with open(os.path.join(session, snapshots[-1]), 'rb') as file:
+        assert file.read() == (fixtures / 'second.csv').read_bytes()
+    sizes = [event['cap_size'] for event in manifest['events']]
+    assert sizes == sorted(sizes) and sizes[-1] == os.path.getsize(fixtures / 'full.cap')
+    assert (fixtures / 'full.cap').read_bytes() == open(os.path.join(session, replay.CAPTURE), 'rb').read()
+
+
+def test_replay(tmp_path, monkeypatch, fake_tool):
+    session, fixtures = record(tmp_path, monkeypatch, fake_tool)
+    for wrapper in (Airodump, Airmon, Aireplay, Cowpatty):
+        monkeypatch.setattr(wrapper, 'executable', wrapper.executable)
+    monkeypatch.setattr(AdapterDiscovery, 'sysfs_root', AdapterDiscovery.sysfs_root)
+    monkeypatch.setenv('PYTHONPATH', os.environ.get('PYTHONPATH', ''))
+    monkeypatch.setenv('PATH', os.defpath)  # the fakes are not used any more
+    replay.use_session(session, speed=0)
+    played = tmp_path / 'played'
+    played.mkdir()
+    monkeypatch.chdir(played)
+
+    adapter, = Airmon.get_wifi_adapters()
+    assert (adapter.phy, adapter.interface, adapter.driver) == ('phy1', 'wlan0mon', 'ath9k_htc')
+    monitor = WifiAdapter('phy1', 'wlan0', 'ath9k_htc', 'Atheros AR9271')
+    Airmon.start_monitoring(monitor)
+    assert monitor.interface == 'wlan0mon' and monitor.monitor
+
+    airodump = Airodump('wlan0mon', live=False)
+    try:
+        access_points = []
+        deadline = time.monotonic() + 10
+        while len(access_points) < 5 and time.monotonic() < deadline:
+            access_points = airodump.fetch() or access_points
+            time.sleep(0.05)
+        assert len(access_points) == 5  # the last snapshot
+        capture = airodump.get_latest_file('.cap')
+        assert wait_for(lambda: os.path.getsize(capture) == os.path.getsize(fixtures / 'full.cap'))
+    finally:
+        airodump.stop()
+
+    station = Station(parse_mac('66:77:88:99:AA:BB'), 0, 0, -40, 10, parse_mac(BSSID), '')
+    progress = asyncio.run(Aireplay(monitor, station, 2).run())
+    assert progress.rounds == 2 and progress.returncode == 0
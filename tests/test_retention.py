@@ -0,0 +1,92 @@
+import os
+import time
+
+from aircrack.capture_session import CaptureSession
+from aircrack.models import WifiAdapter
+from aircrack.retention import RetentionPolicy, sessions
+
+HOUR = 3600
+# numbers its files after the ones already there, like airodump-ng
+FAKE_AIRODUMP = '''#!/bin/sh
+prefix=$3
+number=1
+while [ -e "$(printf '%s-%02d.cap' "$prefix" $number)" ]; do number=$((number + 1)); done
+printf 'capture' > "$(printf '%s-%02d.cap' "$prefix" $number)"
+exec sleep 60
+'''
+
+
+def write_session(directory, stem, size, age):
+    for extension in ('.cap', '.csv', '.kismet.netxml'):
+        path = os.path.join(directory, f'{stem}{extension}')
+        with open(path, 'wb') as file:
+            file.write(b'\0' * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+
+def stems(directory):
+    return [session.stem for session in sessions(directory)]
+
+
+def test_old_sessions_are_removed(tmp_path):
+    write_session(tmp_path, 'wlan0mon-01', 100, 10 * HOUR)
+    write_session(tmp_path, 'wlan0mon-02', 100, HOUR)
+    (tmp_path / 'archive.sqlite').write_bytes(b'\0' * 1000)
+
+    removed = RetentionPolicy(max_bytes=None, max_age=2 * HOUR, directory=str(tmp_path)).prune()
+
+    assert [session.stem for session in removed] == ['wlan0mon-01']
+    assert stems(tmp_path) == ['wlan0mon-02']
+    assert (tmp_path / 'archive.sqlite').exists()
+
+
+def test_oldest_sessions_are_removed_down_to_the_size_cap(tmp_path):
+    for number in range(1, 5):
+        write_session(tmp_path, f'wlan0mon-{number:02}', 100, (5 - number) * HOUR)
+
+    removed = RetentionPolicy(max_bytes=650, max_age=None, directory=str(tmp_path)).prune(dry_run=True)
+    assert [session.stem for session in removed] == ['wlan0mon-01', 'wlan0mon-02']
+    assert len(stems(tmp_path)) == 4
+
+    RetentionPolicy(max_bytes=650, max_age=None, directory=str(tmp_path)).prune()
+    assert stems(tmp_path) == ['wlan0mon-03', 'wlan0mon-04']
+
+
+def test_active_and_recent_sessions_are_kept(tmp_path):
+    write_session(tmp_path, 'wlan0mon-01', 100, HOUR)
+    write_session(tmp_path, 'wlan0mon-02', 100, HOUR)
+    write_session(tmp_path, 'wlan1mon-01', 100, 1)  # another instance may be writing it
+
+    RetentionPolicy(max_bytes=1, max_age=None, directory=str(tmp_path)).prune(
+        active=[str(tmp_path / 'wlan0mon-02.cap')]
+    )
+
+    assert stems(tmp_path) == ['wlan0mon-02', 'wlan1mon-01']
+
+
+def test_capture_session_keeps_the_capture_it_restarts(tmp_path, monkeypatch, fake_tool):
+    monkeypatch.chdir(tmp_path)
+    fake_tool('airodump-ng', FAKE_AIRODUMP)
+    directory = tmp_path / '.aircrack-ng'
+    directory.mkdir()
+    write_session(directory, 'wlan1mon-01', 100, 10 * HOUR)
+    session = CaptureSession(retention=RetentionPolicy(max_bytes=None, max_age=HOUR, directory=str(directory)))
+    session.start([WifiAdapter('phy0', 'wlan0mon', 'ath9k_htc', 'Atheros AR9271', monitor=True)])
+    try:
+        deadline = time.monotonic() + 10
+        while not session.latest_captures() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert session.latest_captures() == ['.aircrack-ng/wlan0mon-01.cap']
+        assert stems(directory) == ['wlan0mon-01']  # pruned before the capture started
+
+        mtime = time.time() - 2 * HOUR  # as if the target was watched for that long
+        os.utime(directory / 'wlan0mon-01.cap', (mtime, mtime))
+        session.tune([6])
+        deadline = time.monotonic() + 10
+        while session.latest_captures() != ['.aircrack-ng/wlan0mon-02.cap'] and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        session.stop()
+
+    assert stems(directory) == ['wlan0mon-01', 'wlan0mon-02']
@@ -0,0 +1,64 @@
+import asyncio
+
+import urwid
+
+from urwid_components.scheduler import ScheduledMainLoop
+
+
+class CountingScreen(urwid.BaseScreen):
+    """Counts the frames instead of writing them to a terminal."""
+
+    def __init__(self):
+        super().__init__()
+        self.draws = 0
+
+    def get_cols_rows(self):
+        return 80, 24
+
+    def draw_screen(self, size, canvas):
+        self.draws += 1
+
+    def hook_event_loop(self, event_loop, callback):
+        pass
+
+    def unhook_event_loop(self, event_loop):
+        pass
+
+
+def run_loop(coroutine) -> CountingScreen:
+    async def main():
+        screen = CountingScreen()
+        event_loop = urwid.AsyncioEventLoop(loop=asyncio.get_running_loop())
+        loop = ScheduledMainLoop(urwid.SolidFill('x'), screen=screen, event_loop=event_loop, handle_mouse=False)
+        with loop.start():
+            await coroutine(loop)
+        return screen
+    return asyncio.run(main())
+
+
+def test_idle_screen_is_not_redrawn():
+    async def idle(loop):
+        await asyncio.sleep(0.5)
+
+    assert run_loop(idle).draws == 1  # the first frame only
+
+
+def test_requested_redraws_are_coalesced():
+    async def updates(loop):
+        await asyncio.sleep(0.1)
+        for _ in range(10):
+            loop.scheduler.request_redraw()
+        await asyncio.sleep(0.3)
+
+    assert run_loop(updates).draws == 2
+
+
+def test_input_and_new_widgets_are_drawn():
+    async def interact(loop):
+        await asyncio.sleep(0.1)
+        loop.process_input(['window resize'])
+        await asyncio.sleep(0.1)
+        loop.widget = urwid.SolidFill('y')
+        await asyncio.sleep(0.1)
+
+    assert run_loop(interact).draws == 3
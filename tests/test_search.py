@@ -0,0 +1,208 @@
+import dataclasses
+import operator
+
+import pytest
+
+from urwid_components.keyed_list import KeyedListWalker
+from urwid_components.search import SearchIndex, Term
+
+
+@dataclasses.dataclass
+class Device:
+    mac: str
+    essid: str
+    channel: int
+    power: int
+    privacy: str = 'WPA2'
+
+
+def device_search() -> SearchIndex:
+    return SearchIndex(
+        text=lambda device: (device.mac, device.essid),
+        numbers={'channel': operator.attrgetter('channel'), 'power': operator.attrgetter('power')},
+        keywords={'privacy': operator.attrgetter('privacy')},
+    )
+
+
+def walker(*devices: Device) -> KeyedListWalker:
+    walker = KeyedListWalker(
+        ['MAC', 'ESSID'], ['mac', 'essid'], key='mac', on_select=lambda *args: None, sort_by='power',
+        search=device_search(),
+    )
+    walker.update(devices)
+    return walker
+
+
+def shown(walker: KeyedListWalker):
+    return [walker._key_at(position) for position in range(1, walker.shown + 1)]
+
+
+def test_parse_ranges():
+    search = device_search()
+    assert search.parse('channel:1..6 power:40.. power:..-50') == (
+        Term('range', field='channel', low=1, high=6),
+        Term('range', field='power', low=40, high=None),
+        Term('range', field='power', low=None, high=-50),
+    )
+    assert search.parse('channel:6') == (Term('range', field='channel', low=6, high=6),)
+    with pytest.raises(ValueError, match='not a range'):
+        search.parse('channel:six')
+
+
+def test_parse_abbreviated_and_ambiguous_fields():
+    search = device_search()
+    assert search.parse('ch:6 pow:-40.. priv:WPA2') == (
+        Term('range', field='channel', low=6, high=6),
+        Term('range', field='power', low=-40, high=None),
+        Term('keyword', 'wpa2', field='privacy'),
+    )
+    with pytest.raises(ValueError, match='ambiguous'):
+        search.parse('p:1')
+
+
+def test_parse_words():
+    search = device_search()
+    assert search.parse('AA:BB:CC ^Net home: "my wifi" "open') == (
+        Term('substring', 'aa:bb:cc'),  # not a field
+        Term('prefix', 'net'),
+        Term('substring', 'home:'),
+        Term('substring', 'my wifi'),
+        Term('substring', 'open'),  # unterminated quote
+    )
+    assert search.parse('"my wifi') == (Term('substring', 'my wifi'),)
+    assert search.parse('  ') == ()
+
+
+def test_search_follows_text_changes():
+    search = device_search()
+    search.update('a', Device('AA:BB:CC:00:00:01', 'home network', 1, -40))
+    search.update('b', Device('AA:BB:CC:00:00:02', 'office', 6, -60))
+
+    assert search.search(search.parse('home')) == {'a'}
+    assert search.search(search.parse('^net')) == {'a'}
+    assert search.search(search.parse('aa:bb:cc')) == {'a', 'b'}
+    assert search.search(search.parse('cc:00:00:02')) == {'b'}
+
+    assert not search.update('a', Device('AA:BB:CC:00:00:01', 'home network', 1, -40))
+    assert search.update('a', Device('AA:BB:CC:00:00:01', 'guest', 1, -40))
+    assert search.search(search.parse('home')) == set()
+    assert search.search(search.parse('^net')) == set()
+    assert search.search(search.parse('^gu')) == {'a'}
+    assert search.search(search.parse('ues')) == {'a'}
+
+    search.remove('b')
+    assert search.search(search.parse('aa:bb:cc')) == {'a'}
+    assert search.search(search.parse('off')) == set()
+    assert search.search(search.parse('^office')) == set()
+    assert search.search(()) == {'a'}
+
+
+def test_prefix_shared_by_words_of_one_element():
+    search = device_search()
+    search.update('a', Device('01', 'net network', 1, -40))
+    search.update('a', Device('01', 'network', 1, -40))
+    assert search.search(search.parse('^net')) == {'a'}
+    search.remove('a')
+    assert search.search(search.parse('^n')) == set()
+
+
+def test_fields_combine():
+    search = device_search()
+    search.update('a', Device('01', 'home', 1, -40, 'WPA2 PSK'))
+    search.update('b', Device('02', 'home', 6, -60, 'WEP'))
+    search.update('c', Device('03', 'home', 11, -80, 'OPN'))
+
+    assert search.search(search.parse('home ch:1..6')) == {'a', 'b'}
+    assert search.search(search.parse('home ch:1..6 power:-50..')) == {'a'}
+    assert search.search(search.parse('privacy:psk')) == {'a'}
+    assert search.search(search.parse('ch:12..')) == set()
+
+    search.update('a', Device('01', 'home', 11, -40, 'OPN'))
+    assert search.search(search.parse('ch:11')) == {'a', 'c'}
+    assert search.search(search.parse('privacy:opn')) == {'a', 'c'}
+    assert search.search(search.parse('privacy:psk')) == set()
+
+
+def test_walker_query():
+    devices = walker(
+        Device('01', 'home', 1, -40),
+        Device('02', 'office', 6, -60),
+        Device('03', 'home', 11, -80),
+    )
+    assert shown(devices) == ['01', '02', '03']  # strongest first
+
+    devices.set_query(devices.search.parse('home'))
+    assert (devices.shown, devices.total, len(devices)) == (2, 3, 3)
+    assert shown(devices) == ['01', '03']
+
+
+def test_walker_element_starts_and_stops_matching():
+    devices = walker(Device('01', 'home', 1, -40), Device('02', 'office', 6, -60))
+    devices.set_query(devices.search.parse('home'))
+    assert shown(devices) == ['01']
+
+    devices.update([Device('01', 'home', 1, -40), Device('02', 'home', 6, -60)])
+    assert (devices.shown, devices.total) == (2, 2)
+    assert shown(devices) == ['01', '02']
+
+    devices.update([Device('01', 'work', 1, -40), Device('02', 'home', 6, -60)])
+    assert (devices.shown, devices.total) == (1, 2)
+    assert shown(devices) == ['02']
+
+    devices.set_query(())
+    assert (devices.shown, devices.total) == (2, 2)
+    assert shown(devices) == ['01', '02']
+
+
+def test_walker_sort_value_changes_under_query():
+    devices = walker(
+        Device('01', 'home', 1, -40),
+        Device('02', 'office', 6, -50),
+        Device('03', 'home', 11, -60),
+    )
+    devices.set_query(devices.search.parse('home'))
+    devices.set_focus(2)
+    assert devices.focused_element.mac == '03'
+
+    devices.update([Device('01', 'home', 1, -70), Device('02', 'office', 6, -30), Device('03', 'home', 11, -60)])
+    assert shown(devices) == ['03', '01']
+    assert [key for _, key in devices._order] == ['01', '03', '02']
+    assert devices.focused_element.mac == '03'  # focus follows the element
+    assert devices.focus == 1
+
+
+def test_walker_focused_element_stops_matching_or_is_dropped():
+    devices = walker(
+        Device('01', 'home', 1, -40),
+        Device('02', 'home', 6, -50),
+        Device('03', 'home', 11, -60),
+    )
+    devices.set_query(devices.search.parse('^ho'))
+    devices.set_focus(3)
+    assert devices.focused_element.mac == '03'
+
+    devices.update([Device('01', 'home', 1, -40), Device('02', 'home', 6, -50), Device('03', 'work', 11, -60)])
+    assert (devices.shown, devices.total) == (2, 3)
+    assert devices.focus == 2  # clamped to the last row shown
+    assert devices.focused_element.mac == '02'
+
+    devices.update([Device('01', 'home', 1, -40), Device('03', 'work', 11, -60)])
+    assert (devices.shown, devices.total) == (1, 2)
+    assert devices.focused_element.mac == '01'
+    assert devices.search.search(devices.search.parse('02')) == set()
+
+    devices.update([Device('03', 'work', 11, -60)])
+    assert (devices.shown, devices.total) == (0, 1)
+    assert devices.focus == 0
+    assert devices.focused_element is None
+
+
+def test_walker_new_element_under_query():
+    devices = walker(Device('01', 'home', 1, -40))
+    devices.set_query(devices.search.parse('ch:6..'))
+    assert (devices.shown, devices.total, devices.focus) == (0, 1, 0)
+
+    devices.update([Device('01', 'home', 1, -40), Device('02', 'office', 6, -30), Device('03', 'cafe', 1, -20)])
+    assert (devices.shown, devices.total) == (1, 3)
+    assert shown(devices) == ['02']
+    assert devices.focused_element.mac == '02'
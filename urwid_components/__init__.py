@@ -6,13 +6,17 @@ urwid.escape.SHOW_CURSOR = ''
 class SimpleButton(urwid.WidgetWrap):
     def __init__(self, label, on_press):
         button = urwid.Button(label, on_press=on_press)
+        self.icon = urwid.SelectableIcon(label, 0)
         button._set_w(
             urwid.AttrMap(
-                urwid.SelectableIcon(label, 0), None, "reversed"
+                self.icon, None, "reversed"
             )
         )
         super().__init__(button)
 
+    def set_label(self, label):
+        self.icon.set_text(label)
+
 
 class StyledButton(urwid.WidgetWrap):
     def __init__(self, label, on_press):
@@ -0,0 +1,247 @@
+import bisect
+import collections
+import operator
+import typing as t
+
+import urwid
+
+from urwid_components import SimpleButton
+from urwid_components.search import Query, SearchIndex
+
+ROW_CACHE_SIZE = 256
+
+
+class KeyedRow(SimpleButton):
+    def __init__(self, label: str, on_select: t.Callable[[t.Any, urwid.Widget], None]):
+        self.key = None
+        super().__init__(label, on_press=lambda button: on_select(self.key, button))
+
+
+class KeyedListWalker(urwid.ListWalker):
+    """
+    Virtual table of elements keyed by an attribute (BSSID, MAC, ...), position 0 being the column header.
+    Only the sorted (sort value, key) index is kept for every element, row widgets are created lazily for
+    the positions the ListBox asks for and recycled from a small LRU cache, so memory and per-frame cost
+    depend on the terminal height rather than on the number of elements.
+
+    With a `SearchIndex` the rows can be narrowed by a query, the rows shown then being a second sorted index of
+    just the matches, built from the postings when the query changes and patched for the elements an update
+    changed.
+    """
+
+    def __init__(
+            self,
+            columns: t.List[str],
+            fields: t.List[str],
+            key: str,
+            on_select: t.Callable[[t.Any, urwid.Widget], None],
+            sort_by: t.Optional[str] = None,
+            cache_size: int = ROW_CACHE_SIZE,
+            search: t.Optional[SearchIndex] = None,
+    ):
+        self.columns = columns
+        self.fields = fields
+        self.get_key = operator.attrgetter(key)
+        self.get_sort_value = operator.attrgetter(sort_by) if sort_by else None
+        self.on_select = on_select
+        self.cache_size = cache_size
+        self.search = search
+        self.query: Query = ()
+
+        self.focus = 0
+        self.widths = [len(c) + 2 for c in self.columns]
+        self.header = urwid.Text(self._label(self.columns))
+        self._lengths = [collections.Counter() for _ in self.fields]  # per column: cell length -> count
+        self._elements: t.Dict[t.Any, t.Any] = {}
+        self._cell_lengths: t.Dict[t.Any, t.Tuple[int, ...]] = {}
+        self._sort_values: t.Dict[t.Any, t.Any] = {}
+        self._order: t.List[t.Tuple[t.Any, t.Any]] = []  # ascending (sort value, key), displayed in reverse
+        self._matches: t.Set[t.Any] = set()
+        self._shown: t.Optional[t.List[t.Tuple[t.Any, t.Any]]] = None  # like _order, the matches of the query
+        self._rows: t.OrderedDict[t.Any, KeyedRow] = collections.OrderedDict()  # LRU of row widgets
+        self._sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._displayed) + 1
+
+    @property
+    def total(self) -> int:
+        return len(self._order)
+
+    @property
+    def shown(self) -> int:
+        return len(self._displayed)
+
+    @property
+    def _displayed(self) -> t.List[t.Tuple[t.Any, t.Any]]:
+        return self._order if self._shown is None else self._shown
+
+    @property
+    def focused_element(self) -> t.Optional[t.Any]:
+        return self._elements.get(self._key_at(self.focus))
+
+    def get_focus(self) -> t.Tuple[t.Optional[urwid.Widget], t.Optional[int]]:
+        return self._widget_at(self.focus), self.focus
+
+    def set_focus(self, position: int):
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position: int) -> t.Tuple[t.Optional[urwid.Widget], t.Optional[int]]:
+        return self._widget_and_position(position + 1)
+
+    def get_prev(self, position: int) -> t.Tuple[t.Optional[urwid.Widget], t.Optional[int]]:
+        return self._widget_and_position(position - 1)
+
+    def _widget_and_position(self, position: int) -> t.Tuple[t.Optional[urwid.Widget], t.Optional[int]]:
+        widget = self._widget_at(position)
+        return (widget, position) if widget is not None else (None, None)
+
+    def positions(self, reverse: bool = False) -> t.Iterable[int]:
+        return range(len(self) - 1, -1, -1) if reverse else range(len(self))
+
+    def update(self, elements: t.Iterable[t.Any]):
+        focused_key = self._key_at(self.focus)
+
+        elements = {self.get_key(element): element for element in elements}
+        for key in self._elements.keys() - elements.keys():
+            self._remove(key)
+
+        for key, element in elements.items():
+            self._elements[key] = element
+            self._set_cell_lengths(key, tuple(len(str(getattr(element, f))) for f in self.fields))
+            indexed_changed = self.search is not None and self.search.update(key, element)
+            if self.get_sort_value:
+                sort_value = self.get_sort_value(element)
+            else:  # unsorted lists keep the order elements were first seen in
+                sort_value = self._sort_values[key] if key in self._sort_values else self._next_sequence()
+            self._set_sort_value(key, sort_value, indexed_changed)
+
+        widths = [
+            max(len(c), max(lengths, default=0)) + 2 for c, lengths in zip(self.columns, self._lengths)
+        ]
+        if widths != self.widths:
+            self.widths = widths
+            self.header.set_text(self._label(self.columns))
+        for key, row in self._rows.items():
+            label = self._element_label(key)
+            if label != row.icon.text:
+                row.set_label(label)
+
+        self._refocus(focused_key)
+
+    def set_query(self, query: Query):
+        """Shows only the elements matching the query, every element for an empty one."""
+        focused_key = self._key_at(self.focus)
+        self.query = query
+        if query:
+            self._matches = self.search.search(query)
+            self._shown = sorted((self._sort_values[key], key) for key in self._matches)
+        else:
+            self._matches, self._shown = set(), None
+        self._refocus(focused_key)
+
+    def _refocus(self, focused_key: t.Any):
+        if focused_key in self._elements and self._is_shown(focused_key):
+            self.focus = self._index_of(focused_key)
+        elif self._displayed:
+            self.focus = max(1, min(self.focus, len(self._displayed)))
+        else:
+            self.focus = 0
+        self._modified()
+
+    def _is_shown(self, key: t.Any) -> bool:
+        return self._shown is None or key in self._matches
+
+    def _label(self, cells: t.Iterable[str]) -> str:
+        return ''.join(cell + ' ' * (width - len(cell)) for cell, width in zip(cells, self.widths))
+
+    def _element_label(self, key: t.Any) -> str:
+        element = self._elements[key]
+        return self._label(str(getattr(element, f)) for f in self.fields)
+
+    def _widget_at(self, position: int) -> t.Optional[urwid.Widget]:
+        if position < 0:
+            return None
+        if position == 0:
+            return self.header
+        key = self._key_at(position)
+        if key is None:
+            return None
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+            return row
+
+        label = self._element_label(key)
+        if len(self._rows) >= self.cache_size:
+            _, row = self._rows.popitem(last=False)
+            row.set_label(label)
+        else:
+            row = KeyedRow(label, on_select=self._select)
+        row.key = key
+        self._rows[key] = row
+        return row
+
+    def _set_cell_lengths(self, key: t.Any, cell_lengths: t.Tuple[int, ...]):
+        previous = self._cell_lengths.get(key, ())
+        if cell_lengths == previous:
+            return
+        for lengths, length in zip(self._lengths, previous):
+            lengths[length] -= 1
+            if not lengths[length]:
+                del lengths[length]
+        for lengths, length in zip(self._lengths, cell_lengths):
+            lengths[length] += 1
+        if cell_lengths:
+            self._cell_lengths[key] = cell_lengths
+        else:
+            del self._cell_lengths[key]
+
+    def _next_sequence(self) -> int:
+        self._sequence -= 1
+        return self._sequence
+
+    def _set_sort_value(self, key: t.Any, sort_value: t.Any, indexed_changed: bool = False):
+        known = key in self._sort_values
+        matched = key in self._matches
+        # only an element whose indexed values changed can start or stop matching
+        matches = self.search.matches(self.query, key) if self.query and indexed_changed else matched
+        if known and sort_value == self._sort_values[key] and matches == matched:
+            return
+        if known:
+            self._unplace(key)
+        self._place(key, sort_value, matches)
+
+    def _remove(self, key: t.Any):
+        self._unplace(key)
+        if self.search is not None:
+            self.search.remove(key)
+        self._set_cell_lengths(key, ())
+        self._rows.pop(key, None)
+        del self._elements[key]
+
+    def _place(self, key: t.Any, sort_value: t.Any, matches: bool = False):
+        self._sort_values[key] = sort_value
+        bisect.insort(self._order, (sort_value, key))
+        if self.query and matches:
+            self._matches.add(key)
+            bisect.insort(self._shown, (sort_value, key))
+
+    def _unplace(self, key: t.Any):
+        entry = (self._sort_values.pop(key), key)
+        del self._order[bisect.bisect_left(self._order, entry)]
+        if key in self._matches:
+            self._matches.discard(key)
+            del self._shown[bisect.bisect_left(self._shown, entry)]
+
+    def _index_of(self, key: t.Any) -> int:
+        return len(self._displayed) - bisect.bisect_left(self._displayed, (self._sort_values[key], key))
+
+    def _key_at(self, position: int) -> t.Optional[t.Any]:
+        displayed = self._displayed
+        if 1 <= position <= len(displayed):
+            return displayed[len(displayed) - position][1]
+
+    def _select(self, key: t.Any, button: urwid.Widget):
+        self.on_select(self._elements[key], button)
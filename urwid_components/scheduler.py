@@ -0,0 +1,74 @@
+import urwid
+
+FRAME = 1 / 30
+
+
+class RefreshScheduler:
+    """
+    Central place deciding when screens redraw and poll. Redraws requested within one frame are coalesced
+    into a single `draw_screen`, nothing is drawn unless one was requested, and screens covered by a dialog
+    wait in `until_shown` instead of polling.
+    """
+
+    def __init__(self, loop: urwid.MainLoop, frame: float = FRAME):
+        self.loop = loop
+        self.frame = frame
+        self.pending = True  # the first frame
+        self._redraw = None
+        self._widget_changed = None  # asyncio.Future while a covered screen waits in until_shown
+
+    def request_redraw(self):
+        self.pending = True
+        if self._redraw is None:
+            self._redraw = self.loop.set_alarm_in(self.frame, self._draw)
+
+    def draw_pending(self):
+        if self.pending:
+            self.loop.draw_screen()
+
+    def _draw(self, loop: urwid.MainLoop, user_data=None):
+        self._redraw = None
+        self.draw_pending()
+
+    def is_shown(self, widget: urwid.Widget) -> bool:
+        return self.loop.widget is widget
+
+    async def until_shown(self, widget: urwid.Widget):
+        import asyncio  # imported by the event loop long before anything awaits this, kept off the startup path
+
+        while not self.is_shown(widget):
+            if self._widget_changed is None:
+                self._widget_changed = asyncio.get_running_loop().create_future()
+            await asyncio.shield(self._widget_changed)
+
+    def widget_changed(self):
+        """Called by the main loop whenever its top widget is replaced."""
+        changed, self._widget_changed = self._widget_changed, None
+        if changed is not None and not changed.done():
+            changed.set_result(None)
+
+
+class ScheduledMainLoop(urwid.MainLoop):
+    def __init__(self, *args, **kwargs):
+        self.scheduler = RefreshScheduler(self)
+        super().__init__(*args, **kwargs)
+
+    @urwid.MainLoop.widget.setter
+    def widget(self, widget: urwid.Widget):
+        urwid.MainLoop.widget.fset(self, widget)
+        self.scheduler.pending = True
+        self.scheduler.widget_changed()
+
+    def entering_idle(self):
+        # urwid's asyncio loop fakes idleness with a 1/30 s timer, drawing on every one of them would redraw
+        # an unchanged screen 30 times a second
+        if self.screen.started:
+            self.scheduler.draw_pending()
+
+    def process_input(self, keys) -> bool:
+        self.scheduler.pending = True  # keys change the widgets, resizes and ctrl-l the screen
+        return super().process_input(keys)
+
+    def draw_screen(self):
+        self.scheduler.pending = False
+        super().draw_screen()
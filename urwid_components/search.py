@@ -0,0 +1,312 @@
+"""
+Incremental search over the rows of a `KeyedListWalker`.
+
+    home ^net "my wifi" channel:1..6 power:40.. privacy:wpa2
+
+A plain word matches a substring of any text field (ESSID, MACs, probed ESSIDs, ...), `^word` the start of one
+of their words and quotes keep spaces in a word. `field:low..high` (either side may be left open) or `field:value`
+filters a numeric field and `field:value` a keyword field, field names may be abbreviated (`ch:6`). Every term
+has to match.
+
+Text is indexed by its 1 to 3 character n-grams (longer substrings intersect the postings of their trigrams and
+verify the few candidates) and its words by a prefix trie, numbers by value with the distinct values kept sorted.
+An element is re-indexed only when its indexed values change, so a data tick costs time proportional to what
+changed and a query time proportional to what matches, not to the number of elements.
+"""
+import bisect
+import dataclasses
+import functools
+import re
+import typing as t
+
+import urwid
+
+NGRAM = 3
+WORDS = re.compile(r'[^\s,]+')
+TERMS = re.compile(r'"([^"]*)"?|(\S+)')  # an unterminated quote runs to the end, as while it is being typed
+EMPTY: t.FrozenSet = frozenset()
+
+Getter = t.Callable[[t.Any], t.Any]
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class Term:
+    kind: str  # 'substring', 'prefix', 'range' or 'keyword'
+    text: str = ''
+    field: t.Optional[str] = None
+    low: t.Optional[float] = None
+    high: t.Optional[float] = None
+
+
+Query = t.Tuple[Term, ...]
+
+
+@functools.lru_cache(maxsize=1024)
+def _keywords(value: str) -> t.FrozenSet[str]:
+    """Keyword fields (privacy, ...) take a handful of distinct values, split once each."""
+    return frozenset(WORDS.findall(value.lower()))
+
+
+def _ngrams(text: str) -> t.Set[str]:
+    return {text[i:i + n] for n in range(1, NGRAM + 1) for i in range(len(text) - n + 1)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'keys')
+
+    def __init__(self):
+        self.children: t.Dict[str, _TrieNode] = {}
+        self.keys: t.Set[t.Hashable] = set()  # every key with a word starting with the path to this node
+
+
+class PrefixTrie:
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def add(self, word: str, key: t.Hashable):
+        node = self.root
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            child.keys.add(key)
+            node = child
+
+    def discard(self, words: t.Iterable[str], key: t.Hashable):
+        """Removes all words of the key at once, a shared prefix would be lost removing them one by one."""
+        for word in words:
+            node = self.root
+            for char in word:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.keys.discard(key)
+                if not child.keys:  # nothing below it either
+                    del node.children[char]
+                    break
+                node = child
+
+    def find(self, prefix: str) -> t.AbstractSet[t.Hashable]:
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return EMPTY
+        return node.keys
+
+
+class TextIndex:
+    def __init__(self):
+        self.texts: t.Dict[t.Hashable, str] = {}
+        self.ngrams: t.Dict[str, t.Set[t.Hashable]] = {}
+        self.words = PrefixTrie()
+
+    def set(self, key: t.Hashable, text: t.Optional[str]):
+        previous = self.texts.get(key)
+        if text == previous:
+            return
+        old_grams = _ngrams(previous) if previous is not None else EMPTY
+        new_grams = _ngrams(text) if text is not None else EMPTY
+        for gram in old_grams - new_grams:
+            keys = self.ngrams[gram]
+            keys.discard(key)
+            if not keys:
+                del self.ngrams[gram]
+        for gram in new_grams - old_grams:
+            self.ngrams.setdefault(gram, set()).add(key)
+        if previous is not None:
+            self.words.discard(set(WORDS.findall(previous)), key)
+            del self.texts[key]
+        if text is not None:
+            for word in set(WORDS.findall(text)):
+                self.words.add(word, key)
+            self.texts[key] = text
+
+    def substring(self, text: str) -> t.AbstractSet[t.Hashable]:
+        if len(text) <= NGRAM:
+            return self.ngrams.get(text, EMPTY)
+        postings = sorted(
+            (self.ngrams.get(text[i:i + NGRAM], EMPTY) for i in range(len(text) - NGRAM + 1)), key=len
+        )
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {key for key in candidates if text in self.texts[key]}
+
+    def prefix(self, text: str) -> t.AbstractSet[t.Hashable]:
+        return self.words.find(text)
+
+
+class RangeIndex:
+    def __init__(self):
+        self.values: t.Dict[t.Hashable, float] = {}
+        self.postings: t.Dict[float, t.Set[t.Hashable]] = {}
+        self.sorted_values: t.List[float] = []  # distinct
+
+    def set(self, key: t.Hashable, value: t.Optional[float]):
+        previous = self.values.get(key)
+        if value == previous:
+            return
+        if previous is not None:
+            keys = self.postings[previous]
+            keys.discard(key)
+            if not keys:
+                del self.postings[previous]
+                del self.sorted_values[bisect.bisect_left(self.sorted_values, previous)]
+            del self.values[key]
+        if value is not None:
+            keys = self.postings.get(value)
+            if keys is None:
+                keys = self.postings[value] = set()
+                bisect.insort(self.sorted_values, value)
+            keys.add(key)
+            self.values[key] = value
+
+    def range(self, low: t.Optional[float], high: t.Optional[float]) -> t.Set[t.Hashable]:
+        start = 0 if low is None else bisect.bisect_left(self.sorted_values, low)
+        end = len(self.sorted_values) if high is None else bisect.bisect_right(self.sorted_values, high)
+        return set().union(*(self.postings[value] for value in self.sorted_values[start:end]))
+
+
+class KeywordIndex:
+    def __init__(self):
+        self.keywords: t.Dict[t.Hashable, t.FrozenSet[str]] = {}
+        self.postings: t.Dict[str, t.Set[t.Hashable]] = {}
+
+    def set(self, key: t.Hashable, keywords: t.FrozenSet[str]):
+        previous = self.keywords.get(key, EMPTY)
+        if keywords == previous:
+            return
+        for keyword in previous - keywords:
+            keys = self.postings[keyword]
+            keys.discard(key)
+            if not keys:
+                del self.postings[keyword]
+        for keyword in keywords - previous:
+            self.postings.setdefault(keyword, set()).add(key)
+        if keywords:
+            self.keywords[key] = keywords
+        else:
+            del self.keywords[key]
+
+    def find(self, keyword: str) -> t.AbstractSet[t.Hashable]:
+        return self.postings.get(keyword, EMPTY)
+
+
+class SearchIndex:
+    """
+    `text` returns the strings searched by plain words, `numbers` and `keywords` the named fields
+    (None leaves an element out of range filters, keywords are the words of the returned string).
+    """
+
+    def __init__(
+            self,
+            text: t.Callable[[t.Any], t.Iterable[str]],
+            numbers: t.Optional[t.Dict[str, Getter]] = None,
+            keywords: t.Optional[t.Dict[str, Getter]] = None,
+    ):
+        self.get_text = text
+        self.get_numbers = dict(numbers or {})
+        self.get_keywords = dict(keywords or {})
+        self.text = TextIndex()
+        self.numbers = {name: RangeIndex() for name in self.get_numbers}
+        self.keywords = {name: KeywordIndex() for name in self.get_keywords}
+
+    def __len__(self) -> int:
+        return len(self.text.texts)
+
+    def update(self, key: t.Hashable, element: t.Any) -> bool:
+        """Re-indexes whatever changed in the element, returns whether anything did."""
+        changed = False
+        text = '\n'.join(self.get_text(element)).lower()
+        if text != self.text.texts.get(key):
+            self.text.set(key, text)
+            changed = True
+        for name, get_number in self.get_numbers.items():
+            index, value = self.numbers[name], get_number(element)
+            if value != index.values.get(key):
+                index.set(key, value)
+                changed = True
+        for name, get_keyword in self.get_keywords.items():
+            index, keywords = self.keywords[name], _keywords(str(get_keyword(element)))
+            if keywords != index.keywords.get(key, EMPTY):
+                index.set(key, keywords)
+                changed = True
+        return changed
+
+    def remove(self, key: t.Hashable):
+        self.text.set(key, None)
+        for index in self.numbers.values():
+            index.set(key, None)
+        for index in self.keywords.values():
+            index.set(key, EMPTY)
+
+    def parse(self, text: str) -> Query:
+        """Raises ValueError on a malformed field filter."""
+        words = (match.group(1) if match.group(1) is not None else match.group(2) for match in TERMS.finditer(text))
+        return tuple(self._term(word) for word in words if word)
+
+    def _term(self, word: str) -> Term:
+        word = word.lower()
+        if word.startswith('^') and len(word) > 1:
+            return Term('prefix', word[1:])
+        name, _, value = word.partition(':')
+        fields = [field for field in (*self.get_numbers, *self.get_keywords) if field.startswith(name)] if name else []
+        if not value or not fields:  # MACs have colons too
+            return Term('substring', word)
+        if len(fields) > 1:
+            raise ValueError(f'{name}: is ambiguous')
+        field, = fields
+        if field in self.get_keywords:
+            return Term('keyword', value, field=field)
+        low, separator, high = value.partition('..')
+        try:
+            low = float(low) if low else None
+            high = (float(high) if high else None) if separator else low
+        except ValueError:
+            raise ValueError(f'{field}: not a range') from None
+        return Term('range', field=field, low=low, high=high)
+
+    def search(self, query: Query) -> t.Set[t.Hashable]:
+        """Keys of the elements matching every term, smallest result sets intersected first."""
+        results = sorted((self._find(term) for term in query), key=len)
+        if not results:
+            return set(self.text.texts)
+        return set(results[0]).intersection(*results[1:])
+
+    def _find(self, term: Term) -> t.AbstractSet[t.Hashable]:
+        if term.kind == 'substring':
+            return self.text.substring(term.text)
+        if term.kind == 'prefix':
+            return self.text.prefix(term.text)
+        if term.kind == 'keyword':
+            return self.keywords[term.field].find(term.text)
+        return self.numbers[term.field].range(term.low, term.high)
+
+    def matches(self, query: Query, key: t.Hashable) -> bool:
+        """Checks one indexed element against the query without going through the postings."""
+        return all(self._matches(term, key) for term in query)
+
+    def _matches(self, term: Term, key: t.Hashable) -> bool:
+        if term.kind == 'substring':
+            return term.text in self.text.texts.get(key, '')
+        if term.kind == 'prefix':
+            return any(word.startswith(term.text) for word in WORDS.findall(self.text.texts.get(key, '')))
+        if term.kind == 'keyword':
+            return term.text in self.keywords[term.field].keywords.get(key, EMPTY)
+        value = self.numbers[term.field].values.get(key)
+        return value is not None and (term.low is None or term.low <= value) and (term.high is None or value <= term.high)
+
+
+class FilterBar(urwid.WidgetWrap):
+    """A one line query editor calling `on_change` with the text after every keystroke."""
+
+    def __init__(self, on_change: t.Callable[[str], None]):
+        self.edit = urwid.Edit('/')
+        self.status = urwid.Text('', align=urwid.RIGHT, wrap=urwid.CLIP)
+        urwid.connect_signal(self.edit, 'postchange', lambda edit, previous: on_change(edit.get_edit_text()))
+        super().__init__(urwid.Columns([self.edit, (24, self.status)], dividechars=1))
+
+    def clear(self):
+        self.edit.set_edit_text('')
+
+    def set_status(self, status: str):
+        self.status.set_text(status)
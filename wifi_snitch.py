@@ -1,40 +1,103 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
+import argparse
 import functools
 import operator
 import os
-import shutil
 import traceback
 import typing as t
 
 import urwid
 
-from aircrack.aireplay import Aireplay
-from aircrack.airmon import Airmon
-from aircrack.airodump import Airodump
-from aircrack.cowpatty import Cowpatty
+# Only what the adapter screen needs is imported up front, asyncio and the capture machinery are loaded
+# after the first frame (see Application) or when a screen needs them.
+from aircrack.adapters import get_wifi_adapters
+from aircrack.metrics import metrics
 from aircrack.models import WifiAdapter, AccessPoint, Station
 
-from urwid_components import SimpleButton, OkDialog, StyledButton, Dialog
+from urwid_components import OkDialog, StyledButton, Dialog
+from urwid_components.keyed_list import KeyedListWalker
+from urwid_components.search import FilterBar, SearchIndex
+from urwid_components.scheduler import ScheduledMainLoop
+
+if t.TYPE_CHECKING:
+    import asyncio
+
+    from aircrack.aireplay import DeauthProgress
+    from aircrack.capture_session import CaptureSession
+    from aircrack.retention import RetentionPolicy
 
 PALETTE = [
     ('banner', 'dark red', ''),
     ('reversed', 'standout', ''),
+    ('hud', 'dark cyan', ''),
 ]
+HUD_REFRESH = 1
+METRICS_PATH = '.aircrack-ng/metrics.json'
+TRACE_PATH = '.aircrack-ng/trace.json'
+DEAUTH_COUNT = 5
+DEAUTH_TIMEOUT = 30
+
+
+class Logo(urwid.WidgetWrap):
+    """The banner is static, so it is rendered once per width and the canvas is reused by every screen."""
+
+    def __init__(self):
+        self.canvases: t.Dict[t.Tuple[int, ...], urwid.Canvas] = {}
+        super().__init__(urwid.Pile(
+            [
+                urwid.Padding(
+                    urwid.BigText(('banner', "WiFi Snitch"), urwid.Thin6x6Font()),
+                    width="clip",
+                    align=urwid.CENTER,
+                ),
+                urwid.Divider(),
+            ]
+        ))
+
+    def render(self, size, focus=False):
+        canvas = self.canvases.get(size)
+        if canvas is None:
+            canvas = self.canvases[size] = super().render(size, focus)
+        return canvas
+
+
+@functools.lru_cache(maxsize=None)
+def logo() -> Logo:
+    return Logo()
+
 
-LOGO = urwid.Pile(
-    [
-        urwid.Padding(
-            urwid.BigText(('banner', "WiFi Snitch"), urwid.Thin6x6Font()),
-            width="clip",
-            align=urwid.CENTER,
-        ),
-        urwid.Divider(),
-    ]
-)
 BACKGROUND = urwid.AttrMap(urwid.SolidFill('.'), 'bg')
 
 
+def signal(element: t.Union[AccessPoint, Station]) -> t.Optional[int]:
+    """The power as the percentage shown in the lists, None when unknown."""
+    return None if element.power == -1 else 100 - abs(round(element.power))
+
+
+def access_point_search() -> SearchIndex:
+    return SearchIndex(
+        text=lambda access_point: (
+            access_point.essid,
+            access_point.bssid_human,
+            access_point.vendor,
+            *(station.station_mac_human for station in access_point.stations),
+            *(station.probed_essids for station in access_point.stations),
+        ),
+        numbers={'channel': operator.attrgetter('channel'), 'power': signal},
+        keywords={'privacy': operator.attrgetter('privacy')},
+    )
+
+
+def station_search() -> SearchIndex:
+    return SearchIndex(
+        text=lambda station: (station.station_mac_human, station.bssid_human, station.vendor, station.probed_essids),
+        numbers={'power': signal},
+    )
+
+
 class MainOverlay(urwid.Overlay):
     def __init__(self, widget: urwid.Widget):
         super().__init__(
@@ -52,6 +115,12 @@ def close_app(*args):
     raise urwid.ExitMainLoop()
 
 
+class MainLoop(ScheduledMainLoop):
+    @metrics.timed('ui.draw_screen')
+    def draw_screen(self):
+        super().draw_screen()
+
+
 class SelectableListView(urwid.WidgetWrap):
     def __init__(
             self,
@@ -60,7 +129,9 @@ class SelectableListView(urwid.WidgetWrap):
             title: str,
             columns: t.Iterable[str],
             fields: t.Iterable[str],
+            key: str,
             sort_by: t.Optional[str] = None,
+            search: t.Optional[SearchIndex] = None,
     ):
         self.loop = loop
 
@@ -70,184 +141,373 @@ class SelectableListView(urwid.WidgetWrap):
         self.fields = list(fields)
         self.sort_by = sort_by
 
-        self.elements_list_widget = urwid.ListBox(urwid.SimpleFocusListWalker([]))
-        self.update_list_widget()
+        self.tasks: t.List[asyncio.Future] = []
+        self.filter_bar = FilterBar(self.set_filter) if search is not None else None
 
-        header = urwid.Pile([LOGO, urwid.Text(f'-=-=- {self.title} -=-=-', align=urwid.CENTER), urwid.Divider()])
-        main = urwid.LineBox(
-            urwid.Padding(
-                urwid.Frame(header=header, body=self.elements_list_widget),
-                left=1,
-                right=1,
-            )
+        self.elements_walker = KeyedListWalker(
+            self.columns, self.fields, key=key, on_select=self.select_element, sort_by=self.sort_by, search=search
         )
+        self.elements_list_widget = urwid.ListBox(self.elements_walker)
+        self.update_list_widget()
+
+        self.title_widget = urwid.Text(f'-=-=- {self.title} -=-=-', align=urwid.CENTER)
+        self.hud_widget = urwid.Text(('hud', ''), align=urwid.CENTER)
+        self.hud_alarm = None
+        self.header = urwid.Pile([logo(), self.title_widget, urwid.Divider()])
+        if self.filter_bar is not None:
+            self.header.contents.insert(2, (self.filter_bar, self.header.options()))
+        self.frame = urwid.Frame(header=self.header, body=self.elements_list_widget)
+        main = urwid.LineBox(urwid.Padding(self.frame, left=1, right=1))
 
         super().__init__(MainOverlay(main))
+        if metrics.enabled:
+            self.toggle_hud()
 
+    def set_title(self, title: str):
+        self.title = title
+        self.title_widget.set_text(f'-=-=- {self.title} -=-=-')
+
+    @metrics.timed('ui.update_list_widget')
     def update_list_widget(self):
-        widths = [
-            max(len(c), max([len(str(getattr(element, f))) for element in self.elements] or [0])) + 2
-            for c, f in zip(self.columns, self.fields)
-        ]
-
-        def get_column(text: str, index: int):
-            return text + ' ' * (widths[index] - len(text))
-
-        focus = self.elements_list_widget.get_focus()[1]
-
-        header = urwid.Text(''.join(get_column(c, i) for i, c in enumerate(self.columns)))
-        self.elements_list_widget._set_body([header] + [
-            SimpleButton(
-                ''.join(get_column(str(getattr(element, f)), i) for i, f in enumerate(self.fields)),
-                on_press=functools.partial(self.select_element, element),
-            )
-            for element in (
-                sorted(self.elements, key=operator.attrgetter(self.sort_by), reverse=True)
-                if self.sort_by else self.elements
-            )
-        ])
-
-        if self.elements:
-            focus = focus and min(focus, len(self.elements)) or 1
-            self.elements_list_widget.set_focus(focus)
+        self.elements_walker.update(self.elements)
+        if self.filter_bar is not None:
+            self.update_filter_status()
+
+    @property
+    def filtering(self) -> bool:
+        """Whether keys go to the filter bar."""
+        return self.filter_bar is not None and self.frame.focus_position == 'header'
+
+    def set_filter(self, text: str):
+        try:
+            query = self.elements_walker.search.parse(text)
+        except ValueError as e:
+            self.filter_bar.set_status(str(e))
+            return
+        with metrics.timer('ui.filter'):
+            self.elements_walker.set_query(query)
+        self.update_filter_status()
+
+    def update_filter_status(self):
+        walker = self.elements_walker
+        self.filter_bar.set_status(f'{walker.shown}/{walker.total}' if walker.query else '')
+
+    def keypress(self, size, key: str):
+        if self.filtering:
+            if key in ('enter', 'down', 'tab'):
+                self.frame.focus_position = 'body'
+                return
+            if key == 'esc':
+                self.filter_bar.clear()
+                self.frame.focus_position = 'body'
+                return
+        elif key == '/' and self.filter_bar is not None:
+            self.frame.focus_position = 'header'
+            self.header.set_focus(self.filter_bar)
+            return
+        if key == 'f2':
+            metrics.enabled = not metrics.enabled
+            self.toggle_hud()
+            return
+        if key == 'f3':
+            metrics.export_json(METRICS_PATH)
+            metrics.export_chrome_trace(TRACE_PATH)
+            self.hud_widget.set_text(('hud', f'exported {METRICS_PATH} and {TRACE_PATH}'))
+            return
+        return super().keypress(size, key)
+
+    def toggle_hud(self):
+        """Shows the rolling p50/p99 of every timer under the title while metrics are enabled."""
+        if metrics.enabled and self.hud_alarm is None:
+            self.header.contents.insert(2, (self.hud_widget, self.header.options()))
+            self.update_hud()
+        elif not metrics.enabled and self.hud_alarm is not None:
+            self.loop.remove_alarm(self.hud_alarm)
+            self.hud_alarm = None
+            self.header.contents.remove((self.hud_widget, self.header.options()))
+
+    def update_hud(self, *args):
+        self.hud_widget.set_text(('hud', f'p50/p99 {metrics.hud()}'))
+        self.loop.scheduler.request_redraw()
+        self.hud_alarm = self.loop.set_alarm_in(HUD_REFRESH, self.update_hud)
 
     def select_element(self, element: t.Any, button):
         pass
 
+    async def until_shown(self):
+        """Background polling waits here while a dialog covers the list."""
+        await self.loop.scheduler.until_shown(self)
+
+    def run_in_background(self, coroutine: t.Coroutine):
+        import asyncio
+
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(self._task_done)
+        self.tasks.append(task)
+
+    def stop_background_tasks(self):
+        """Cancels the polling of this screen, except the task calling this (it is switching screens)."""
+        import asyncio
+
+        if self.hud_alarm is not None:
+            self.loop.remove_alarm(self.hud_alarm)
+            self.hud_alarm = None
+        current = asyncio.current_task()
+        for task in self.tasks:
+            if task is not current:
+                task.cancel()
+        self.tasks.clear()
+
+    def _task_done(self, task: asyncio.Future):
+        if task in self.tasks:
+            self.tasks.remove(task)
+        if not task.cancelled() and task.exception():
+            self.loop.widget = OkDialog(self, self.loop, str(task.exception()), title='Error')
+            self.loop.scheduler.request_redraw()
+
 
 class DeAuthDialog(urwid.WidgetWrap):
-    def __init__(self, parent: urwid.Widget, loop: urwid.MainLoop, adapter: WifiAdapter, station: Station, count: int):
+    """Deauthenticates one station in the background, showing aireplay-ng's progress live until it is done."""
+
+    def __init__(
+            self, parent: SelectableListView, loop: urwid.MainLoop, adapter: WifiAdapter, station: Station, count: int
+    ):
+        from aircrack.aireplay import Aireplay
+
         self.loop = loop
-        self.adapter = adapter
-        body = urwid.Filler(StyledButton("OK", on_press=self.close))
+        self.parent = parent
+        self.station = station
+        self.aireplay = Aireplay(adapter, station, count, timeout=DEAUTH_TIMEOUT, on_progress=self.update_progress)
+        self.body = urwid.WidgetPlaceholder(urwid.Filler(StyledButton("CANCEL", on_press=self.cancel)))
         self.dialog = Dialog(
-            body,
-            message=f'Sending {count} deauth packets for MAC:[{station.station_mac}]',
+            self.body,
+            message=f'Sending {count} deauth rounds for MAC:[{station.station_mac_human}]',
             title='aireplay-ng',
         )
         widget = urwid.Overlay(
-            self.dialog, parent, align=urwid.CENTER, valign=urwid.MIDDLE, width=40, height=10
+            self.dialog, parent, align=urwid.CENTER, valign=urwid.MIDDLE, width=50, height=12
         )
-        self.aireplay = Aireplay(wifi_adapter=self.adapter, station=station, count=count)
         super().__init__(widget)
-        self.loop.set_alarm_in(1, self.update_progress, None)
-
-    def update_progress(self):
-        print('LOL')
-        self.dialog.set_message(f'lefhisubgvpergbip {self.aireplay.fetch_progress()}')
-        self.loop.set_alarm_in(1, self.update_progress, None)
+        parent.run_in_background(self.run())
+
+    async def run(self):
+        await self.aireplay.run()
+        self.body.original_widget = urwid.Filler(StyledButton("OK", on_press=self.close))
+        self.loop.scheduler.request_redraw()
+
+    def update_progress(self, progress: DeauthProgress):
+        sent, station_acks, access_point_acks = progress.totals
+        acks = f'ACKs: {station_acks} from the station, {access_point_acks} from the AP'
+        if progress.cancelled:
+            message = f'Cancelled after {sent} packets\n{acks}'
+        elif progress.timed_out:
+            message = f'Timed out after {sent} packets\n{acks}'
+        elif progress.done and progress.returncode:
+            message = f'aireplay-ng failed: {progress.message}'
+        elif progress.done:
+            message = f'Sent {sent} deauth packets to MAC:[{self.station.station_mac_human}]\n{acks}'
+        else:
+            message = f'Round {min(progress.rounds + 1, progress.count)}/{progress.count}, {sent} packets sent\n{acks}'
+        self.dialog.set_message(message)
+        self.loop.scheduler.request_redraw()
+
+    def cancel(self, button):
+        self.aireplay.cancel()
 
     def close(self, button):
-        self.loop.widget = self._w.bottom_w
+        self.loop.widget = self.parent
 
 
 class NetworkScreen(SelectableListView):
-    def __init__(self, loop: urwid.MainLoop, adapter: WifiAdapter, network: AccessPoint):
-        self.adapter = adapter
+    def __init__(self, loop: urwid.MainLoop, session: CaptureSession, network: AccessPoint):
+        from aircrack.handshake import HandshakeDetector
+
+        self.session = session
+        self.adapter = session.adapters[0]
         self.network = network
-        self.airodump = Airodump(adapter.interface, access_point=self.network)
+        self.handshake_detector = HandshakeDetector(self.network.bssid)
         self.captured_handshake = ''
 
         super().__init__(
             loop,
             elements=[],
-            title=f'{self.network.essid}[{self.network.bssid}]',
-            columns=['BSSID', 'MAC', 'Power', 'Packets'],
-            fields=['bssid', 'station_mac', 'power_human', 'packets'],
-            sort_by='power_human',
+            title=f'{self.network.essid}[{self.network.bssid_human}]',
+            columns=['BSSID', 'MAC', 'Vendor', 'Power', 'Packets'],
+            fields=['bssid_human', 'station_mac_human', 'vendor', 'power_human', 'packets'],
+            key='station_mac',
+            sort_by='smoothed_power',
+            search=station_search(),
         )
-        self.loop.set_alarm_in(1, self.fetch_network, None)
-
-    def fetch_network(self, *args):
-        try:
-            self.network = self.airodump.fetch()[0]
-            self.elements = self.network.stations
-            self.update_list_widget()
-        except ValueError:
-            pass
-        self.loop.set_alarm_in(1, self.fetch_network, None)
-
-        cap_file = self.airodump.get_latest_file('.cap')
-        if cap_file != self.captured_handshake and Cowpatty.contains_valid_handshake(cap_file):
-            self.captured_handshake = cap_file
-            path = f'{self.network.essid}-{self.network.bssid}.cap'
-            shutil.copyfile(cap_file, path)
-            self.loop.widget = OkDialog(
-                self, self.loop, f'Captured WPA handshake under {path}', title='Success'
-            )
-        self.loop.draw_screen()
+        self.run_in_background(self.fetch_network())
+        self.run_in_background(self.watch_handshake())
+
+    async def fetch_network(self):
+        await self.session.tune_async([self.network.channel])
+        async for _ in self.session.stream_data(until_active=self.until_shown):
+            network = self.session.access_points.get(self.network.bssid)
+            if network:
+                self.network = network
+                self.elements = self.network.stations
+                self.update_list_widget()
+                self.loop.scheduler.request_redraw()
+
+    async def watch_handshake(self):
+        import asyncio
+
+        from aircrack.airodump import MAX_REFRESH
+        from aircrack.compaction import compact
+
+        while True:
+            for cap_file in self.session.latest_captures():
+                if (
+                        cap_file != self.captured_handshake
+                        and self.handshake_detector.contains_valid_handshake(cap_file)
+                ):
+                    self.captured_handshake = cap_file
+                    path = f'{self.network.essid}-{self.network.bssid_human}.cap'
+                    # only the beacon and the handshake are kept, streamed off the event loop
+                    await asyncio.get_running_loop().run_in_executor(None, compact, cap_file, path, self.network.bssid)
+                    self.loop.widget = OkDialog(
+                        self, self.loop, f'Captured WPA handshake under {path}', title='Success'
+                    )
+                    self.loop.scheduler.request_redraw()
+            await self.session.wait_for_change(MAX_REFRESH)
 
     def select_element(self, element: Station, button):
-        count = 5
-        Aireplay.send_deauth(wifi_adapter=self.adapter, station=element, count=count)
-        self.loop.widget = OkDialog(
-            self, self.loop, f'Sent {count} deauth packets for MAC:[{element.station_mac}]', title='Aireplay'
-        )
+        self.loop.widget = DeAuthDialog(self, self.loop, self.adapter, element, count=DEAUTH_COUNT)
 
     def keypress(self, size, key: str):
-        if key == 'esc':
-            self.loop.widget = NetworkListScreen(self.loop, self.adapter)
-        super().keypress(size, key)
+        if key == 'esc' and not self.filtering:
+            self.stop_background_tasks()
+            self.loop.widget = NetworkListScreen(self.loop, self.session)
+            return
+        return super().keypress(size, key)
 
 
 class NetworkListScreen(SelectableListView):
-    def __init__(self, loop: urwid.MainLoop, adapter: WifiAdapter):
-        if not adapter.monitoring_enabled:
-            Airmon.start_monitoring(adapter)
-
-        self.airodump = Airodump(adapter.interface)
-        self.adapter = adapter
+    def __init__(self, loop: urwid.MainLoop, session: CaptureSession):
+        self.session = session
 
         super().__init__(
             loop,
             elements=[],
             title='Available Networks',
-            columns=['BSSID', 'ESSID', 'Channel', 'Stations', 'Power', 'Speed', 'Privacy', 'Cipher', 'Authentication'],
-            fields=['bssid', 'essid', 'channel', 'num_stations', 'power_human', 'speed', 'privacy', 'cipher', 'authentication'],
-            sort_by='power_human',
+            columns=['BSSID', 'Vendor', 'ESSID', 'Channel', 'Stations', 'Power', 'Speed', 'Privacy', 'Cipher', 'Authentication'],
+            fields=['bssid_human', 'vendor', 'essid', 'channel', 'num_stations', 'power_human', 'speed', 'privacy', 'cipher', 'authentication'],
+            key='bssid',
+            sort_by='smoothed_power',
+            search=access_point_search(),
         )
-        self.loop.set_alarm_in(1, self.fetch_networks, None)
+        self.run_in_background(self.fetch_networks())
 
-    def fetch_networks(self, *args):
-        if not hasattr(self, 'airodump'):
-            return
-        try:
-            self.elements = self.airodump.fetch()
+    async def fetch_networks(self):
+        await self.session.tune_async(None)
+        async for access_points in self.session.stream_data(until_active=self.until_shown):
+            self.elements = access_points
             self.update_list_widget()
-        except ValueError:  # not fully written
-            pass
-        self.loop.set_alarm_in(1, self.fetch_networks, None)
+            self.loop.scheduler.request_redraw()
 
     def select_element(self, element: AccessPoint, button):
-        del self.airodump
-        self.loop.widget = NetworkScreen(self.loop, self.adapter, element)
+        self.stop_background_tasks()
+        self.loop.widget = NetworkScreen(self.loop, self.session, element)
 
 
 class WifiAdapterScreen(SelectableListView):
-    def __init__(self, loop: urwid.MainLoop, adapters: t.Iterable[WifiAdapter]):
+    TITLE = 'Select WiFi adapter (space marks several)'
+
+    def __init__(
+            self, loop: urwid.MainLoop, adapters: t.Iterable[WifiAdapter], session: t.Optional[CaptureSession] = None
+    ):
+        self.session = session  # set by the application once the capture machinery is loaded
+        self.marked: t.List[WifiAdapter] = []
         columns = ['PHY', 'Interface', 'Driver', 'Chipset']
         super().__init__(
             loop,
             elements=list(adapters),
-            title='Select WiFi adapter',
+            title=self.TITLE,
             columns=columns,
             fields=[c.lower() for c in columns],
+            key='interface',
         )
 
+    def keypress(self, size, key: str):
+        if key == ' ' and not self.filtering:
+            self.toggle_mark(self.elements_walker.focused_element)
+            return
+        return super().keypress(size, key)
+
+    def toggle_mark(self, adapter: t.Optional[WifiAdapter]):
+        if adapter is None:
+            return
+        if adapter in self.marked:
+            self.marked.remove(adapter)
+        else:
+            self.marked.append(adapter)
+        if self.marked:
+            self.set_title(f'{self.TITLE}: {", ".join(adapter.interface for adapter in self.marked)}')
+        else:
+            self.set_title(self.TITLE)
+
     def select_element(self, element: WifiAdapter, button):
-        self.loop.widget = NetworkListScreen(self.loop, adapter=element)
+        self.run_in_background(self.start_monitoring(self.marked or [element]))
+
+    async def start_monitoring(self, adapters: t.List[WifiAdapter]):
+        import asyncio
+
+        from aircrack.airmon import Airmon
+
+        await asyncio.gather(*(
+            Airmon.start_monitoring_async(adapter) for adapter in adapters if not adapter.monitoring_enabled
+        ))
+        self.stop_background_tasks()
+        await self.session.start_async(adapters)
+        self.loop.widget = NetworkListScreen(self.loop, self.session)
+        self.loop.scheduler.request_redraw()
 
 
 class Application:
-    def __init__(self):
+    def __init__(self, screen: t.Optional[urwid.BaseScreen] = None, retention: t.Optional['RetentionPolicy'] = None):
         self.main_view = None
-        self.loop = urwid.MainLoop(None, palette=PALETTE)
-
-        self.login_screen = WifiAdapterScreen(self.loop, adapters=Airmon.get_wifi_adapters())
+        self.retention = retention
+        self.loop = MainLoop(None, palette=PALETTE, screen=screen)
+        self.login_screen = WifiAdapterScreen(self.loop, adapters=get_wifi_adapters())
         self.loop.widget = self.login_screen
+        self.loop.screen.start()
+        try:
+            self.loop.draw_screen()  # the first frame, before the slow imports below
+            self.load()
+        except BaseException:
+            self.loop.screen.stop()
+            raise
+
+    def load(self):
+        import asyncio
+
+        from aircrack.archive import ScanArchive
+        from aircrack.capture_session import CaptureSession
+        from aircrack.retention import RetentionPolicy
+
+        self.event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.event_loop)
+        self.loop.event_loop = urwid.AsyncioEventLoop(loop=self.event_loop)
+        self.archive = ScanArchive()
+        self.session = CaptureSession(archive=self.archive, retention=self.retention or RetentionPolicy())
+        self.login_screen.session = self.session
+        self.event_loop.create_task(self.update_oui_index())
+
+    async def update_oui_index(self):
+        """Rebuilds the vendor index in a worker thread when the OUI list changed, the lists show it once done."""
+        from aircrack import oui
+
+        if await self.event_loop.run_in_executor(None, oui.update_index):
+            self.loop.scheduler.request_redraw()
 
     def run(self):
-        self.loop.run()
+        try:
+            self.loop.run()
+        finally:
+            self.session.stop()
+            self.archive.close()
 
 
 def check_if_root():
@@ -257,8 +517,19 @@ def check_if_root():
 
 
 if __name__ == "__main__":
-    check_if_root()
-    app = Application()
+    from aircrack import retention
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--replay', metavar='SESSION', help='play a recorded session instead of using the radio')
+    parser.add_argument('--speed', type=float, default=1, help='replay speed, 0 plays as fast as possible')
+    retention.add_arguments(parser)
+    args = parser.parse_args()
+    if args.replay:
+        from aircrack.replay import use_session
+        use_session(args.replay, args.speed)
+    else:
+        check_if_root()
+    app = Application(retention=retention.RetentionPolicy.from_args(args))
     try:
         app.run()
     except KeyboardInterrupt:
@@ -266,6 +537,7 @@ if __name__ == "__main__":
     except Exception as e:
         traceback.print_exc()
 
-    for adapter in Airmon.get_wifi_adapters():
+    from aircrack.airmon import Airmon
+    for adapter in get_wifi_adapters():
         if adapter.monitoring_enabled:
             Airmon.stop_monitoring(adapter)
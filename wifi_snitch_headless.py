@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Headless WiFi Snitch: streams access point and station updates as JSON Lines, without urwid.
+
+    ./wifi_snitch_headless.py -i wlan0mon [-i wlan1mon] [--interval 2] [--snapshots] [--socket /run/snitch.sock]
+"""
+import argparse
+import dataclasses
+import json
+import math
+import os
+import signal
+import socket
+import sys
+import time
+import typing as t
+
+from aircrack.adapters import get_wifi_adapters
+from aircrack.airmon import Airmon
+from aircrack.airodump import Airodump
+from aircrack.capture import CaptureCoordinator
+from aircrack.handshake import HandshakeDetector
+from aircrack.metrics import metrics
+from aircrack.models import AccessPoint, Station, format_mac, parse_mac
+from aircrack.replay import use_session
+from aircrack.retention import RetentionPolicy, add_arguments as add_retention_arguments
+
+MAC_FIELDS = ('bssid', 'station_mac')
+MAX_BACKLOG = 1 << 20
+
+
+def serialize(model: t.Union[AccessPoint, Station]) -> t.Dict[str, t.Any]:
+    record = {}
+    for field in dataclasses.fields(model):
+        if field.name == 'stations':
+            continue
+        value = getattr(model, field.name)
+        if field.name in MAC_FIELDS:
+            value = format_mac(value)
+        elif isinstance(value, float) and not math.isfinite(value):
+            value = None
+        record[field.name] = value
+    return record
+
+
+class DeltaTracker:
+    """Remembers the last emitted state of every device, to emit only what changed."""
+
+    def __init__(self):
+        self.access_points: t.Dict[int, t.Dict[str, t.Any]] = {}
+        self.stations: t.Dict[int, t.Dict[str, t.Any]] = {}
+
+    def deltas(self, access_points: t.List[AccessPoint]) -> t.Iterator[t.Dict[str, t.Any]]:
+        yield from self._diff(
+            'access_point', 'bssid', self.access_points,
+            {access_point.bssid: access_point for access_point in access_points},
+        )
+        yield from self._diff(
+            'station', 'station_mac', self.stations,
+            {station.station_mac: station for access_point in access_points for station in access_point.stations},
+        )
+
+    @staticmethod
+    def _diff(kind: str, key: str, previous: t.Dict[int, t.Dict[str, t.Any]], current: t.Dict[int, t.Any]):
+        for mac in previous.keys() - current.keys():
+            del previous[mac]
+            yield {'type': kind, 'event': 'gone', key: format_mac(mac)}
+        for mac, model in current.items():
+            record = serialize(model)
+            last = previous.get(mac)
+            previous[mac] = record
+            if last is None:
+                yield {'type': kind, 'event': 'new', **record}
+            elif record != last:
+                changed = {name: value for name, value in record.items() if last.get(name) != value}
+                yield {'type': kind, 'event': 'update', key: record[key], **changed}
+
+
+class Output:
+    """
+    Writes lines to stdout, or to every client connected to a UNIX socket. Clients are written to without
+    blocking: what a slow reader has not taken yet is kept for the next `flush`, and a client more than
+    `MAX_BACKLOG` bytes behind is dropped rather than holding up the capture.
+    """
+
+    def __init__(self, socket_path: t.Optional[str] = None):
+        self.server: t.Optional[socket.socket] = None
+        self.clients: t.Dict[socket.socket, bytearray] = {}  # -> what it has not been sent yet
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(socket_path)
+            self.server.listen()
+            self.server.setblocking(False)
+
+    def write(self, records: t.Iterable[t.Dict[str, t.Any]]):
+        data = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        if not data:
+            return
+        if self.server is None:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+            return
+        self._accept()
+        encoded = data.encode()
+        for backlog in self.clients.values():
+            backlog += encoded
+        self.flush()
+
+    def flush(self):
+        """Accepts new clients and sends every client as much of its backlog as it takes."""
+        if self.server is None:
+            return
+        self._accept()
+        for client, backlog in list(self.clients.items()):
+            try:
+                while backlog:
+                    del backlog[:client.send(backlog)]
+            except BlockingIOError:
+                if len(backlog) > MAX_BACKLOG:
+                    self._drop(client)
+            except OSError:
+                self._drop(client)
+
+    def _drop(self, client: socket.socket):
+        del self.clients[client]
+        client.close()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self.server.accept()
+            except BlockingIOError:
+                return
+            client.setblocking(False)
+            self.clients[client] = bytearray()
+
+
+def start_monitoring(interfaces: t.List[str]) -> t.List[str]:
+    adapters = {adapter.interface: adapter for adapter in get_wifi_adapters()}
+    monitoring = []
+    for interface in interfaces:
+        adapter = adapters.get(interface)
+        if adapter is not None and not adapter.monitoring_enabled:
+            Airmon.start_monitoring(adapter)
+            interface = adapter.interface
+        monitoring.append(interface)
+    return monitoring
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-i', '--interface', action='append', required=True, help='repeat to capture in parallel')
+    parser.add_argument('--interval', type=float, default=1, help='seconds between updates')
+    parser.add_argument('--snapshots', action='store_true', help='emit full snapshots instead of per-device deltas')
+    parser.add_argument('--socket', help='serve the stream on a UNIX socket instead of stdout')
+    parser.add_argument('--handshake', help='BSSID to watch for a WPA handshake')
+    parser.add_argument('--metrics', metavar='PATH', help='write p50/p99 timings of every stage as JSON on exit')
+    parser.add_argument('--trace', metavar='PATH', help='write a Chrome trace of every stage on exit')
+    parser.add_argument('--replay', metavar='SESSION', help='play a recorded session instead of using the radio')
+    parser.add_argument('--speed', type=float, default=1, help='replay speed, 0 plays as fast as possible')
+    add_retention_arguments(parser)
+    args = parser.parse_args()
+
+    if args.replay:
+        use_session(args.replay, args.speed)
+    metrics.enabled = bool(args.metrics or args.trace)
+    RetentionPolicy.from_args(args).prune()  # before airodump-ng opens its new files
+
+    interfaces = start_monitoring(args.interface)
+    if len(interfaces) > 1:
+        capture = CaptureCoordinator(interfaces)
+        captures = capture.captures
+    else:
+        capture = Airodump(interfaces[0])
+        captures = [capture]
+    detector = HandshakeDetector(parse_mac(args.handshake)) if args.handshake else None
+    tracker = DeltaTracker()
+    output = Output(args.socket)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # stop airodump-ng when run as a service
+
+    try:
+        while True:
+            access_points = capture.fetch()
+            if access_points is not None:
+                if args.snapshots:
+                    output.write([{
+                        'type': 'snapshot',
+                        'timestamp': time.time(),
+                        'access_points': [
+                            {**serialize(ap), 'stations': [serialize(station) for station in ap.stations]}
+                            for ap in access_points
+                        ],
+                    }])
+                else:
+                    output.write(tracker.deltas(access_points))
+
+            if detector is not None:
+                for cap_file in filter(None, (airodump.get_latest_file('.cap') for airodump in captures)):
+                    if detector.contains_valid_handshake(cap_file):
+                        output.write([{'type': 'handshake', 'bssid': args.handshake.upper(), 'capture': cap_file}])
+                        detector = None
+                        break
+            output.flush()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        capture.stop()
+        if args.metrics:
+            metrics.export_json(args.metrics)
+        if args.trace:
+            metrics.export_chrome_trace(args.trace)
+
+
+if __name__ == '__main__':
+    main()